@@ -1,12 +1,13 @@
 from typing import Tuple
 import pygame
+from render import get_font, render_text
 
 class AlgorithmSelector:
     """Class to handle algorithm selection for pathfinding."""
     
     def __init__(self) -> None:
         """Initialize the algorithm selector."""
-        self.algorithms = ["astar", "bfs"]
+        self.algorithms = ["astar", "bfs", "auto"]  # auto: the backend races strategies and keeps the winner
         self.selected_algorithm = "astar"  # Default algorithm
         
         # Add morphing toggle
@@ -35,8 +36,8 @@ class AlgorithmSelector:
                          (screen_width - panel_width, 0),
                          (screen_width - panel_width, screen_height), 2)
         
-        font = pygame.font.SysFont('Arial', 20)
-        title = font.render("Routing Algorithm", True, (255, 255, 255))
+        font = get_font(20)
+        title = render_text(font, "Routing Algorithm")
         screen.blit(title, (screen_width - panel_width + 15, 20))
         
         # Draw algorithm options with checkboxes
@@ -57,12 +58,12 @@ class AlgorithmSelector:
                 pygame.draw.rect(screen, (100, 200, 100), inner_rect)
             
             # Draw label
-            label = font.render(algo.upper(), True, (255, 255, 255))
+            label = render_text(font, algo.upper())
             screen.blit(label, (checkbox_rect.right + 10, checkbox_rect.y))
         
         # Draw priority strategy section
         priority_y_pos = 70 + len(self.algorithms) * spacing + 20
-        priority_title = font.render("Priority Strategy", True, (255, 255, 255))
+        priority_title = render_text(font, "Priority Strategy")
         screen.blit(priority_title, (screen_width - panel_width + 15, priority_y_pos))
         
         # Draw priority strategy options
@@ -80,12 +81,12 @@ class AlgorithmSelector:
                 pygame.draw.rect(screen, (100, 200, 100), inner_rect)
             
             # Draw label
-            label = font.render(strategy.capitalize(), True, (255, 255, 255))
+            label = render_text(font, strategy.capitalize())
             screen.blit(label, (checkbox_rect.right + 10, checkbox_rect.y))
         
         # Draw conflict resolution strategy section
         conflict_y_pos = priority_y_pos + 30 + len(self.priority_strategies) * spacing + 20
-        conflict_title = font.render("Conflict Resolution", True, (255, 255, 255))
+        conflict_title = render_text(font, "Conflict Resolution")
         screen.blit(conflict_title, (screen_width - panel_width + 15, conflict_y_pos))
         
         # Draw conflict resolution strategy options
@@ -103,12 +104,12 @@ class AlgorithmSelector:
                 pygame.draw.rect(screen, (100, 200, 100), inner_rect)
             
             # Draw label
-            label = font.render(strategy.capitalize(), True, (255, 255, 255))
+            label = render_text(font, strategy.capitalize())
             screen.blit(label, (checkbox_rect.right + 10, checkbox_rect.y))
         
         # Draw morphing toggle
         morph_y_pos = conflict_y_pos + 30 + len(self.conflict_strategies) * spacing + 20
-        morph_title = font.render("Morphing", True, (255, 255, 255))
+        morph_title = render_text(font, "Morphing")
         screen.blit(morph_title, (screen_width - panel_width + 15, morph_y_pos))
         
         toggle_width = 50
@@ -128,14 +129,14 @@ class AlgorithmSelector:
         
         # Draw toggle labels
         toggle_label = "ON" if self.morphing_enabled else "OFF"
-        small_font = pygame.font.SysFont('Arial', 16)
-        label = small_font.render(toggle_label, True, (255, 255, 255))
+        small_font = get_font(16)
+        label = render_text(small_font, toggle_label)
         label_x = toggle_x + toggle_width + 10
         screen.blit(label, (label_x, toggle_y + 4))
 
         # Draw diagonal movement toggle
         diag_y_pos = morph_y_pos + 30 + 40  # 40 pixels below morphing toggle
-        diag_title = font.render("Diagonal Movement", True, (255, 255, 255))
+        diag_title = render_text(font, "Diagonal Movement")
         screen.blit(diag_title, (screen_width - panel_width + 15, diag_y_pos))
         
         diag_toggle_x = screen_width - panel_width + 20
@@ -153,7 +154,7 @@ class AlgorithmSelector:
         
         # Draw toggle labels
         diag_toggle_label = "ON" if self.diagonals_enabled else "OFF"
-        label = small_font.render(diag_toggle_label, True, (255, 255, 255))
+        label = render_text(small_font, diag_toggle_label)
         diag_label_x = diag_toggle_x + toggle_width + 10
         screen.blit(label, (diag_label_x, diag_toggle_y + 4))
         
@@ -0,0 +1,31 @@
+package benchmarks;
+
+import org.openjdk.jmh.Main;
+import org.openjdk.jmh.profile.GCProfiler;
+import org.openjdk.jmh.runner.Runner;
+import org.openjdk.jmh.runner.options.CommandLineOptions;
+import org.openjdk.jmh.runner.options.OptionsBuilder;
+
+/**
+ * Entry point of benchmarks.jar: the JMH command line, with the GC profiler always attached so
+ * every result reports the allocation rate (gc.alloc.rate and bytes per operation,
+ * gc.alloc.rate.norm) next to the throughput.
+ */
+public class BenchmarkMain {
+    public static void main(String[] args) throws Exception {
+        CommandLineOptions commandLine = new CommandLineOptions(args);
+        if (commandLine.shouldHelp() || commandLine.shouldList() || commandLine.shouldListWithParams()
+                || commandLine.shouldListProfilers() || commandLine.shouldListResultFormats()) {
+            Main.main(args);
+            return;
+        }
+        boolean gcRequested = commandLine.getProfilers().stream()
+                .anyMatch(profiler -> profiler.getKlass().equals("gc") || profiler.getKlass().equals(GCProfiler.class.getName()));
+        OptionsBuilder options = new OptionsBuilder();
+        options.parent(commandLine);
+        if (!gcRequested) {
+            options.addProfiler(GCProfiler.class);
+        }
+        new Runner(options.build()).run();
+    }
+}
@@ -0,0 +1,78 @@
+package benchmarks;
+
+import cbs.ConflictDetector;
+import org.openjdk.jmh.annotations.*;
+import pathfinding.PathFinder;
+import tools.Agent;
+import tools.Conflict;
+import tools.Coordinate;
+import tools.Grid;
+
+import java.io.PrintStream;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.concurrent.TimeUnit;
+
+/**
+ * detectConflict on the paths of a CBS node: independently planned paths, where the scan stops at
+ * the first conflict (and minimax runs its resolver), and a conflict-free solution, where every
+ * pair of agents is compared over every timestep.
+ */
+@State(Scope.Benchmark)
+@BenchmarkMode(Mode.Throughput)
+@OutputTimeUnit(TimeUnit.SECONDS)
+@Warmup(iterations = 3, time = 1)
+@Measurement(iterations = 5, time = 1)
+@Fork(1)
+public class ConflictDetectorBenchmark {
+
+    @Param({"16", "32", "64"})
+    public int size;
+
+    @Param({"8", "32", "128"})
+    public int agents;
+
+    @Param({"priority", "minimax"})
+    public String conflictResolutionStrategy;
+
+    @Param({"false", "true"})
+    public boolean diagonals;
+
+    private Grid grid;
+    private List<Agent> fleet;
+    private Map<Integer, Integer> priorities;
+    private Map<Integer, List<Coordinate>> independentPaths;
+    private Map<Integer, List<Coordinate>> conflictFreePaths;
+    private PrintStream stdout;
+
+    @Setup(Level.Trial)
+    public void setUp() {
+        stdout = Instances.silenceStdout();
+        PathFinder.setAllowDiagonals(diagonals);
+        grid = Instances.grid(size);
+        fleet = Instances.agents(grid, agents);
+        int maxPathLength = Instances.maxPathLength(fleet);
+        priorities = new HashMap<>();
+        for (Agent agent : fleet) {
+            priorities.put(agent.id(), agent.getPriority());
+        }
+        independentPaths = Instances.independentPaths(grid, fleet, maxPathLength);
+        conflictFreePaths = Instances.stationaryPaths(fleet, maxPathLength);
+    }
+
+    @TearDown(Level.Trial)
+    public void tearDown() {
+        System.setOut(stdout);
+    }
+
+    @Benchmark
+    public Conflict firstConflict() {
+        return ConflictDetector.detectConflict(independentPaths, priorities, conflictResolutionStrategy, grid, fleet);
+    }
+
+    @Benchmark
+    public Conflict conflictFree() {
+        return ConflictDetector.detectConflict(conflictFreePaths, priorities, conflictResolutionStrategy, grid, fleet);
+    }
+}
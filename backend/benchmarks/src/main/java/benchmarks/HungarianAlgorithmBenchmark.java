@@ -0,0 +1,56 @@
+package benchmarks;
+
+import hungarian.HungarianAlgorithm;
+import org.openjdk.jmh.annotations.*;
+
+import java.util.Random;
+import java.util.concurrent.TimeUnit;
+
+/**
+ * Optimal assignment of n origins to n destinations by Manhattan distance, the cost matrix
+ * HungarianSolver builds. The algorithm reduces the matrix in place, so each call gets a copy;
+ * the O(n^2) copy is small next to the assignment itself.
+ */
+@State(Scope.Benchmark)
+@BenchmarkMode(Mode.Throughput)
+@OutputTimeUnit(TimeUnit.SECONDS)
+@Warmup(iterations = 3, time = 1)
+@Measurement(iterations = 5, time = 1)
+@Fork(1)
+public class HungarianAlgorithmBenchmark {
+
+    @Param({"10", "50", "100", "200"})
+    public int agents;
+
+    @Param({"16", "64"})
+    public int size;
+
+    private int[][] costMatrix;
+
+    @Setup(Level.Trial)
+    public void setUp() {
+        Random random = new Random(Instances.SEED);
+        int[][] origins = new int[agents][];
+        int[][] destinations = new int[agents][];
+        for (int i = 0; i < agents; i++) {
+            origins[i] = new int[]{random.nextInt(size), random.nextInt(size)};
+            destinations[i] = new int[]{random.nextInt(size), random.nextInt(size)};
+        }
+        costMatrix = new int[agents][agents];
+        for (int i = 0; i < agents; i++) {
+            for (int j = 0; j < agents; j++) {
+                costMatrix[i][j] = Math.abs(origins[i][0] - destinations[j][0])
+                        + Math.abs(origins[i][1] - destinations[j][1]);
+            }
+        }
+    }
+
+    @Benchmark
+    public int[][] findOptimalAssignment() {
+        int[][] matrix = new int[agents][];
+        for (int i = 0; i < agents; i++) {
+            matrix[i] = costMatrix[i].clone();
+        }
+        return new HungarianAlgorithm(matrix).findOptimalAssignment();
+    }
+}
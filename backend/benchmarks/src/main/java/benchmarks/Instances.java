@@ -0,0 +1,118 @@
+package benchmarks;
+
+import cbs.ReservationManager;
+import pathfinding.PathFinder;
+import pathfinding.SubNode;
+import tools.Agent;
+import tools.Coordinate;
+import tools.Grid;
+
+import java.io.OutputStream;
+import java.io.PrintStream;
+import java.util.*;
+
+/**
+ * Deterministic benchmark instances: square grids with a regular pattern of single-cell pillars
+ * (always connected) and agents with distinct random starts and goals from a fixed seed, so every
+ * run and every fork measures exactly the same searches.
+ */
+public class Instances {
+
+    public static final long SEED = 42L;
+
+    // Number of extra steps on top of the longest heuristic distance, for detours around pillars
+    public static final int SLACK = 2;
+
+    // Obstacles at (x, y) with x % 4 == 2 and y % 4 == 2
+    public static Grid grid(int size) {
+        int[][] cells = new int[size][size];
+        for (int y = 2; y < size; y += 4) {
+            for (int x = 2; x < size; x += 4) {
+                cells[y][x] = 1;
+            }
+        }
+        return Grid.of(cells);
+    }
+
+    public static List<Agent> agents(Grid grid, int count) {
+        return agents(grid, count, "y-axis");
+    }
+
+    public static List<Agent> agents(Grid grid, int count, String priorityStrategy) {
+        List<Coordinate> free = new ArrayList<>();
+        for (int y = 0; y < grid.getHeight(); y++) {
+            for (int x = 0; x < grid.getWidth(); x++) {
+                if (grid.isFree(x, y)) {
+                    free.add(Coordinate.with(x, y));
+                }
+            }
+        }
+        if (count > free.size()) {
+            throw new IllegalArgumentException(count + " agents do not fit " + free.size() + " free cells");
+        }
+        Random random = new Random(SEED);
+        List<Coordinate> starts = new ArrayList<>(free);
+        List<Coordinate> goals = new ArrayList<>(free);
+        Collections.shuffle(starts, random);
+        Collections.shuffle(goals, random);
+
+        List<Agent> agents = new ArrayList<>();
+        for (int id = 0; id < count; id++) {
+            agents.add(new Agent(id, starts.get(id), goals.get(id), priorityStrategy));
+        }
+        return agents;
+    }
+
+    // Same bound CBS uses for the first planning round, plus SLACK
+    public static int maxPathLength(List<Agent> agents) {
+        int maxDistance = 0;
+        for (Agent agent : agents) {
+            maxDistance = Math.max(maxDistance, PathFinder.heuristic(agent.start(), agent.goal()));
+        }
+        return maxDistance + SLACK;
+    }
+
+    // A* paths of the common length planned without regard for each other, so they usually conflict
+    public static Map<Integer, List<Coordinate>> independentPaths(Grid grid, List<Agent> agents, int length) {
+        Map<Integer, List<Coordinate>> paths = new HashMap<>();
+        PathFinder pathFinder = PathFinder.getPathFinder("astar");
+        ReservationManager empty = new ReservationManager(grid, false);
+        for (Agent agent : agents) {
+            List<Coordinate> path = pathFinder.findPath(grid, agent, empty, length);
+            if (path != null) {
+                paths.put(agent.id(), path);
+            }
+        }
+        return paths;
+    }
+
+    // Every agent waits on its start cell: distinct starts make this conflict-free
+    public static Map<Integer, List<Coordinate>> stationaryPaths(List<Agent> agents, int length) {
+        Map<Integer, List<Coordinate>> paths = new HashMap<>();
+        for (Agent agent : agents) {
+            paths.put(agent.id(), new ArrayList<>(Collections.nCopies(length + 1, agent.start())));
+        }
+        return paths;
+    }
+
+    public static Map<SubNode, Integer> reservations(Map<Integer, List<Coordinate>> paths) {
+        Map<SubNode, Integer> reservations = new HashMap<>();
+        paths.forEach((agentId, path) -> {
+            for (int t = 0; t < path.size(); t++) {
+                reservations.put(SubNode.of(path.get(t), t), agentId);
+            }
+        });
+        return reservations;
+    }
+
+    /**
+     * The search code logs every step with System.out.println; printing from a forked benchmark VM
+     * floods the JMH console, so output is discarded while benchmarks run. The string building
+     * still happens and is part of the measured cost, as it is in production.
+     */
+    public static PrintStream silenceStdout() {
+        PrintStream original = System.out;
+        System.setOut(new PrintStream(OutputStream.nullOutputStream()));
+        return original;
+    }
+}
@@ -0,0 +1,74 @@
+package benchmarks;
+
+import cbs.MinimaxConflictResolver;
+import org.openjdk.jmh.annotations.*;
+import pathfinding.PathFinder;
+import tools.Agent;
+import tools.Conflict;
+import tools.Coordinate;
+import tools.Grid;
+
+import java.util.ArrayList;
+import java.util.List;
+import java.util.Map;
+import java.util.concurrent.TimeUnit;
+
+/**
+ * Minimax resolution of a head-on conflict between two agents crossing along the first row, with
+ * the rest of the fleet's paths in the path map (every move copies all of them).
+ */
+@State(Scope.Benchmark)
+@BenchmarkMode(Mode.Throughput)
+@OutputTimeUnit(TimeUnit.SECONDS)
+@Warmup(iterations = 3, time = 1)
+@Measurement(iterations = 5, time = 1)
+@Fork(1)
+public class MinimaxConflictResolverBenchmark {
+
+    @Param({"16", "32", "64"})
+    public int size;
+
+    @Param({"8", "32"})
+    public int agents;
+
+    // ConflictDetector uses a depth of 3
+    @Param({"2", "3", "4"})
+    public int depth;
+
+    private MinimaxConflictResolver resolver;
+    private Agent east;
+    private Agent west;
+    private Conflict conflict;
+    private Map<Integer, List<Coordinate>> paths;
+
+    @Setup(Level.Trial)
+    public void setUp() {
+        PathFinder.setAllowDiagonals(false);
+        Grid grid = Instances.grid(size);
+        List<Agent> fleet = Instances.agents(grid, agents);
+        int maxPathLength = Instances.maxPathLength(fleet);
+        paths = Instances.independentPaths(grid, fleet, maxPathLength);
+
+        // Row 0 has no pillars; an even length makes the two agents meet on the same cell
+        int length = (size - 1) / 2 * 2;
+        east = new Agent(agents, Coordinate.with(0, 0), Coordinate.with(length, 0));
+        west = new Agent(agents + 1, Coordinate.with(length, 0), Coordinate.with(0, 0));
+        List<Coordinate> eastPath = new ArrayList<>();
+        List<Coordinate> westPath = new ArrayList<>();
+        for (int t = 0; t <= length; t++) {
+            eastPath.add(Coordinate.with(t, 0));
+            westPath.add(Coordinate.with(length - t, 0));
+        }
+        paths.put(east.id(), eastPath);
+        paths.put(west.id(), westPath);
+        int t = length / 2;
+        conflict = new Conflict(east.id(), west.id(), eastPath.get(t), t);
+
+        resolver = new MinimaxConflictResolver(grid, depth);
+    }
+
+    @Benchmark
+    public int resolveConflict() {
+        return resolver.resolveConflict(east, west, conflict, paths);
+    }
+}
@@ -0,0 +1,87 @@
+package benchmarks;
+
+import cbs.ReservationManager;
+import org.openjdk.jmh.annotations.*;
+import pathfinding.PathFinder;
+import pathfinding.SubNode;
+import tools.Agent;
+import tools.Coordinate;
+import tools.Grid;
+
+import java.io.PrintStream;
+import java.util.Comparator;
+import java.util.List;
+import java.util.concurrent.TimeUnit;
+
+/**
+ * Single-agent findPath as CBS calls it in its first planning round: every other agent is planned
+ * first in priority order and reserved, then the lowest-priority agent is searched.
+ */
+@State(Scope.Benchmark)
+@BenchmarkMode(Mode.Throughput)
+@OutputTimeUnit(TimeUnit.SECONDS)
+@Warmup(iterations = 3, time = 1)
+@Measurement(iterations = 5, time = 1)
+@Fork(1)
+public class PathFinderBenchmark {
+
+    @Param({"astar", "bfs"})
+    public String algorithm;
+
+    @Param({"16", "32", "64"})
+    public int size;
+
+    @Param({"8", "32"})
+    public int agents;
+
+    @Param({"false", "true"})
+    public boolean morphing;
+
+    @Param({"false", "true"})
+    public boolean diagonals;
+
+    private PathFinder pathFinder;
+    private Grid grid;
+    private ReservationManager reservationManager;
+    private Agent target;
+    private int maxPathLength;
+    private PrintStream stdout;
+
+    @Setup(Level.Trial)
+    public void setUp() {
+        stdout = Instances.silenceStdout();
+        PathFinder.setAllowDiagonals(diagonals);
+        pathFinder = PathFinder.getPathFinder(algorithm);
+        grid = Instances.grid(size);
+        List<Agent> fleet = Instances.agents(grid, agents);
+        maxPathLength = Instances.maxPathLength(fleet);
+
+        fleet.sort(Comparator.comparingInt(Agent::getPriority));
+        target = fleet.remove(fleet.size() - 1);
+        reservationManager = new ReservationManager(grid, morphing);
+        // CBS reserves every start at t = 0 before planning
+        for (Agent agent : fleet) {
+            reservationManager.addReservation(SubNode.of(agent.start(), 0), agent.id());
+        }
+        reservationManager.addReservation(SubNode.of(target.start(), 0), target.id());
+        for (Agent agent : fleet) {
+            List<Coordinate> path = pathFinder.findPath(grid, agent, reservationManager, maxPathLength);
+            if (path == null) {
+                continue;  // Left for CBS's fallback in a real solve
+            }
+            for (int t = 0; t < path.size(); t++) {
+                reservationManager.addReservation(SubNode.of(path.get(t), t), agent.id());
+            }
+        }
+    }
+
+    @TearDown(Level.Trial)
+    public void tearDown() {
+        System.setOut(stdout);
+    }
+
+    @Benchmark
+    public List<Coordinate> findPath() {
+        return pathFinder.findPath(grid, target, reservationManager, maxPathLength);
+    }
+}
@@ -0,0 +1,114 @@
+package benchmarks;
+
+import cbs.ReservationManager;
+import org.openjdk.jmh.annotations.*;
+import org.openjdk.jmh.infra.Blackhole;
+import pathfinding.PathFinder;
+import pathfinding.SubNode;
+import tools.Agent;
+import tools.Coordinate;
+import tools.Grid;
+
+import java.util.*;
+import java.util.concurrent.TimeUnit;
+
+/**
+ * Reservation table operations with the reservations of a full fleet: building it one node at a
+ * time (CBS after each planned path), the clear-and-refill CBS does before every replan, and the
+ * per-neighbor lookups the path finders make.
+ */
+@State(Scope.Benchmark)
+@BenchmarkMode(Mode.Throughput)
+@OutputTimeUnit(TimeUnit.SECONDS)
+@Warmup(iterations = 3, time = 1)
+@Measurement(iterations = 5, time = 1)
+@Fork(1)
+public class ReservationManagerBenchmark {
+
+    // Lookups per reservationLookups and isMorphicToMove call
+    private static final int PROBES = 1024;
+
+    @Param({"16", "32", "64"})
+    public int size;
+
+    @Param({"8", "32"})
+    public int agents;
+
+    @Param({"false", "true"})
+    public boolean morphing;
+
+    @Param({"false", "true"})
+    public boolean diagonals;
+
+    private Grid grid;
+    private Agent probeAgent;
+    private Map<SubNode, Integer> reservations;
+    private List<Map.Entry<SubNode, Integer>> reservationList;
+    private List<SubNode> probes;
+    private ReservationManager filled;
+    private ReservationManager scratch;
+
+    @Setup(Level.Trial)
+    public void setUp() {
+        PathFinder.setAllowDiagonals(diagonals);
+        grid = Instances.grid(size);
+        List<Agent> fleet = Instances.agents(grid, agents);
+        int maxPathLength = Instances.maxPathLength(fleet);
+
+        Map<Integer, List<Coordinate>> paths = Instances.independentPaths(grid, fleet, maxPathLength);
+        reservations = Instances.reservations(paths);
+        reservationList = new ArrayList<>(reservations.entrySet());
+        probeAgent = fleet.get(0);
+
+        // Random free cells at random timesteps: what a search may ask about
+        Random random = new Random(Instances.SEED);
+        probes = new ArrayList<>();
+        while (probes.size() < PROBES) {
+            int x = random.nextInt(size);
+            int y = random.nextInt(size);
+            if (grid.isFree(x, y)) {
+                probes.add(SubNode.of(Coordinate.with(x, y), random.nextInt(maxPathLength + 1)));
+            }
+        }
+
+        filled = new ReservationManager(grid, morphing);
+        filled.addAllReservations(reservations);
+        scratch = new ReservationManager(grid, morphing);
+    }
+
+    @Benchmark
+    public ReservationManager addReservations() {
+        ReservationManager manager = new ReservationManager(grid, morphing);
+        for (Map.Entry<SubNode, Integer> entry : reservationList) {
+            manager.addReservation(entry.getKey(), entry.getValue());
+        }
+        return manager;
+    }
+
+    @Benchmark
+    public ReservationManager clearAndAddAll() {
+        scratch.clearReservations();
+        scratch.addAllReservations(reservations);
+        return scratch;
+    }
+
+    // The two checks Astar and Bfs make for every neighbor they expand
+    @Benchmark
+    public void reservationLookups(Blackhole blackhole) {
+        Map<SubNode, Integer> table = filled.getReservations();
+        for (SubNode probe : probes) {
+            Integer owner = table.get(probe);
+            blackhole.consume(owner != null && owner != probeAgent.id());
+            if (filled.isMorphingEnabled()) {
+                blackhole.consume(filled.getMorphicPositions().contains(probe));
+            }
+        }
+    }
+
+    @Benchmark
+    public void isMorphicToMove(Blackhole blackhole) {
+        for (SubNode probe : probes) {
+            blackhole.consume(filled.isMorphicToMove(probe, probeAgent));
+        }
+    }
+}
@@ -0,0 +1,69 @@
+package benchmarks;
+
+import cbs.Searcher;
+import org.openjdk.jmh.annotations.*;
+import pathfinding.PathFinder;
+import tools.Agent;
+import tools.Coordinate;
+import tools.Grid;
+
+import java.io.PrintStream;
+import java.util.ArrayList;
+import java.util.List;
+import java.util.Map;
+import java.util.concurrent.TimeUnit;
+
+/**
+ * End-to-end boostedCbs as the /cbs endpoint runs it, including fallbacks and, without morphing,
+ * independence detection. Sizes stay close to the client's 10x10 grid: a solve is many path
+ * searches, and larger instances are covered by PathFinderBenchmark.
+ */
+@State(Scope.Benchmark)
+@BenchmarkMode(Mode.Throughput)
+@OutputTimeUnit(TimeUnit.SECONDS)
+@Warmup(iterations = 3, time = 2)
+@Measurement(iterations = 5, time = 2)
+@Fork(1)
+public class SearcherBenchmark {
+
+    @Param({"astar", "bfs"})
+    public String algorithm;
+
+    @Param({"10", "20"})
+    public int size;
+
+    @Param({"5", "10", "20"})
+    public int agents;
+
+    @Param({"false", "true"})
+    public boolean morphing;
+
+    @Param({"false", "true"})
+    public boolean diagonals;
+
+    @Param({"priority", "minimax"})
+    public String conflictResolutionStrategy;
+
+    private Grid grid;
+    private List<Agent> fleet;
+    private PrintStream stdout;
+
+    @Setup(Level.Trial)
+    public void setUp() {
+        stdout = Instances.silenceStdout();
+        PathFinder.setAllowDiagonals(diagonals);
+        grid = Instances.grid(size);
+        fleet = Instances.agents(grid, agents);
+    }
+
+    @TearDown(Level.Trial)
+    public void tearDown() {
+        System.setOut(stdout);
+    }
+
+    @Benchmark
+    public Map<Integer, List<Coordinate>> boostedCbs() {
+        // CBS sorts the agent list in place
+        return Searcher.boostedCbs(grid, new ArrayList<>(fleet), algorithm, morphing, conflictResolutionStrategy);
+    }
+}
@@ -2,6 +2,7 @@ import cbs.CBS;
 import hungarian.HungarianSolver;
 import tools.Agent;
 import tools.Coordinate;
+import tools.Grid;
 
 import java.util.Arrays;
 import java.util.HashMap;
@@ -33,7 +34,7 @@ public class Test {
         List<Agent> agents = HungarianSolver.getHungarianAgents(origins, destinations);
 
 
-        Map<Integer, List<Coordinate>> cbs = CBS.cbs(grid, agents, new HashMap<>());
+        Map<Integer, List<Coordinate>> cbs = CBS.cbs(Grid.of(grid), agents, new HashMap<>());
 
         System.out.println(cbs);
 
@@ -1,12 +1,15 @@
 package api;
 
 public record CbsRequest(
-        int[][] grid,
+        int[][] grid,             // Dense grid[y][x], 1 for obstacles; ignored if encodedGrid or mapId is set
+        EncodedGrid encodedGrid,  // Compact bitset or RLE grid
+        String mapId,             // Grid uploaded earlier through /maps
         int[][] origins,
         int[][] destinations,
         String algorithm,
         boolean morphing,
         String priorityStrategy,
         String conflictResolutionStrategy,
-        boolean allowDiagonals
+        boolean allowDiagonals,
+        String assignment         // "hungarian" (default) or "cbs-ta"
 ) {}
\ No newline at end of file
@@ -1,15 +1,20 @@
 package api;
 
+import cbs.CBS;
+import cbs.Portfolio;
+import cbs.SearchStats;
 import cbs.Searcher;
+import cbs.TaskAssignment;
 import hungarian.HungarianSolver;
 import org.springframework.http.HttpStatus;
 import org.springframework.http.ResponseEntity;
+import org.springframework.web.bind.annotation.GetMapping;
 import org.springframework.web.bind.annotation.PostMapping;
 import org.springframework.web.bind.annotation.RequestBody;
 import org.springframework.web.bind.annotation.RestController;
 import tools.Agent;
 import tools.Coordinate;
-import pathfinding.PathFinder;
+import tools.Grid;
 
 import java.util.List;
 import java.util.Map;
@@ -17,8 +22,26 @@ import java.util.Map;
 @RestController
 public class Controller {
 
+    private final MapRegistry mapRegistry;
+
+    public Controller(MapRegistry mapRegistry) {
+        this.mapRegistry = mapRegistry;
+    }
+
     @PostMapping("/cbs")
     public ResponseEntity<Map<Integer, List<Coordinate>>> cbs(@RequestBody CbsRequest cbsRequest) {
+        Grid storedGrid;
+        try {
+            storedGrid = mapRegistry.resolve(cbsRequest.grid(), cbsRequest.encodedGrid(), cbsRequest.mapId());
+        } catch (IllegalArgumentException e) {
+            System.out.println("Invalid grid: " + e.getMessage());
+            return new ResponseEntity<>(HttpStatus.BAD_REQUEST);
+        }
+        if (storedGrid == null) {
+            // Unknown or evicted map ID; the client has to upload the map again
+            return new ResponseEntity<>(HttpStatus.GONE);
+        }
+
         // Get priority strategy from request ("y-axis" if not provided)
         String priorityStrategy = cbsRequest.priorityStrategy() != null ?
                 cbsRequest.priorityStrategy() : "y-axis";
@@ -27,28 +50,68 @@ public class Controller {
         String conflictResolutionStrategy = cbsRequest.conflictResolutionStrategy() != null ?
                 cbsRequest.conflictResolutionStrategy() : "priority";
 
-        // Set whether to allow diagonal movement (default to true if not specified)
-        PathFinder.setAllowDiagonals(cbsRequest.allowDiagonals());
+        // Get target assignment mode ("hungarian" if not provided)
+        boolean taskAssignment = "cbs-ta".equals(cbsRequest.assignment());
+        if (taskAssignment && cbsRequest.origins().length != cbsRequest.destinations().length) {
+            System.out.println("CBS-TA needs as many destinations as origins");
+            return new ResponseEntity<>(HttpStatus.BAD_REQUEST);
+        }
+        if (taskAssignment && "auto".equals(cbsRequest.algorithm())) {
+            // The portfolio races configurations on one fixed assignment
+            System.out.println("CBS-TA cannot be combined with the auto algorithm");
+            return new ResponseEntity<>(HttpStatus.BAD_REQUEST);
+        }
+
+        // Diagonal movement travels with the grid, so concurrent requests each keep their own
+        Grid grid = storedGrid.withDiagonals(cbsRequest.allowDiagonals());
 
-        System.out.println("Diagonal movement: " + (PathFinder.getAllowDiagonals() ? "enabled" : "disabled"));
+        System.out.println("Diagonal movement: " + (grid.allowsDiagonals() ? "enabled" : "disabled"));
 
         // Start timing
         long startTime = System.nanoTime();
 
-        // Create agents with the specified priority strategy
-        List<Agent> agents = HungarianSolver.getHungarianAgents(
-                cbsRequest.origins(),
-                cbsRequest.destinations(),
-                priorityStrategy
-        );
-
-        Map<Integer, List<Coordinate>> cbs = Searcher.boostedCbs(
-                cbsRequest.grid(),
-                agents,
-                cbsRequest.algorithm(), // "astar" or "bfs"
-                cbsRequest.morphing(),  // morphing enabled or disabled
-                conflictResolutionStrategy // "priority" or "minimax"
-        );
+        Map<Integer, List<Coordinate>> cbs;
+        String configuration = null;
+        SearchStats stats = new SearchStats();
+        if ("auto".equals(cbsRequest.algorithm())) {
+            // Race algorithm, priority and conflict strategies on the Hungarian assignment; the request's own choices are ignored
+            List<Agent> agents = HungarianSolver.getHungarianAgents(
+                    cbsRequest.origins(),
+                    cbsRequest.destinations(),
+                    priorityStrategy
+            );
+            Portfolio.Result result = CBS.withStats(stats, () -> Portfolio.solve(grid, agents, cbsRequest.morphing()));
+            cbs = result != null ? result.solution() : null;
+            configuration = result != null ? result.winner().toString() : null;
+        } else {
+            if (taskAssignment) {
+                // Destinations are assigned inside the search, trying further assignments when one gets stuck
+                cbs = CBS.withStats(stats, () -> TaskAssignment.solve(
+                        grid,
+                        cbsRequest.origins(),
+                        cbsRequest.destinations(),
+                        priorityStrategy,
+                        cbsRequest.algorithm(),
+                        cbsRequest.morphing(),
+                        conflictResolutionStrategy
+                ));
+            } else {
+                // Create agents with the specified priority strategy
+                List<Agent> agents = HungarianSolver.getHungarianAgents(
+                        cbsRequest.origins(),
+                        cbsRequest.destinations(),
+                        priorityStrategy
+                );
+                cbs = CBS.withStats(stats, () -> Searcher.boostedCbs(
+                        grid,
+                        agents,
+                        cbsRequest.algorithm(), // "astar" or "bfs"
+                        cbsRequest.morphing(),  // morphing enabled or disabled
+                        conflictResolutionStrategy // "priority" or "minimax"
+                ));
+            }
+        }
+        System.out.println("Search: " + stats);
 
         // End timing
         long endTime = System.nanoTime();
@@ -59,8 +122,22 @@ public class Controller {
         System.out.println("CBS algorithm execution time: " + elapsedTimeMs + " ms");
 
         if (cbs == null || cbs.isEmpty()) {
+            if (stats.getFailureReason() != null) {
+                // Not proven unsolvable: the search gave up on part of the tree
+                return ResponseEntity.status(HttpStatus.NOT_FOUND)
+                        .header("X-Search-Incomplete", stats.getFailureReason()).build();
+            }
             return new ResponseEntity<>(HttpStatus.NOT_FOUND);
         }
+        if (configuration != null) {
+            return ResponseEntity.ok().header("X-Solver-Configuration", configuration).body(cbs);
+        }
         return ResponseEntity.ok(cbs);
     }
+
+    // Wins per configuration of the "auto" portfolio, most successful first
+    @GetMapping("/portfolio")
+    public ResponseEntity<Map<String, Integer>> portfolio() {
+        return ResponseEntity.ok(Portfolio.getWins());
+    }
 }
\ No newline at end of file
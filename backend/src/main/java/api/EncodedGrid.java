@@ -0,0 +1,29 @@
+package api;
+
+import tools.Grid;
+
+import java.util.Base64;
+
+public record EncodedGrid(
+        String format,  // "bitset" (base64 packed bits in data) or "rle" (run lengths per row in runs)
+        int width,
+        int height,
+        String data,
+        int[][] runs
+) {
+    public Grid decode() {
+        if ("bitset".equals(format)) {
+            if (data == null) {
+                throw new IllegalArgumentException("bitset grid without data");
+            }
+            return Grid.fromBitset(width, height, Base64.getDecoder().decode(data));
+        }
+        if ("rle".equals(format)) {
+            if (runs == null) {
+                throw new IllegalArgumentException("rle grid without runs");
+            }
+            return Grid.fromRle(width, height, runs);
+        }
+        throw new IllegalArgumentException("Unknown grid format: " + format);
+    }
+}
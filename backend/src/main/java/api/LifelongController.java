@@ -0,0 +1,117 @@
+package api;
+
+import org.springframework.http.HttpStatus;
+import org.springframework.http.ResponseEntity;
+import org.springframework.web.bind.annotation.*;
+import tools.Coordinate;
+import tools.Grid;
+
+import java.util.Comparator;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.UUID;
+import java.util.concurrent.ConcurrentHashMap;
+
+@RestController
+public class LifelongController {
+
+    // Sessions unused for this long are closed (-Dlifelong.sessionIdleMs), at most this many kept (-Dlifelong.maxSessions)
+    private static final long SESSION_IDLE_MS = Long.getLong("lifelong.sessionIdleMs", 600_000);
+    private static final int MAX_SESSIONS = Integer.getInteger("lifelong.maxSessions", 256);
+
+    private final Map<String, LifelongSession> sessions = new ConcurrentHashMap<>();
+    private final MapRegistry mapRegistry;
+
+    public LifelongController(MapRegistry mapRegistry) {
+        this.mapRegistry = mapRegistry;
+    }
+
+    @PostMapping("/lifelong")
+    public ResponseEntity<LifelongPlan> start(@RequestBody LifelongRequest lifelongRequest) {
+        if (lifelongRequest.replanInterval() > lifelongRequest.window() && lifelongRequest.window() > 0) {
+            return new ResponseEntity<>(HttpStatus.BAD_REQUEST);
+        }
+        if ("auto".equals(lifelongRequest.algorithm())) {
+            // The portfolio races one-shot solves; a session plans with a single configuration
+            System.out.println("Lifelong sessions cannot use the auto algorithm");
+            return new ResponseEntity<>(HttpStatus.BAD_REQUEST);
+        }
+        Grid grid;
+        try {
+            grid = mapRegistry.resolve(lifelongRequest.grid(), lifelongRequest.encodedGrid(), lifelongRequest.mapId());
+        } catch (IllegalArgumentException e) {
+            System.out.println("Invalid grid: " + e.getMessage());
+            return new ResponseEntity<>(HttpStatus.BAD_REQUEST);
+        }
+        if (grid == null) {
+            return new ResponseEntity<>(HttpStatus.GONE);
+        }
+        LifelongSession session = new LifelongSession(UUID.randomUUID().toString(), lifelongRequest, grid);
+
+        long startTime = System.nanoTime();
+        boolean planned = session.replan();
+        System.out.println("Lifelong planning cycle time: " + (System.nanoTime() - startTime) / 1_000_000.0 + " ms");
+        if (!planned) {
+            return new ResponseEntity<>(HttpStatus.NOT_FOUND);
+        }
+        expireSessions();
+        sessions.put(session.getId(), session);
+        return ResponseEntity.ok(session.snapshot(new HashMap<>()));
+    }
+
+    @PostMapping("/lifelong/{sessionId}/goals")
+    public ResponseEntity<LifelongPlan> appendGoals(@PathVariable String sessionId,
+                                                    @RequestBody LifelongGoals lifelongGoals) {
+        LifelongSession session = getSession(sessionId);
+        if (session == null) {
+            return new ResponseEntity<>(HttpStatus.NOT_FOUND);
+        }
+        session.appendGoals(lifelongGoals.goals());
+        return ResponseEntity.ok(session.snapshot(new HashMap<>()));
+    }
+
+    @PostMapping("/lifelong/{sessionId}/step")
+    public ResponseEntity<LifelongPlan> step(@PathVariable String sessionId) {
+        LifelongSession session = getSession(sessionId);
+        if (session == null) {
+            return new ResponseEntity<>(HttpStatus.NOT_FOUND);
+        }
+
+        long startTime = System.nanoTime();
+        Map<Integer, List<Coordinate>> executed = session.advance();
+        System.out.println("Lifelong planning cycle time: " + (System.nanoTime() - startTime) / 1_000_000.0 + " ms");
+        if (executed == null) {
+            return new ResponseEntity<>(HttpStatus.CONFLICT);
+        }
+        return ResponseEntity.ok(session.snapshot(executed));
+    }
+
+    // The session, marked as used, or null if it is unknown or expired
+    private LifelongSession getSession(String sessionId) {
+        expireSessions();
+        LifelongSession session = sessions.get(sessionId);
+        if (session != null) {
+            session.touch();
+        }
+        return session;
+    }
+
+    // Close sessions of clients that stopped without closing them, then the least recently used above the cap
+    private void expireSessions() {
+        long now = System.currentTimeMillis();
+        if (sessions.values().removeIf(session -> now - session.getLastUsed() > SESSION_IDLE_MS)) {
+            System.out.println("Expired idle lifelong sessions, " + sessions.size() + " left");
+        }
+        while (sessions.size() >= MAX_SESSIONS) {
+            sessions.values().stream().min(Comparator.comparingLong(LifelongSession::getLastUsed))
+                    .ifPresent(oldest -> sessions.remove(oldest.getId()));
+        }
+    }
+
+    @DeleteMapping("/lifelong/{sessionId}")
+    public ResponseEntity<Void> close(@PathVariable String sessionId) {
+        return sessions.remove(sessionId) != null ?
+                ResponseEntity.noContent().build() : new ResponseEntity<>(HttpStatus.NOT_FOUND);
+    }
+}
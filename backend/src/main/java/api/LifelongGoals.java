@@ -0,0 +1,5 @@
+package api;
+
+import java.util.Map;
+
+public record LifelongGoals(Map<Integer, int[][]> goals) {}
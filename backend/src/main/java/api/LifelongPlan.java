@@ -0,0 +1,15 @@
+package api;
+
+import tools.Coordinate;
+
+import java.util.List;
+import java.util.Map;
+
+public record LifelongPlan(
+        String sessionId,
+        int time,
+        Map<Integer, List<Coordinate>> executed,  // Positions reached during the last cycle
+        Map<Integer, List<Coordinate>> plan,      // Current plan, conflict-free within the window
+        int completedGoals,
+        int pendingGoals
+) {}
@@ -0,0 +1,15 @@
+package api;
+
+public record LifelongRequest(
+        int[][] grid,
+        EncodedGrid encodedGrid,
+        String mapId,
+        int[][] origins,
+        int[][][] goals,  // Initial goal sequence of each agent, in the same order as origins
+        String algorithm,
+        String priorityStrategy,
+        String conflictResolutionStrategy,
+        boolean allowDiagonals,
+        int window,         // Conflicts are resolved for this many steps ahead
+        int replanInterval  // Steps executed between two planning cycles
+) {}
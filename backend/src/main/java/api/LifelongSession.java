@@ -0,0 +1,125 @@
+package api;
+
+import cbs.RollingHorizonPlanner;
+import tools.Agent;
+import tools.Coordinate;
+import tools.Grid;
+
+import java.util.*;
+
+public class LifelongSession {
+    private final String id;
+    private final Grid grid;
+    private final String algorithm;
+    private final String priorityStrategy;
+    private final String conflictResolutionStrategy;
+    private final int window;
+    private final int replanInterval;
+
+    private final Coordinate[] positions;
+    private final List<Deque<Coordinate>> goals = new ArrayList<>();
+    private Map<Integer, List<Coordinate>> plan = new HashMap<>();
+    private int time = 0;
+    private int completedGoals = 0;
+    private volatile long lastUsed = System.currentTimeMillis();  // For idle expiry
+
+    public LifelongSession(String id, LifelongRequest request, Grid grid) {
+        this.id = id;
+        this.grid = grid.withDiagonals(request.allowDiagonals());
+        this.algorithm = request.algorithm();
+        this.priorityStrategy = request.priorityStrategy() != null ? request.priorityStrategy() : "y-axis";
+        this.conflictResolutionStrategy = request.conflictResolutionStrategy() != null ?
+                request.conflictResolutionStrategy() : "priority";
+        this.window = request.window() > 0 ? request.window() : 10;
+        this.replanInterval = request.replanInterval() > 0 ? Math.min(request.replanInterval(), window) : 5;
+
+        int[][] origins = request.origins();
+        this.positions = new Coordinate[origins.length];
+        for (int i = 0; i < origins.length; i++) {
+            positions[i] = Coordinate.with(origins[i][0], origins[i][1]);
+            goals.add(new ArrayDeque<>());
+        }
+        if (request.goals() != null) {
+            for (int i = 0; i < request.goals().length && i < origins.length; i++) {
+                appendGoals(i, request.goals()[i]);
+            }
+        }
+    }
+
+    public String getId() {
+        return id;
+    }
+
+    public long getLastUsed() {
+        return lastUsed;
+    }
+
+    public void touch() {
+        lastUsed = System.currentTimeMillis();
+    }
+
+    public synchronized void appendGoals(Map<Integer, int[][]> newGoals) {
+        newGoals.forEach(this::appendGoals);
+    }
+
+    private void appendGoals(int agentId, int[][] newGoals) {
+        if (agentId < 0 || agentId >= goals.size() || newGoals == null) {
+            return;
+        }
+        for (int[] goal : newGoals) {
+            goals.get(agentId).add(Coordinate.with(goal[0], goal[1]));
+        }
+    }
+
+    /**
+     * Plan all agents towards their current goals; conflicts are only resolved inside the window.
+     */
+    public synchronized boolean replan() {
+        List<Agent> agents = new ArrayList<>();
+        for (int i = 0; i < positions.length; i++) {
+            Coordinate goal = goals.get(i).isEmpty() ? positions[i] : goals.get(i).peek();
+            agents.add(new Agent(i, positions[i], goal, priorityStrategy));
+        }
+        Map<Integer, List<Coordinate>> newPlan = RollingHorizonPlanner.plan(
+                grid, agents, algorithm, conflictResolutionStrategy, window);
+        if (newPlan == null) {
+            return false;
+        }
+        plan = newPlan;
+        return true;
+    }
+
+    /**
+     * Execute the next replanInterval steps of the current plan, then replan.
+     * Returns the positions visited by every agent, or null if replanning failed.
+     */
+    public synchronized Map<Integer, List<Coordinate>> advance() {
+        Map<Integer, List<Coordinate>> executed = new HashMap<>();
+        for (int i = 0; i < positions.length; i++) {
+            executed.put(i, new ArrayList<>());
+        }
+        for (int step = 1; step <= replanInterval; step++) {
+            for (int i = 0; i < positions.length; i++) {
+                List<Coordinate> path = plan.get(i);
+                if (path != null && !path.isEmpty()) {
+                    positions[i] = path.get(Math.min(step, path.size() - 1));
+                }
+                executed.get(i).add(positions[i]);
+
+                // A goal counts as completed as soon as the agent stands on it
+                Deque<Coordinate> agentGoals = goals.get(i);
+                if (!agentGoals.isEmpty() && agentGoals.peek().equals(positions[i])) {
+                    agentGoals.poll();
+                    completedGoals++;
+                }
+            }
+        }
+        time += replanInterval;
+        return replan() ? executed : null;
+    }
+
+    public synchronized LifelongPlan snapshot(Map<Integer, List<Coordinate>> executed) {
+        int pendingGoals = goals.stream().mapToInt(Deque::size).sum();
+        return new LifelongPlan(id, time, executed, plan, completedGoals, pendingGoals);
+    }
+}
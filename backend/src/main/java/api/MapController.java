@@ -0,0 +1,34 @@
+package api;
+
+import org.springframework.http.HttpStatus;
+import org.springframework.http.ResponseEntity;
+import org.springframework.web.bind.annotation.PostMapping;
+import org.springframework.web.bind.annotation.RequestBody;
+import org.springframework.web.bind.annotation.RestController;
+import tools.Grid;
+
+import java.util.Map;
+
+@RestController
+public class MapController {
+
+    private final MapRegistry mapRegistry;
+
+    public MapController(MapRegistry mapRegistry) {
+        this.mapRegistry = mapRegistry;
+    }
+
+    @PostMapping("/maps")
+    public ResponseEntity<Map<String, String>> upload(@RequestBody EncodedGrid encodedGrid) {
+        Grid grid;
+        try {
+            grid = encodedGrid.decode();
+        } catch (IllegalArgumentException e) {
+            System.out.println("Rejected map upload: " + e.getMessage());
+            return new ResponseEntity<>(HttpStatus.BAD_REQUEST);
+        }
+        String mapId = mapRegistry.put(grid);
+        System.out.println("Stored " + grid.getWidth() + "x" + grid.getHeight() + " map " + mapId);
+        return ResponseEntity.ok(Map.of("mapId", mapId));
+    }
+}
@@ -0,0 +1,62 @@
+package api;
+
+import org.springframework.stereotype.Component;
+import tools.Grid;
+import tools.MapStore;
+
+import java.util.LinkedHashMap;
+import java.util.Map;
+
+/**
+ * Decoded grids uploaded through /maps, keyed by their content hash, so clients solving many
+ * instances on the same map send the map once and then only its ID. IDs not uploaded to this
+ * process are looked up in the shared on-disk map store, so clients on the same machine never upload.
+ * The least recently used maps are dropped once more than {@code maps.maxStored} are held.
+ */
+@Component
+public class MapRegistry {
+    private final int maxStored = Integer.getInteger("maps.maxStored", 64);
+    private final Map<String, Grid> maps = new LinkedHashMap<>(16, 0.75f, true);
+
+    public synchronized String put(Grid grid) {
+        String mapId = grid.contentHash();
+        maps.put(mapId, grid);
+        while (maps.size() > maxStored) {
+            maps.remove(maps.keySet().iterator().next());
+        }
+        return mapId;
+    }
+
+    public Grid get(String mapId) {
+        synchronized (this) {
+            Grid grid = maps.get(mapId);
+            if (grid != null) {
+                return grid;
+            }
+        }
+        // Outside the lock: reading a large stored map must not block other requests
+        Grid grid = MapStore.loadGrid(mapId);
+        if (grid != null) {
+            put(grid);
+        }
+        return grid;
+    }
+
+    /**
+     * Grid of a request given as a map ID, an encoded grid or a dense int[][], in that order of preference.
+     * Returns null for a map ID that is neither registered nor stored; throws IllegalArgumentException
+     * for a missing or malformed grid.
+     */
+    public Grid resolve(int[][] cells, EncodedGrid encodedGrid, String mapId) {
+        if (mapId != null) {
+            return get(mapId);
+        }
+        if (encodedGrid != null) {
+            return encodedGrid.decode();
+        }
+        if (cells != null) {
+            return Grid.of(cells);
+        }
+        throw new IllegalArgumentException("Request has no grid, encodedGrid or mapId");
+    }
+}
@@ -0,0 +1,38 @@
+package cbs;
+
+import java.util.TreeSet;
+
+/**
+ * CBS open list with a node cap: once full, the most expensive node is evicted so that a single
+ * pathological request cannot exhaust the heap. Evicted branches are not explored, so a search
+ * that then fails records in its SearchStats that it was incomplete.
+ */
+public class BoundedOpenList<T extends Comparable<T>> {
+    private final TreeSet<T> nodes = new TreeSet<>();
+    private final int capacity;
+    private int evicted = 0;
+
+    public BoundedOpenList(int capacity) {
+        this.capacity = capacity;
+    }
+
+    public void add(T node) {
+        nodes.add(node);
+        if (nodes.size() > capacity) {
+            nodes.pollLast();
+            evicted++;
+        }
+    }
+
+    public T poll() {
+        return nodes.pollFirst();
+    }
+
+    public boolean isEmpty() {
+        return nodes.isEmpty();
+    }
+
+    public int getEvicted() {
+        return evicted;
+    }
+}
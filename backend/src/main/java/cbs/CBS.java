@@ -6,24 +6,75 @@ import pathfinding.SubNode;
 import tools.*;
 
 import java.util.*;
+import java.util.function.BooleanSupplier;
+import java.util.function.Supplier;
 
 import static pathfinding.Astar.heuristic;
 
 public class CBS {
 
+    // Maximum number of nodes kept in the open list (-Dcbs.maxOpenNodes), bounding memory per solve
+    private static int maxOpenNodes = Integer.getInteger("cbs.maxOpenNodes", 100_000);
+
+    public static void setMaxOpenNodes(int maxNodes) {
+        maxOpenNodes = maxNodes;
+    }
+
+    public static int getMaxOpenNodes() {
+        return maxOpenNodes;
+    }
+
+    // Cancellation check of the search running on this thread; Portfolio uses it to stop losing configurations
+    private static final ThreadLocal<BooleanSupplier> cancellation = ThreadLocal.withInitial(() -> () -> false);
+
+    public static <T> T withCancellation(BooleanSupplier cancelled, Supplier<T> search) {
+        BooleanSupplier previous = cancellation.get();
+        cancellation.set(cancelled);
+        try {
+            return search.get();
+        } finally {
+            cancellation.set(previous);
+        }
+    }
+
+    public static BooleanSupplier getCancellation() {
+        return cancellation.get();
+    }
+
+    // Counters of the search running on this thread; parallel workers are handed the caller's
+    private static final ThreadLocal<SearchStats> stats = ThreadLocal.withInitial(SearchStats::new);
+
+    public static <T> T withStats(SearchStats searchStats, Supplier<T> search) {
+        SearchStats previous = stats.get();
+        stats.set(searchStats);
+        try {
+            return search.get();
+        } finally {
+            stats.set(previous);
+        }
+    }
+
+    public static SearchStats getStats() {
+        return stats.get();
+    }
+
+    static boolean isCancelled() {
+        return cancellation.get().getAsBoolean();
+    }
+
     public static Map<Integer, List<Coordinate>> cbs(
-            int[][] grid, List<Agent> agents, HashMap<SubNode, Integer> fallbackReservations) {
+            Grid grid, List<Agent> agents, HashMap<SubNode, Integer> fallbackReservations) {
         return cbs(grid, agents, fallbackReservations, "astar", false, null, "priority");  // Default to A* without morphing
     }
 
     public static Map<Integer, List<Coordinate>> cbs(
-            int[][] grid, List<Agent> agents, HashMap<SubNode, Integer> fallbackReservations,
+            Grid grid, List<Agent> agents, HashMap<SubNode, Integer> fallbackReservations,
             String algorithm, boolean enableMorphing, Integer maxPathLength) {
         return cbs(grid, agents, fallbackReservations, algorithm, enableMorphing, maxPathLength, "priority");
     }
 
     public static Map<Integer, List<Coordinate>> cbs(
-            int[][] grid, List<Agent> agents, HashMap<SubNode, Integer> fallbackReservations,
+            Grid grid, List<Agent> agents, HashMap<SubNode, Integer> fallbackReservations,
             String algorithm, boolean enableMorphing, Integer maxPathLength, String conflictResolutionStrategy) {
 
         // Get the appropriate pathfinder based on the algorithm parameter
@@ -34,7 +85,7 @@ public class CBS {
         int maxDistance = 0;
         for (Agent agent : agents) {
             priorities.put(agent.id(), agent.getPriority());
-            int distance = heuristic(agent.start(), agent.goal());
+            int distance = heuristic(grid, agent.start(), agent.goal());
             maxDistance = Math.max(maxDistance, distance);
         }
         if (maxPathLength == null) {
@@ -54,8 +105,15 @@ public class CBS {
         agents.sort(Comparator.comparingInt(Agent::getPriority));
 
         for (Agent agent : agents) {
+            if (isCancelled()) {
+                return null;
+            }
             List<Coordinate> path = pathFinder.findPath(grid, agent, reservationManager, maxPathLength);
             if (path == null) {
+                stats.get().fellBack();
+                if (isCancelled()) {
+                    return null;  // Checked before the costly fallback; CBS-TA gives up on the assignment here
+                }
                 System.out.println("Agent " + agent.id() + " failed to find path! Fallback mechanism initiated");
                 // Reserve this spot for this agent in the future
                 Fallback fallback = computeFallbackReservation(agent, reservationManager, grid, enableMorphing, maxPathLength);
@@ -80,58 +138,72 @@ public class CBS {
             paths.put(agent.id(), path);
         }
 
-        // Create the root CBS node
-        int totalCost = paths.values().stream().mapToInt(List::size).sum();
-        CBSNode root = new CBSNode(paths, new ArrayList<>(), totalCost);
-        PriorityQueue<CBSNode> openSet = new PriorityQueue<>();
+        // Create the root CBS node; children only store the path they replanned
+        CBSNode root = CBSNode.root(paths);
+        BoundedOpenList<CBSNode> openSet = new BoundedOpenList<>(maxOpenNodes);
         openSet.add(root);
 
         while (!openSet.isEmpty()) {
+            if (isCancelled()) {
+                return null;
+            }
             CBSNode node = openSet.poll();
-            Conflict conflict = ConflictDetector.detectConflict(node.agentIdToPath(), priorities,
+            stats.get().expanded();
+            Map<Integer, List<Coordinate>> nodePaths = node.agentIdToPath();
+            Conflict conflict = ConflictDetector.detectConflict(nodePaths, priorities,
                     conflictResolutionStrategy, grid, agents);
 
             if (conflict == null) {
                 System.out.println("Found solution with " + maxPathLength + " steps");
-                return node.agentIdToPath();
+                return nodePaths;
             }
 
-            int agentLow = conflict.agentLow;
-            Constraint constraint = new Constraint(agentLow, conflict.coordinate, conflict.t);
-            System.out.println(constraint);
-
-            List<Constraint> newConstraints = new ArrayList<>(node.constraints());
-            newConstraints.add(constraint);
-
-            // Re-plan the lower-priority agent with the new constraint:
-            // Create new reservations ignoring the lower-priority agent's current path.
-            Map<SubNode, Integer> newReservations = createReservations(node.agentIdToPath(), agentLow);
-
-            reservationManager.clearReservations();
-            reservationManager.addAllReservations(newReservations);
-
-            Agent agentLowObj = findAgentById(agents, agentLow);
-            assert agentLowObj != null;
-            List<Coordinate> constrainedPath = pathFinder.findPath(grid, agentLowObj, reservationManager, maxPathLength);
-            if (constrainedPath == null) {
-                continue;
+            CBSNode child = resolve(node, nodePaths, conflict, grid, agents, pathFinder, reservationManager, maxPathLength);
+            if (child != null) {
+                openSet.add(child);
             }
+        }
+        if (openSet.getEvicted() > 0) {
+            // The evicted branches might have held a solution: this failure is not a proof
+            stats.get().failedIncomplete(openSet.getEvicted(), maxOpenNodes);
+            System.out.println("No solution found, " + stats.get().getFailureReason());
+        }
+        return null;
+    }
 
-            Map<Integer, List<Coordinate>> newPaths = new HashMap<>(node.agentIdToPath());
-            newPaths.put(agentLow, constrainedPath);
-
-            // Add reservations for the updated path.
-            for (int t2 = 0; t2 < constrainedPath.size(); t2++) {
-                Coordinate pos = constrainedPath.get(t2);
-                SubNode key = SubNode.of(pos, t2);
-                reservationManager.addReservation(key, agentLow);
-            }
+    /**
+     * Replans the lower-priority agent of a conflict around the paths of all other agents and returns
+     * the child node, or null if that agent has no path within maxPathLength.
+     */
+    static CBSNode resolve(CBSNode node, Map<Integer, List<Coordinate>> nodePaths, Conflict conflict, Grid grid,
+                           List<Agent> agents, PathFinder pathFinder, ReservationManager reservationManager,
+                           int maxPathLength) {
+        int agentLow = conflict.agentLow;
+        Constraint constraint = new Constraint(agentLow, conflict.coordinate, conflict.t);
+        System.out.println(constraint);
+
+        // Re-plan the lower-priority agent with the new constraint:
+        // Create new reservations ignoring the lower-priority agent's current path.
+        Map<SubNode, Integer> newReservations = createReservations(nodePaths, agentLow);
+
+        reservationManager.clearReservations();
+        reservationManager.addAllReservations(newReservations);
+
+        Agent agentLowObj = findAgentById(agents, agentLow);
+        assert agentLowObj != null;
+        List<Coordinate> constrainedPath = pathFinder.findPath(grid, agentLowObj, reservationManager, maxPathLength);
+        if (constrainedPath == null) {
+            return null;
+        }
 
-            int newCost = newPaths.values().stream().mapToInt(List::size).sum();
-            CBSNode newNode = new CBSNode(newPaths, newConstraints, newCost);
-            openSet.add(newNode);
+        // Add reservations for the updated path.
+        for (int t2 = 0; t2 < constrainedPath.size(); t2++) {
+            Coordinate pos = constrainedPath.get(t2);
+            SubNode key = SubNode.of(pos, t2);
+            reservationManager.addReservation(key, agentLow);
         }
-        return null;
+
+        return node.child(agentLow, constrainedPath, constraint);
     }
 
     // ... [existing methods unchanged]
@@ -160,7 +232,7 @@ public class CBS {
 
     public static Fallback computeFallbackReservation(Agent agent,
                                                       ReservationManager reservationManager,
-                                                      int[][] grid, boolean enableMorphing, int maxPathLength) {
+                                                      Grid grid, boolean enableMorphing, int maxPathLength) {
         int pathLength = 0;
         int morphicPathLength = 0;
         SubNode latestReservationForAgent = getLatestReservationForAgent(reservationManager.getReservations(), agent);
@@ -2,6 +2,7 @@ package cbs;
 
 import tools.Conflict;
 import tools.Coordinate;
+import tools.Grid;
 import tools.Agent;
 
 import java.util.List;
@@ -16,7 +17,14 @@ public class ConflictDetector {
 
     public static Conflict detectConflict(
             Map<Integer, List<Coordinate>> paths, Map<Integer, Integer> priorities,
-            String conflictResolutionStrategy, int[][] grid, List<Agent> agents) {
+            String conflictResolutionStrategy, Grid grid, List<Agent> agents) {
+        return detectConflict(paths, priorities, conflictResolutionStrategy, grid, agents, Integer.MAX_VALUE);
+    }
+
+    // Only conflicts at timesteps <= window are reported (rolling-horizon planning)
+    public static Conflict detectConflict(
+            Map<Integer, List<Coordinate>> paths, Map<Integer, Integer> priorities,
+            String conflictResolutionStrategy, Grid grid, List<Agent> agents, int window) {
 
         for (Map.Entry<Integer, List<Coordinate>> entry1 : paths.entrySet()) {
             int agent1 = entry1.getKey();
@@ -27,7 +35,7 @@ public class ConflictDetector {
                 if (agent1 >= agent2) continue;
 
                 List<Coordinate> path2 = entry2.getValue();
-                int maxTime = Math.min(path1.size(), path2.size());
+                int maxTime = (int) Math.min(Math.min(path1.size(), path2.size()), (long) window + 1);
 
                 for (int t = 0; t < maxTime; t++) {
                     Coordinate pos1 = path1.get(t);
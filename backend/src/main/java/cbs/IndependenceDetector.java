@@ -0,0 +1,190 @@
+package cbs;
+
+import pathfinding.SubNode;
+import tools.Agent;
+import tools.Coordinate;
+import tools.Grid;
+
+import java.util.*;
+import java.util.concurrent.ExecutionException;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.Future;
+import java.util.function.BooleanSupplier;
+
+/**
+ * Independence detection: agents start in their own group and each group is solved with CBS, in
+ * parallel on a dedicated pool. When two groups' solutions conflict, one group is first replanned
+ * around the other's paths, then the other way round; only if both fail, or the same two groups
+ * conflict again, are they merged and solved together. Solve time then grows with the largest
+ * interacting group rather than the fleet size.
+ */
+public class IndependenceDetector {
+
+    private static final ExecutorService executor = Executors.newFixedThreadPool(
+            Runtime.getRuntime().availableProcessors(), runnable -> {
+                Thread thread = new Thread(runnable, "independence");
+                thread.setDaemon(true);
+                return thread;
+            });
+
+    public static Map<Integer, List<Coordinate>> solve(
+            Grid grid, List<Agent> agents, String algorithm, String conflictResolutionStrategy) {
+
+        List<List<Agent>> groups = new ArrayList<>();
+        for (Agent agent : agents) {
+            groups.add(new ArrayList<>(List.of(agent)));
+        }
+        // solutions.get(i) belongs to groups.get(i); null until the group is solved
+        List<Map<Integer, List<Coordinate>>> solutions = new ArrayList<>(Collections.nCopies(groups.size(), null));
+        // Pairs of groups (by agent IDs) that already tried to avoid each other
+        Set<Set<Set<Integer>>> avoided = new HashSet<>();
+
+        // Group solves run on pool threads, so hand them this search's cancellation check and counters
+        BooleanSupplier cancellation = CBS.getCancellation();
+        SearchStats stats = CBS.getStats();
+
+        while (true) {
+            if (cancellation.getAsBoolean()) {
+                return null;
+            }
+            // Solve every group that has no solution yet
+            Map<Integer, Future<Map<Integer, List<Coordinate>>>> pending = new LinkedHashMap<>();
+            for (int i = 0; i < groups.size(); i++) {
+                if (solutions.get(i) == null) {
+                    List<Agent> group = groups.get(i);
+                    pending.put(i, executor.submit(() -> CBS.withCancellation(cancellation, () -> CBS.withStats(stats,
+                            () -> CBS.cbs(grid, group, new HashMap<>(), algorithm, false, null, conflictResolutionStrategy)))));
+                }
+            }
+            for (Map.Entry<Integer, Future<Map<Integer, List<Coordinate>>>> entry : pending.entrySet()) {
+                Map<Integer, List<Coordinate>> solution;
+                try {
+                    solution = entry.getValue().get();
+                } catch (InterruptedException e) {
+                    Thread.currentThread().interrupt();
+                    return null;
+                } catch (ExecutionException e) {
+                    throw new IllegalStateException("Group solve failed", e.getCause());
+                }
+                if (solution == null) {
+                    if (!cancellation.getAsBoolean()) {
+                        System.out.println("Independence detection: group of agents " + ids(groups.get(entry.getKey()))
+                                + " has no solution");
+                    }
+                    return null;
+                }
+                solutions.set(entry.getKey(), solution);
+            }
+
+            int[] pair = firstConflict(solutions);
+            if (pair == null) {
+                System.out.println("Independence detection finished with " + groups.size() + " groups, largest "
+                        + groups.stream().mapToInt(List::size).max().orElse(0) + " agents");
+                return combine(solutions);
+            }
+            int i = pair[0];
+            int j = pair[1];
+
+            if (avoided.add(Set.of(ids(groups.get(i)), ids(groups.get(j))))) {
+                Map<Integer, List<Coordinate>> replanned = avoid(grid, groups.get(i), solutions.get(j), algorithm,
+                        conflictResolutionStrategy, cancellation, stats);
+                if (replanned != null) {
+                    solutions.set(i, replanned);
+                    continue;
+                }
+                replanned = avoid(grid, groups.get(j), solutions.get(i), algorithm, conflictResolutionStrategy,
+                        cancellation, stats);
+                if (replanned != null) {
+                    solutions.set(j, replanned);
+                    continue;
+                }
+            }
+
+            // Neither group can give way: solve them as one
+            List<Agent> merged = new ArrayList<>(groups.get(i));
+            merged.addAll(groups.get(j));
+            groups.set(i, merged);
+            solutions.set(i, null);
+            groups.remove(j);
+            solutions.remove(j);
+        }
+    }
+
+    /**
+     * Replan a group with the other group's paths reserved, or null if that needs a fallback or
+     * still conflicts with them. Cheap by design: a failure just means the groups are merged.
+     */
+    private static Map<Integer, List<Coordinate>> avoid(
+            Grid grid, List<Agent> group, Map<Integer, List<Coordinate>> other, String algorithm,
+            String conflictResolutionStrategy, BooleanSupplier cancellation, SearchStats stats) {
+        HashMap<SubNode, Integer> reservations = new HashMap<>(CBS.createReservations(other, null));
+        SearchStats attemptStats = new SearchStats();
+        Map<Integer, List<Coordinate>> solution = CBS.withCancellation(
+                () -> cancellation.getAsBoolean() || attemptStats.getFallbacks() > 0,
+                () -> CBS.withStats(attemptStats, () -> CBS.cbs(grid, new ArrayList<>(group), reservations,
+                        algorithm, false, null, conflictResolutionStrategy)));
+        stats.add(attemptStats);
+        if (solution == null || solution.isEmpty() || conflicting(solution, other)) {
+            return null;
+        }
+        return solution;
+    }
+
+    // Indices i < j of the first two groups whose solutions conflict, or null
+    private static int[] firstConflict(List<Map<Integer, List<Coordinate>>> solutions) {
+        for (int i = 0; i < solutions.size(); i++) {
+            for (int j = i + 1; j < solutions.size(); j++) {
+                if (conflicting(solutions.get(i), solutions.get(j))) {
+                    return new int[]{i, j};
+                }
+            }
+        }
+        return null;
+    }
+
+    private static Set<Integer> ids(List<Agent> group) {
+        Set<Integer> ids = new TreeSet<>();
+        for (Agent agent : group) {
+            ids.add(agent.id());
+        }
+        return ids;
+    }
+
+    // Paths of different length are compared as if finished agents wait on their last cell
+    private static boolean conflicting(Map<Integer, List<Coordinate>> solution1,
+                                       Map<Integer, List<Coordinate>> solution2) {
+        for (List<Coordinate> path1 : solution1.values()) {
+            for (List<Coordinate> path2 : solution2.values()) {
+                int end = Math.max(path1.size(), path2.size());
+                for (int t = 0; t < end; t++) {
+                    if (positionAt(path1, t).equals(positionAt(path2, t))) {
+                        return true;
+                    }
+                }
+            }
+        }
+        return false;
+    }
+
+    // Groups finish at different times; pad every path so the combined solution has one length
+    private static Map<Integer, List<Coordinate>> combine(List<Map<Integer, List<Coordinate>>> solutions) {
+        Map<Integer, List<Coordinate>> combined = new HashMap<>();
+        for (Map<Integer, List<Coordinate>> solution : solutions) {
+            combined.putAll(solution);
+        }
+        int length = combined.values().stream().mapToInt(List::size).max().orElse(0);
+        combined.replaceAll((agentId, path) -> {
+            List<Coordinate> padded = new ArrayList<>(path);
+            while (padded.size() < length) {
+                padded.add(padded.get(padded.size() - 1));
+            }
+            return padded;
+        });
+        return combined;
+    }
+
+    private static Coordinate positionAt(List<Coordinate> path, int t) {
+        return path.get(Math.min(t, path.size() - 1));
+    }
+}
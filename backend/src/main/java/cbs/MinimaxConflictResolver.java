@@ -8,9 +8,9 @@ import java.util.*;
 public class MinimaxConflictResolver {
 
     private final int maxDepth; // Depth of the tree (max search depth)
-    private final int[][] grid;
+    private final Grid grid;
 
-    public MinimaxConflictResolver(int[][] grid, int maxDepth) {
+    public MinimaxConflictResolver(Grid grid, int maxDepth) {
         this.grid = grid;
         this.maxDepth = maxDepth; // tree's depth
     }
@@ -106,7 +106,7 @@ public class MinimaxConflictResolver {
     }
 
     private boolean isValidPosition(int x, int y) {
-        return x >= 0 && x < grid.length && y >= 0 && y < grid[0].length && grid[y][x] != 1;
+        return grid.isFree(x, y);
     }
 
     private Map<Integer, List<Coordinate>> applyMove(Map<Integer, List<Coordinate>> currentPaths,
@@ -0,0 +1,149 @@
+package cbs;
+
+import tools.Agent;
+import tools.Coordinate;
+import tools.Grid;
+
+import java.util.*;
+import java.util.concurrent.*;
+import java.util.concurrent.atomic.AtomicBoolean;
+import java.util.concurrent.atomic.AtomicInteger;
+
+/**
+ * The "auto" algorithm: races several search configurations on the same instance and returns the
+ * first solution, or the cheapest one found within a short grace window, then cancels the rest.
+ * Wins are counted per configuration and the most successful configurations are raced first; the
+ * last slot of every race goes to one of the others in turn, so a configuration that never made the
+ * top can still win its way in.
+ * Morphing and diagonal movement change what a valid solution is, so they are taken from the request.
+ */
+public class Portfolio {
+
+    public record Configuration(String algorithm, String priorityStrategy, String conflictResolutionStrategy) {
+        @Override
+        public String toString() {
+            return algorithm + "/" + priorityStrategy + "/" + conflictResolutionStrategy;
+        }
+    }
+
+    public record Result(Map<Integer, List<Coordinate>> solution, Configuration winner) {}
+
+    // Initial race order; later reordered by wins
+    private static final List<Configuration> CONFIGURATIONS = List.of(
+            new Configuration("astar", "y-axis", "priority"),
+            new Configuration("astar", "manhattan", "priority"),
+            new Configuration("bfs", "y-axis", "priority"),
+            new Configuration("astar", "y-axis", "minimax"),
+            new Configuration("bfs", "manhattan", "priority"),
+            new Configuration("astar", "manhattan", "minimax"),
+            new Configuration("bfs", "y-axis", "minimax"),
+            new Configuration("bfs", "manhattan", "minimax")
+    );
+
+    // Configurations raced per solve (-Dportfolio.size) and the wait for a cheaper solution after the first (-Dportfolio.graceMs)
+    private static final int SIZE = Math.min(CONFIGURATIONS.size(), Integer.getInteger("portfolio.size",
+            Math.max(2, Runtime.getRuntime().availableProcessors())));
+    private static final long GRACE_MS = Long.getLong("portfolio.graceMs", 50L);
+
+    private static final ExecutorService executor = Executors.newCachedThreadPool(runnable -> {
+        Thread thread = new Thread(runnable, "portfolio");
+        thread.setDaemon(true);
+        return thread;
+    });
+    private static final Map<Configuration, AtomicInteger> wins = new ConcurrentHashMap<>();
+    // Rotates the exploration slot through the configurations outside the top
+    private static final AtomicInteger explorations = new AtomicInteger();
+
+    public static Result solve(Grid grid, List<Agent> agents, boolean morphingEnabled) {
+        List<Configuration> race = race();
+        // Racers run on pool threads, whose own stats would outlive this search; count into the caller's
+        SearchStats stats = CBS.getStats();
+        AtomicBoolean finished = new AtomicBoolean(false);
+        CompletionService<Result> completionService = new ExecutorCompletionService<>(executor);
+        for (Configuration configuration : race) {
+            // Every racer sorts and prioritizes its own copy of the agents
+            List<Agent> racerAgents = new ArrayList<>();
+            for (Agent agent : agents) {
+                racerAgents.add(new Agent(agent.id(), agent.start(), agent.goal(), configuration.priorityStrategy()));
+            }
+            completionService.submit(() -> new Result(CBS.withCancellation(finished::get,
+                    () -> CBS.withStats(stats, () -> Searcher.boostedCbs(grid, racerAgents, configuration.algorithm(),
+                            morphingEnabled, configuration.conflictResolutionStrategy()))), configuration));
+        }
+
+        Result best = null;
+        long deadline = 0;
+        try {
+            for (int received = 0; received < race.size(); received++) {
+                Future<Result> future = best == null ? completionService.take() :
+                        completionService.poll(deadline - System.nanoTime(), TimeUnit.NANOSECONDS);
+                if (future == null) {
+                    break;  // Grace window over
+                }
+                Result result;
+                try {
+                    result = future.get();
+                } catch (ExecutionException e) {
+                    System.out.println("Portfolio configuration failed: " + e.getCause());
+                    continue;
+                }
+                if (result.solution() == null || result.solution().isEmpty()) {
+                    continue;
+                }
+                if (best == null) {
+                    deadline = System.nanoTime() + GRACE_MS * 1_000_000;
+                }
+                if (best == null || cost(result.solution()) < cost(best.solution())) {
+                    best = result;
+                }
+            }
+        } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+        } finally {
+            // Remaining racers return at their next expansion
+            finished.set(true);
+        }
+
+        if (best != null) {
+            wins.computeIfAbsent(best.winner(), configuration -> new AtomicInteger()).incrementAndGet();
+            System.out.println("Portfolio winner: " + best.winner() + " (cost " + cost(best.solution()) + ")");
+        }
+        return best;
+    }
+
+    // The SIZE - 1 most successful configurations plus one of the rest
+    private static List<Configuration> race() {
+        List<Configuration> ranked = ranked();
+        if (SIZE < 2 || SIZE >= ranked.size()) {
+            return ranked.subList(0, SIZE);
+        }
+        List<Configuration> race = new ArrayList<>(ranked.subList(0, SIZE - 1));
+        List<Configuration> rest = ranked.subList(SIZE - 1, ranked.size());
+        race.add(rest.get(Math.floorMod(explorations.getAndIncrement(), rest.size())));
+        return race;
+    }
+
+    // Configurations by descending win count; ties keep the initial order
+    private static List<Configuration> ranked() {
+        List<Configuration> ranked = new ArrayList<>(CONFIGURATIONS);
+        ranked.sort(Comparator.comparingInt((Configuration configuration) ->
+                wins.getOrDefault(configuration, new AtomicInteger()).get()).reversed());
+        return ranked;
+    }
+
+    public static Map<String, Integer> getWins() {
+        Map<String, Integer> counts = new LinkedHashMap<>();
+        for (Configuration configuration : ranked()) {
+            counts.put(configuration.toString(), wins.getOrDefault(configuration, new AtomicInteger()).get());
+        }
+        return counts;
+    }
+
+    private static int cost(Map<Integer, List<Coordinate>> solution) {
+        int cost = 0;
+        for (List<Coordinate> path : solution.values()) {
+            cost += path.size();
+        }
+        return cost;
+    }
+}
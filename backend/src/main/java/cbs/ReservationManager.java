@@ -3,6 +3,7 @@ package cbs;
 import pathfinding.SubNode;
 import tools.Agent;
 import tools.Coordinate;
+import tools.Grid;
 
 import java.util.ArrayList;
 import java.util.HashMap;
@@ -10,12 +11,12 @@ import java.util.List;
 import java.util.Map;
 
 public class ReservationManager {
-    private int[][] grid;
+    private Grid grid;
     private Map<SubNode, Integer> reservations = new HashMap<>();
     private List<SubNode> morphicPositions = new ArrayList<>();
     private boolean morphingEnabled;
 
-    public ReservationManager(int[][] grid, boolean morphingEnabled) {
+    public ReservationManager(Grid grid, boolean morphingEnabled) {
         this.grid = grid;
         this.morphingEnabled = morphingEnabled;
         if (morphingEnabled) {
@@ -95,7 +96,7 @@ public class ReservationManager {
         for (int[] direction : directions) {
             int nx = currentCoordinate.x() + direction[0];
             int ny = currentCoordinate.y() + direction[1];
-            if (nx >= 0 && nx < grid.length && ny >= 0 && ny < grid[0].length && grid[ny][nx] != 1) {
+            if (grid.isFree(nx, ny)) {
                 neighbors.add(SubNode.of(Coordinate.with(nx, ny), time));
             }
         }
@@ -0,0 +1,119 @@
+package cbs;
+
+import pathfinding.PathFinder;
+import pathfinding.SubNode;
+import tools.*;
+
+import java.util.*;
+
+/**
+ * Windowed CBS used by the lifelong mode: every agent gets a full path to its current goal,
+ * but conflicts are only resolved for the first {@code window} timesteps, so the cost of a
+ * planning cycle is bounded by the window instead of the total mission length.
+ */
+public class RollingHorizonPlanner {
+
+    // High-level expansions per planning cycle (-Dlifelong.maxExpansions)
+    private static final int MAX_EXPANSIONS = Integer.getInteger("lifelong.maxExpansions", 1000);
+
+    public static Map<Integer, List<Coordinate>> plan(
+            Grid grid, List<Agent> agents, String algorithm, String conflictResolutionStrategy, int window) {
+
+        PathFinder pathFinder = PathFinder.getPathFinder(algorithm);
+
+        Map<Integer, Integer> priorities = new HashMap<>();
+        for (Agent agent : agents) {
+            priorities.put(agent.id(), agent.getPriority());
+        }
+
+        // Initial planning: every agent on its own (morphing does not apply to lifelong fleets)
+        ReservationManager reservationManager = new ReservationManager(grid, false);
+        Map<Integer, List<Coordinate>> paths = new HashMap<>();
+        for (Agent agent : agents) {
+            List<Coordinate> path = findWindowedPath(grid, agent, pathFinder, reservationManager, window);
+            if (path == null) {
+                System.out.println("Agent " + agent.id() + " cannot reach its goal");
+                return null;
+            }
+            paths.put(agent.id(), path);
+        }
+
+        BoundedOpenList<CBSNode> openSet = new BoundedOpenList<>(CBS.getMaxOpenNodes());
+        openSet.add(CBSNode.root(paths));
+
+        int expansions = 0;
+        while (!openSet.isEmpty() && expansions < MAX_EXPANSIONS) {
+            expansions++;
+            CBSNode node = openSet.poll();
+            Map<Integer, List<Coordinate>> nodePaths = node.agentIdToPath();
+            Conflict conflict = ConflictDetector.detectConflict(nodePaths, priorities,
+                    conflictResolutionStrategy, grid, agents, window);
+
+            if (conflict == null) {
+                System.out.println("Found windowed solution after " + expansions + " expansions");
+                return nodePaths;
+            }
+
+            int agentLow = conflict.agentLow;
+            Constraint constraint = new Constraint(agentLow, conflict.coordinate, conflict.t);
+
+            // Re-plan the lower-priority agent around everyone else's path inside the window
+            reservationManager.clearReservations();
+            reservationManager.addAllReservations(
+                    windowReservations(CBS.createReservations(nodePaths, agentLow), window));
+
+            Agent agentLowObj = findAgentById(agents, agentLow);
+            assert agentLowObj != null;
+            List<Coordinate> constrainedPath = findWindowedPath(grid, agentLowObj, pathFinder, reservationManager, window);
+            if (constrainedPath == null) {
+                continue;
+            }
+
+            openSet.add(node.child(agentLow, constrainedPath, constraint));
+        }
+        System.out.println("No conflict-free window found after " + expansions + " expansions");
+        return null;
+    }
+
+    /**
+     * Shortest path to the goal that respects the reservations, padded with the goal so that it
+     * covers the whole window. Beyond the window nothing is reserved, so waiting at most
+     * {@code window} extra steps always suffices if the goal is reachable at all.
+     */
+    private static List<Coordinate> findWindowedPath(Grid grid, Agent agent, PathFinder pathFinder,
+                                                     ReservationManager reservationManager, int window) {
+        int distance = PathFinder.distance(grid, agent.start(), agent.goal());
+        if (distance < 0) {
+            return null;
+        }
+        for (int length = distance; length <= distance + window; length++) {
+            List<Coordinate> path = pathFinder.findPath(grid, agent, reservationManager, length);
+            if (path != null) {
+                while (path.size() <= window) {
+                    path.add(path.get(path.size() - 1));
+                }
+                return path;
+            }
+        }
+        return null;
+    }
+
+    private static Map<SubNode, Integer> windowReservations(Map<SubNode, Integer> reservations, int window) {
+        Map<SubNode, Integer> windowed = new HashMap<>();
+        reservations.forEach((node, agentId) -> {
+            if (node.g <= window) {
+                windowed.put(node, agentId);
+            }
+        });
+        return windowed;
+    }
+
+    private static Agent findAgentById(List<Agent> agents, int id) {
+        for (Agent agent : agents) {
+            if (agent.id() == id) {
+                return agent;
+            }
+        }
+        return null;
+    }
+}
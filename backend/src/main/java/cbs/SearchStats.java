@@ -0,0 +1,62 @@
+package cbs;
+
+import java.util.concurrent.atomic.AtomicInteger;
+
+/**
+ * Counters of one search, shared by every thread working on it: high-level expansions (CBS nodes
+ * taken from the open list), fallbacks (an agent found no path and planning restarted) and nodes
+ * evicted from a full open list. A search that failed after evicting nodes records why, since it
+ * did not prove that no solution exists.
+ */
+public class SearchStats {
+    private final AtomicInteger expansions = new AtomicInteger();
+    private final AtomicInteger fallbacks = new AtomicInteger();
+    private final AtomicInteger evictions = new AtomicInteger();
+    private volatile String failureReason = null;
+
+    void expanded() {
+        expansions.incrementAndGet();
+    }
+
+    void fellBack() {
+        fallbacks.incrementAndGet();
+    }
+
+    void failedIncomplete(int evicted, int capacity) {
+        evictions.addAndGet(evicted);
+        failureReason = "open list cap of " + capacity + " nodes reached, " + evicted
+                + " nodes evicted, so the search was incomplete";
+    }
+
+    void add(SearchStats other) {
+        expansions.addAndGet(other.getExpansions());
+        fallbacks.addAndGet(other.getFallbacks());
+        evictions.addAndGet(other.getEvictions());
+        if (other.getFailureReason() != null) {
+            failureReason = other.getFailureReason();
+        }
+    }
+
+    public int getExpansions() {
+        return expansions.get();
+    }
+
+    public int getFallbacks() {
+        return fallbacks.get();
+    }
+
+    public int getEvictions() {
+        return evictions.get();
+    }
+
+    // Why a search without a solution was not exhaustive, or null if the failure is proven
+    public String getFailureReason() {
+        return failureReason;
+    }
+
+    @Override
+    public String toString() {
+        return getExpansions() + " high-level expansions, " + getFallbacks() + " fallbacks"
+                + (failureReason != null ? " (" + failureReason + ")" : "");
+    }
+}
@@ -3,6 +3,7 @@ package cbs;
 import pathfinding.PathFinder;
 import tools.Agent;
 import tools.Coordinate;
+import tools.Grid;
 
 import java.util.HashMap;
 import java.util.List;
@@ -10,22 +11,27 @@ import java.util.Map;
 
 public class Searcher {
 
-    public static Map<Integer, List<Coordinate>> boostedCbs(int[][] grid, List<Agent> agents) {
+    public static Map<Integer, List<Coordinate>> boostedCbs(Grid grid, List<Agent> agents) {
         return boostedCbs(grid, agents, "astar", true, "priority");  // Default: A* and morphing enabled, priority-based conflict resolution
     }
 
-    public static Map<Integer, List<Coordinate>> boostedCbs(int[][] grid, List<Agent> agents, String algorithm) {
+    public static Map<Integer, List<Coordinate>> boostedCbs(Grid grid, List<Agent> agents, String algorithm) {
         return boostedCbs(grid, agents, algorithm, true, "priority");  // Default: morphing enabled, priority-based conflict resolution
     }
 
     public static Map<Integer, List<Coordinate>> boostedCbs(
-            int[][] grid, List<Agent> agents, String algorithm, boolean morphingEnabled) {
+            Grid grid, List<Agent> agents, String algorithm, boolean morphingEnabled) {
         return boostedCbs(grid, agents, algorithm, morphingEnabled, "priority"); // Default: priority-based conflict resolution
     }
 
     public static Map<Integer, List<Coordinate>> boostedCbs(
-            int[][] grid, List<Agent> agents, String algorithm,
+            Grid grid, List<Agent> agents, String algorithm,
             boolean morphingEnabled, String conflictResolutionStrategy) {
+        if (!morphingEnabled) {
+            // Without morphing agents only interact through conflicts, so independent groups can be split off
+            return IndependenceDetector.solve(grid, agents, algorithm, conflictResolutionStrategy);
+        }
+        // Morphing keeps agents adjacent to each other's reservations, so the fleet is one coupled group
         Map<Integer, List<Coordinate>> solution = CBS.cbs(
                 grid, agents, new HashMap<>(), algorithm, morphingEnabled, null, conflictResolutionStrategy);
         return solution;
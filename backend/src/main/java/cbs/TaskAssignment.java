@@ -0,0 +1,220 @@
+package cbs;
+
+import hungarian.AssignmentEnumerator;
+import pathfinding.PathFinder;
+import pathfinding.SubNode;
+import tools.Agent;
+import tools.CBSNode;
+import tools.Conflict;
+import tools.Coordinate;
+import tools.Grid;
+
+import java.util.*;
+import java.util.concurrent.atomic.AtomicLong;
+import java.util.function.BooleanSupplier;
+
+/**
+ * Conflict-based search with task assignment (CBS-TA). Assignments are costed with obstacle-aware
+ * BFS distances and enumerated lazily, cheapest total distance first (Murty's method). Each one is
+ * the root of its own CBS tree, and every tree shares one open list ordered by sum of arrival
+ * times: the next assignment only gets a root once the previous assignment's root is expanded, so
+ * assignments that cannot beat the trees already open are never planned.
+ *
+ * Paths here always last exactly the makespan bound. A root starts at the longest distance of its
+ * assignment; when its agents cannot be planned within the bound, or a conflict leaves an agent
+ * without a path, the root is queued again with a bound one step longer instead of being dropped.
+ */
+public class TaskAssignment {
+
+    // Assignments given a root (-Dcbsta.maxAssignments) and nodes expanded over all trees (-Dcbsta.maxExpansions)
+    private static final int MAX_ASSIGNMENTS = Integer.getInteger("cbsta.maxAssignments", 64);
+    private static final int MAX_EXPANSIONS = Integer.getInteger("cbsta.maxExpansions", 10_000);
+    // Same limit as CBS.cbs
+    private static final int MAX_BOUND = 200;
+
+    private static final AtomicLong SEQUENCE = new AtomicLong();
+
+    // The CBS tree of one assignment
+    private record Tree(int[] assignment, List<Agent> agents, Map<Integer, Integer> priorities) {}
+
+    // A node of a tree, or its root still to be planned within bound when node is null
+    private record Entry(int cost, long sequence, Tree tree, int bound, CBSNode node) implements Comparable<Entry> {
+        Entry(int cost, Tree tree, int bound, CBSNode node) {
+            this(cost, SEQUENCE.getAndIncrement(), tree, bound, node);
+        }
+
+        @Override
+        public int compareTo(Entry other) {
+            int byCost = Integer.compare(cost, other.cost);
+            return byCost != 0 ? byCost : Long.compare(sequence, other.sequence);
+        }
+    }
+
+    public static Map<Integer, List<Coordinate>> solve(
+            Grid grid, int[][] origins, int[][] destinations, String priorityStrategy, String algorithm,
+            boolean morphingEnabled, String conflictResolutionStrategy) {
+        if (origins.length != destinations.length) {
+            throw new IllegalArgumentException(origins.length + " origins but " + destinations.length + " destinations");
+        }
+        if (origins.length == 0) {
+            return new HashMap<>();
+        }
+
+        int[][] distances = distances(grid, origins, destinations);
+        // One enumeration for the whole search; every assignment is handed out exactly once
+        AssignmentEnumerator enumerator = new AssignmentEnumerator(distances);
+        if (!enumerator.hasNext()) {
+            System.out.println("CBS-TA: some destination cannot be reached by any agent");
+            return null;
+        }
+
+        BooleanSupplier cancellation = CBS.getCancellation();
+        SearchStats stats = CBS.getStats();
+        PathFinder pathFinder = PathFinder.getPathFinder(algorithm);
+        BoundedOpenList<Entry> open = new BoundedOpenList<>(CBS.getMaxOpenNodes());
+        int[] firstAssignment = enumerator.next();
+        Tree newest = tree(origins, destinations, firstAssignment, priorityStrategy);
+        open.add(new Entry(enumerator.cost(firstAssignment), newest, makespan(distances, firstAssignment), null));
+
+        int expansions = 0;
+        while (!open.isEmpty() && expansions < MAX_EXPANSIONS) {
+            if (cancellation.getAsBoolean()) {
+                return null;
+            }
+            Entry entry = open.poll();
+            Tree tree = entry.tree();
+            expansions++;
+            stats.expanded();
+
+            if (entry.node() == null) {
+                if (tree == newest && enumerator.getEnumerated() < MAX_ASSIGNMENTS && enumerator.hasNext()) {
+                    // Open the next assignment now: its total distance is not below this root's
+                    int[] next = enumerator.next();
+                    newest = tree(origins, destinations, next, priorityStrategy);
+                    open.add(new Entry(enumerator.cost(next), newest, makespan(distances, next), null));
+                }
+                Map<Integer, List<Coordinate>> paths = planRoot(grid, tree, pathFinder, morphingEnabled, entry.bound());
+                if (paths == null) {
+                    retry(open, entry);
+                } else {
+                    open.add(new Entry(arrivals(paths, tree), tree, entry.bound(), CBSNode.root(paths)));
+                }
+                continue;
+            }
+
+            Map<Integer, List<Coordinate>> nodePaths = entry.node().agentIdToPath();
+            Conflict conflict = ConflictDetector.detectConflict(nodePaths, tree.priorities(),
+                    conflictResolutionStrategy, grid, tree.agents());
+            if (conflict == null) {
+                System.out.println("CBS-TA: solved after " + expansions + " expansions over "
+                        + enumerator.getEnumerated() + " assignments, makespan bound " + entry.bound()
+                        + ", total distance " + enumerator.cost(tree.assignment()));
+                return nodePaths;
+            }
+            CBSNode child = CBS.resolve(entry.node(), nodePaths, conflict, grid, tree.agents(), pathFinder,
+                    new ReservationManager(grid, morphingEnabled), entry.bound());
+            if (child == null) {
+                retry(open, entry);
+            } else {
+                open.add(new Entry(arrivals(child.agentIdToPath(), tree), tree, entry.bound(), child));
+            }
+        }
+
+        if (open.isEmpty()) {
+            if (open.getEvicted() > 0) {
+                stats.failedIncomplete(open.getEvicted(), CBS.getMaxOpenNodes());
+            }
+            System.out.println("CBS-TA: no assignment can be solved within " + MAX_BOUND + " steps");
+            return null;
+        }
+        // Out of budget: plan the cheapest assignment with CBS's own fallbacks
+        System.out.println("CBS-TA: no assignment solved within " + MAX_EXPANSIONS + " expansions over "
+                + enumerator.getEnumerated() + " assignments");
+        return CBS.cbs(grid, tree(origins, destinations, firstAssignment, priorityStrategy).agents(), new HashMap<>(),
+                algorithm, morphingEnabled, null, conflictResolutionStrategy);
+    }
+
+    // Queue the entry's root again with a longer makespan bound, keeping its place in the cost order
+    private static void retry(BoundedOpenList<Entry> open, Entry entry) {
+        if (entry.bound() < MAX_BOUND) {
+            open.add(new Entry(entry.cost(), entry.tree(), entry.bound() + 1, null));
+        }
+    }
+
+    // Plan agents in priority order, each avoiding the paths of those before it, or null if one has no path
+    private static Map<Integer, List<Coordinate>> planRoot(
+            Grid grid, Tree tree, PathFinder pathFinder, boolean morphingEnabled, int bound) {
+        ReservationManager reservationManager = new ReservationManager(grid, morphingEnabled);
+        List<Agent> agents = new ArrayList<>(tree.agents());
+        agents.sort(Comparator.comparingInt(Agent::getPriority));
+        Map<Integer, List<Coordinate>> paths = new HashMap<>();
+        for (Agent agent : agents) {
+            List<Coordinate> path = pathFinder.findPath(grid, agent, reservationManager, bound);
+            if (path == null) {
+                return null;
+            }
+            for (int t = 0; t < path.size(); t++) {
+                reservationManager.addReservation(SubNode.of(path.get(t), t), agent.id());
+            }
+            paths.put(agent.id(), path);
+        }
+        return paths;
+    }
+
+    // Sum over agents of the step from which they stay on their goal
+    private static int arrivals(Map<Integer, List<Coordinate>> paths, Tree tree) {
+        int sum = 0;
+        for (Agent agent : tree.agents()) {
+            List<Coordinate> path = paths.get(agent.id());
+            int arrival = path.size() - 1;
+            while (arrival > 0 && path.get(arrival - 1).equals(agent.goal())) {
+                arrival--;
+            }
+            sum += arrival;
+        }
+        return sum;
+    }
+
+    private static Tree tree(int[][] origins, int[][] destinations, int[] assignment, String priorityStrategy) {
+        List<Agent> agents = agents(origins, destinations, assignment, priorityStrategy);
+        Map<Integer, Integer> priorities = new HashMap<>();
+        for (Agent agent : agents) {
+            priorities.put(agent.id(), agent.getPriority());
+        }
+        return new Tree(assignment, agents, priorities);
+    }
+
+    private static int makespan(int[][] distances, int[] assignment) {
+        int makespan = 0;
+        for (int i = 0; i < assignment.length; i++) {
+            makespan = Math.max(makespan, distances[i][assignment[i]]);
+        }
+        return makespan;
+    }
+
+    private static List<Agent> agents(int[][] origins, int[][] destinations, int[] assignment, String priorityStrategy) {
+        List<Agent> agents = new ArrayList<>();
+        for (int i = 0; i < origins.length; i++) {
+            int[] destination = destinations[assignment[i]];
+            agents.add(new Agent(i, Coordinate.with(origins[i][0], origins[i][1]),
+                    Coordinate.with(destination[0], destination[1]), priorityStrategy));
+        }
+        return agents;
+    }
+
+    // distances[origin][destination] in steps, AssignmentEnumerator.INFEASIBLE if unreachable
+    private static int[][] distances(Grid grid, int[][] origins, int[][] destinations) {
+        int[][] distances = new int[origins.length][destinations.length];
+        for (int i = 0; i < origins.length; i++) {
+            Coordinate origin = Coordinate.with(origins[i][0], origins[i][1]);
+            for (int j = 0; j < destinations.length; j++) {
+                int distance = -1;
+                if (grid.isFree(origin.x(), origin.y())) {
+                    distance = PathFinder.distance(grid, origin, Coordinate.with(destinations[j][0], destinations[j][1]));
+                }
+                distances[i][j] = distance < 0 ? AssignmentEnumerator.INFEASIBLE : distance;
+            }
+        }
+        return distances;
+    }
+}
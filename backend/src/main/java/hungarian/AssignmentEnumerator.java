@@ -0,0 +1,118 @@
+package hungarian;
+
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.List;
+import java.util.PriorityQueue;
+
+/**
+ * Lazily enumerates the assignments of a square cost matrix in order of increasing total cost
+ * (Murty's k-best algorithm). Each subproblem fixes some row-column pairs and forbids others and
+ * is solved with the Hungarian algorithm; next() hands out the cheapest open subproblem's solution
+ * and partitions the rest of its solution space into new subproblems.
+ * Entries of at least INFEASIBLE mark pairs that must never be assigned.
+ */
+public class AssignmentEnumerator {
+
+    public static final int INFEASIBLE = 1_000_000;
+
+    private record Subproblem(int[] assignment, int cost, int[] fixed, List<int[]> forbidden) {}
+
+    private final int[][] costs;
+    private final PriorityQueue<Subproblem> open = new PriorityQueue<>((a, b) -> Integer.compare(a.cost(), b.cost()));
+    private int enumerated = 0;
+
+    public AssignmentEnumerator(int[][] costs) {
+        this.costs = costs;
+        int[] fixed = new int[costs.length];
+        Arrays.fill(fixed, -1);
+        Subproblem first = solve(fixed, new ArrayList<>());
+        if (first != null) {
+            open.add(first);
+        }
+    }
+
+    /**
+     * The next cheapest assignment as assignment[row] = column, or null once every feasible
+     * assignment was returned.
+     */
+    public int[] next() {
+        Subproblem best = open.poll();
+        if (best == null) {
+            return null;
+        }
+        enumerated++;
+        // Child k keeps the first k free rows of this solution and excludes its pair in row k
+        int[] fixed = best.fixed().clone();
+        for (int row = 0; row < costs.length; row++) {
+            if (best.fixed()[row] >= 0) {
+                continue;
+            }
+            List<int[]> forbidden = new ArrayList<>(best.forbidden());
+            forbidden.add(new int[]{row, best.assignment()[row]});
+            Subproblem child = solve(fixed.clone(), forbidden);
+            if (child != null) {
+                open.add(child);
+            }
+            fixed[row] = best.assignment()[row];
+        }
+        return best.assignment();
+    }
+
+    public boolean hasNext() {
+        return !open.isEmpty();
+    }
+
+    public int getEnumerated() {
+        return enumerated;
+    }
+
+    public int cost(int[] assignment) {
+        int cost = 0;
+        for (int row = 0; row < assignment.length; row++) {
+            cost += costs[row][assignment[row]];
+        }
+        return cost;
+    }
+
+    private Subproblem solve(int[] fixed, List<int[]> forbidden) {
+        int n = costs.length;
+        int[][] matrix = new int[n][];
+        for (int row = 0; row < n; row++) {
+            matrix[row] = costs[row].clone();
+        }
+        for (int row = 0; row < n; row++) {
+            if (fixed[row] < 0) {
+                continue;
+            }
+            for (int other = 0; other < n; other++) {
+                if (other != fixed[row]) {
+                    matrix[row][other] = INFEASIBLE;
+                }
+                if (other != row) {
+                    matrix[other][fixed[row]] = INFEASIBLE;
+                }
+            }
+        }
+        for (int[] pair : forbidden) {
+            matrix[pair[0]][pair[1]] = INFEASIBLE;
+        }
+
+        int[] assignment = new int[n];
+        // HungarianAlgorithm reports each pair as {column, row}
+        for (int[] pair : new HungarianAlgorithm(matrix).findOptimalAssignment()) {
+            assignment[pair[1]] = pair[0];
+        }
+        for (int row = 0; row < n; row++) {
+            if (costs[row][assignment[row]] >= INFEASIBLE || (fixed[row] >= 0 && assignment[row] != fixed[row])) {
+                return null;
+            }
+        }
+        for (int[] pair : forbidden) {
+            if (assignment[pair[0]] == pair[1]) {
+                return null;
+            }
+        }
+        return new Subproblem(assignment, cost(assignment), fixed, forbidden);
+    }
+}
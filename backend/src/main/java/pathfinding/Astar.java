@@ -3,17 +3,22 @@ package pathfinding;
 import cbs.ReservationManager;
 import tools.Agent;
 import tools.Coordinate;
+import tools.Grid;
 
+import java.nio.IntBuffer;
 import java.util.*;
 
 public class Astar extends PathFinder {
     @Override
     public List<Coordinate> findPath(
-            int[][] grid, Agent agent, ReservationManager reservationManager, int maxPathLength) {
+            Grid grid, Agent agent, ReservationManager reservationManager, int maxPathLength) {
         Coordinate start = agent.start();
         Coordinate goal = agent.goal();
-        PriorityQueue<Node> openSet = new PriorityQueue<>(
-                Comparator.comparingInt(node -> node.g + heuristic(node.coordinate, goal)));
+        // The exact remaining distance is a tighter estimate than the Manhattan/Chebyshev bound
+        IntBuffer distances = distanceField(grid, goal);
+        PriorityQueue<Node> openSet = new PriorityQueue<>(Comparator.comparingInt(node -> node.g +
+                (distances != null ? distances.get(node.coordinate.y() * grid.getWidth() + node.coordinate.x())
+                        : heuristic(grid, node.coordinate, goal))));
         Node startNode = new Node(Coordinate.with(start.x(), start.y()), 0, new ArrayList<>());
         startNode.path.add(startNode);
         openSet.add(startNode);
@@ -38,6 +43,11 @@ public class Astar extends PathFinder {
                 int t = current.g + 1;
                 SubNode neighborNode = SubNode.of(neighbor, t);
 
+                // With a stored distance field, drop cells that cannot reach the goal in time
+                if (distances != null && !canReach(distances, grid, neighbor, maxPathLength - t)) {
+                    continue;
+                }
+
                 // Check if the position is reserved by another agent
                 Map<SubNode, Integer> reservations = reservationManager.getReservations();
                 if (reservations.containsKey(neighborNode) &&
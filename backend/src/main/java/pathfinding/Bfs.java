@@ -3,15 +3,18 @@ package pathfinding;
 import cbs.ReservationManager;
 import tools.Agent;
 import tools.Coordinate;
+import tools.Grid;
 
+import java.nio.IntBuffer;
 import java.util.*;
 
 public class Bfs extends PathFinder {
     @Override
     public List<Coordinate> findPath(
-            int[][] grid, Agent agent, ReservationManager reservationManager, int maxPathLength) {
+            Grid grid, Agent agent, ReservationManager reservationManager, int maxPathLength) {
         Coordinate start = agent.start();
         Coordinate goal = agent.goal();
+        IntBuffer distances = distanceField(grid, goal);
         Queue<Node> queue = new LinkedList<>();
         Node startNode = new Node(Coordinate.with(start.x(), start.y()), 0, new ArrayList<>());
         startNode.path.add(startNode);
@@ -37,6 +40,11 @@ public class Bfs extends PathFinder {
                 int t = current.g + 1;
                 SubNode neighborNode = SubNode.of(neighbor, t);
 
+                // With a stored distance field, drop cells that cannot reach the goal in time
+                if (distances != null && !canReach(distances, grid, neighbor, maxPathLength - t)) {
+                    continue;
+                }
+
                 // Check if the position is reserved by another agent
                 Map<SubNode, Integer> reservations = reservationManager.getReservations();
                 if (reservations.containsKey(neighborNode) &&
@@ -3,16 +3,34 @@ package pathfinding;
 import cbs.ReservationManager;
 import tools.Agent;
 import tools.Coordinate;
+import tools.Grid;
+import tools.MapStore;
 
+import java.nio.IntBuffer;
+import java.util.ArrayDeque;
 import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.Iterator;
+import java.util.LinkedHashMap;
 import java.util.List;
 import java.util.Map;
 
+/**
+ * Low-level search of one agent. Movement rules come from the grid (Grid.allowsDiagonals), so
+ * concurrent searches with different rules do not interfere.
+ */
 public abstract class PathFinder {
-    private static boolean allowDiagonals = false;
+    // Cells of the BFS fields kept for goals without a stored field (-Dpathfinding.fieldCacheCells)
+    private static final long FIELD_CACHE_CELLS = Long.getLong("pathfinding.fieldCacheCells", 1L << 24);
+
+    private record FieldKey(String mapId, Coordinate goal, boolean diagonals) {}
+
+    // Least recently used first
+    private static final LinkedHashMap<FieldKey, int[]> computedFields = new LinkedHashMap<>(16, 0.75f, true);
+    private static long computedCells = 0;
 
     public abstract List<Coordinate> findPath(
-            int[][] grid,
+            Grid grid,
             Agent agent,
             ReservationManager reservationManager,
             int maxPathLength
@@ -26,15 +44,7 @@ public abstract class PathFinder {
         }
     }
 
-    public static void setAllowDiagonals(boolean allowDiag) {
-        allowDiagonals = allowDiag;
-    }
-
-    public static boolean getAllowDiagonals() {
-        return allowDiagonals;
-    }
-
-    public static List<Coordinate> getNeighbors(Coordinate currentCoordinate, int[][] grid) {
+    public static List<Coordinate> getNeighbors(Coordinate currentCoordinate, Grid grid) {
         List<Coordinate> neighbors = new ArrayList<>();
 
         // (Von Neumann)
@@ -42,18 +52,18 @@ public abstract class PathFinder {
         for (int[] direction : cardinalDirections) {
             int nx = currentCoordinate.x() + direction[0];
             int ny = currentCoordinate.y() + direction[1];
-            if (nx >= 0 && nx < grid.length && ny >= 0 && ny < grid[0].length && grid[ny][nx] != 1) {
+            if (grid.isFree(nx, ny)) {
                 neighbors.add(Coordinate.with(nx, ny));
             }
         }
 
-        // Add diagonal directions if allowDiagonals is true (Moore)
-        if (allowDiagonals) {
+        // Add diagonal directions if the grid allows them (Moore)
+        if (grid.allowsDiagonals()) {
             int[][] diagonalDirections = {{1,1}, {1,-1}, {-1,-1}, {-1,1}};
             for (int[] direction : diagonalDirections) {
                 int nx = currentCoordinate.x() + direction[0];
                 int ny = currentCoordinate.y() + direction[1];
-                if (nx >= 0 && nx < grid.length && ny >= 0 && ny < grid[0].length && grid[ny][nx] != 1) {
+                if (grid.isFree(nx, ny)) {
                     neighbors.add(Coordinate.with(nx, ny));
                 }
             }
@@ -70,8 +80,75 @@ public abstract class PathFinder {
         return path;
     }
 
-    public static int heuristic(Coordinate start, Coordinate goal) {
-        if (allowDiagonals) {
+    // Precomputed BFS distances to goal from the map store, or null if there are none for this map and goal
+    public static IntBuffer distanceField(Grid grid, Coordinate goal) {
+        return MapStore.distanceField(grid, goal, grid.allowsDiagonals());
+    }
+
+    /**
+     * Obstacle-aware distance from start to goal ignoring other agents, or -1 if the goal is
+     * unreachable. Uses the stored field of the goal, else a BFS field computed once and cached.
+     */
+    public static int distance(Grid grid, Coordinate start, Coordinate goal) {
+        int index = start.y() * grid.getWidth() + start.x();
+        IntBuffer stored = distanceField(grid, goal);
+        return stored != null ? stored.get(index) : computedField(grid, goal)[index];
+    }
+
+    private static int[] computedField(Grid grid, Coordinate goal) {
+        FieldKey key = new FieldKey(grid.contentHash(), goal, grid.allowsDiagonals());
+        synchronized (computedFields) {
+            int[] field = computedFields.get(key);
+            if (field != null) {
+                return field;
+            }
+        }
+        int[] field = bfsField(grid, goal);
+        synchronized (computedFields) {
+            if (computedFields.put(key, field) == null) {
+                computedCells += field.length;
+            }
+            Iterator<int[]> eldest = computedFields.values().iterator();
+            while (computedCells > FIELD_CACHE_CELLS && computedFields.size() > 1) {
+                computedCells -= eldest.next().length;
+                eldest.remove();
+            }
+        }
+        return field;
+    }
+
+    // Distance from every cell to goal with the current movement rules, -1 if unreachable
+    private static int[] bfsField(Grid grid, Coordinate goal) {
+        int width = grid.getWidth();
+        int[] field = new int[width * grid.getHeight()];
+        Arrays.fill(field, -1);
+        if (!grid.isFree(goal.x(), goal.y())) {
+            return field;
+        }
+        field[goal.y() * width + goal.x()] = 0;
+        ArrayDeque<Coordinate> queue = new ArrayDeque<>(List.of(goal));
+        while (!queue.isEmpty()) {
+            Coordinate current = queue.poll();
+            int distance = field[current.y() * width + current.x()];
+            for (Coordinate neighbor : getNeighbors(current, grid)) {
+                int index = neighbor.y() * width + neighbor.x();
+                if (field[index] < 0) {
+                    field[index] = distance + 1;
+                    queue.add(neighbor);
+                }
+            }
+        }
+        return field;
+    }
+
+    // Whether coordinate can still reach the goal of a distance field within remainingSteps
+    public static boolean canReach(IntBuffer distances, Grid grid, Coordinate coordinate, int remainingSteps) {
+        int distance = distances.get(coordinate.y() * grid.getWidth() + coordinate.x());
+        return distance >= 0 && distance <= remainingSteps;
+    }
+
+    public static int heuristic(Grid grid, Coordinate start, Coordinate goal) {
+        if (grid.allowsDiagonals()) {
             return Math.max(Math.abs(start.x() - goal.x()), Math.abs(start.y() - goal.y()));
         } else {
             return Math.abs(start.x() - goal.x()) + Math.abs(start.y() - goal.y());
@@ -1,12 +1,86 @@
 package tools;
 
-import java.util.List;
-import java.util.Map;
+import java.util.*;
+import java.util.concurrent.atomic.AtomicLong;
 
-public record CBSNode(Map<Integer, List<Coordinate>> agentIdToPath, List<Constraint> constraints, int totalCost) implements Comparable<CBSNode> {
+/**
+ * CBS search node that only stores what changed relative to its parent: the single replanned
+ * agent's path and the constraint that caused it. Other paths are resolved through the parent
+ * chain, and the total cost is maintained incrementally.
+ */
+public class CBSNode implements Comparable<CBSNode> {
+    private static final AtomicLong SEQUENCE = new AtomicLong();
+
+    private final CBSNode parent;
+    private final Map<Integer, List<Coordinate>> rootPaths; // Only set on the root node
+    private final int agentId;
+    private final List<Coordinate> path;
+    private final Constraint constraint;
+    private final int totalCost;
+    private final long sequence = SEQUENCE.getAndIncrement(); // Tie-breaker, keeps ordering total
+
+    private CBSNode(CBSNode parent, Map<Integer, List<Coordinate>> rootPaths, int agentId,
+                    List<Coordinate> path, Constraint constraint, int totalCost) {
+        this.parent = parent;
+        this.rootPaths = rootPaths;
+        this.agentId = agentId;
+        this.path = path;
+        this.constraint = constraint;
+        this.totalCost = totalCost;
+    }
+
+    public static CBSNode root(Map<Integer, List<Coordinate>> paths) {
+        int totalCost = paths.values().stream().mapToInt(List::size).sum();
+        return new CBSNode(null, new HashMap<>(paths), -1, null, null, totalCost);
+    }
+
+    public CBSNode child(int replannedAgentId, List<Coordinate> newPath, Constraint newConstraint) {
+        List<Coordinate> oldPath = getPath(replannedAgentId);
+        int newCost = totalCost - (oldPath == null ? 0 : oldPath.size()) + newPath.size();
+        return new CBSNode(this, null, replannedAgentId, newPath, newConstraint, newCost);
+    }
+
+    public List<Coordinate> getPath(int id) {
+        for (CBSNode node = this; node != null; node = node.parent) {
+            if (node.parent == null) {
+                return node.rootPaths.get(id);
+            }
+            if (node.agentId == id) {
+                return node.path;
+            }
+        }
+        return null;
+    }
+
+    // Materialized view of every agent's current path; not retained by the node
+    public Map<Integer, List<Coordinate>> agentIdToPath() {
+        Map<Integer, List<Coordinate>> paths = new HashMap<>();
+        for (CBSNode node = this; node != null; node = node.parent) {
+            if (node.parent == null) {
+                node.rootPaths.forEach(paths::putIfAbsent);
+            } else {
+                paths.putIfAbsent(node.agentId, node.path);
+            }
+        }
+        return paths;
+    }
+
+    public List<Constraint> constraints() {
+        List<Constraint> constraints = new ArrayList<>();
+        for (CBSNode node = this; node.parent != null; node = node.parent) {
+            constraints.add(node.constraint);
+        }
+        Collections.reverse(constraints);
+        return constraints;
+    }
+
+    public int totalCost() {
+        return totalCost;
+    }
 
     @Override
     public int compareTo(CBSNode other) {
-        return Integer.compare(this.totalCost, other.totalCost);
+        int byCost = Integer.compare(this.totalCost, other.totalCost);
+        return byCost != 0 ? byCost : Long.compare(this.sequence, other.sequence);
     }
 }
@@ -0,0 +1,175 @@
+package tools;
+
+import java.nio.ByteBuffer;
+import java.security.MessageDigest;
+import java.security.NoSuchAlgorithmException;
+import java.util.HexFormat;
+
+/**
+ * Bit-packed passability index: one bit per cell, set for obstacles, stored row-major so that
+ * cell (x, y) is bit {@code y * width + x}. A 1000x1000 map takes 125 KB instead of a 4 MB int[][],
+ * and a passability check is a bounds test plus one word lookup.
+ * The grid also carries the movement rule of the search using it: whether agents may move
+ * diagonally. withDiagonals() gives a view with another rule over the same cells.
+ */
+public final class Grid {
+    private final int width;
+    private final int height;
+    private final long[] blocked;
+    private final boolean diagonals;
+    private volatile String contentHash;  // Computed on first use
+
+    private Grid(int width, int height, long[] blocked) {
+        this(width, height, blocked, false, null);
+    }
+
+    private Grid(int width, int height, long[] blocked, boolean diagonals, String contentHash) {
+        this.width = width;
+        this.height = height;
+        this.blocked = blocked;
+        this.diagonals = diagonals;
+        this.contentHash = contentHash;
+    }
+
+    // The same cells with diagonal moves allowed or not; the content hash does not depend on it
+    public Grid withDiagonals(boolean allowDiagonals) {
+        return allowDiagonals == diagonals ? this : new Grid(width, height, blocked, allowDiagonals, contentHash);
+    }
+
+    public boolean allowsDiagonals() {
+        return diagonals;
+    }
+
+    private static long[] words(int width, int height) {
+        if (width < 0 || height < 0) {
+            throw new IllegalArgumentException("Invalid grid size " + width + "x" + height);
+        }
+        return new long[(int) (((long) width * height + 63) / 64)];
+    }
+
+    // Dense int[][] as sent by older clients: grid[y][x] == 1 marks an obstacle
+    public static Grid of(int[][] cells) {
+        int height = cells.length;
+        int width = height > 0 ? cells[0].length : 0;
+        long[] blocked = words(width, height);
+        for (int y = 0; y < height; y++) {
+            if (cells[y].length != width) {
+                throw new IllegalArgumentException("Row " + y + " has " + cells[y].length + " cells, expected " + width);
+            }
+            for (int x = 0; x < width; x++) {
+                if (cells[y][x] == 1) {
+                    int i = y * width + x;
+                    blocked[i >>> 6] |= 1L << i;
+                }
+            }
+        }
+        return new Grid(width, height, blocked);
+    }
+
+    /**
+     * Packed bitset with 1 for obstacles, row-major and least significant bit first within each byte
+     * (numpy.packbits(..., bitorder="little")).
+     */
+    public static Grid fromBitset(int width, int height, byte[] bits) {
+        long[] blocked = words(width, height);
+        long cells = (long) width * height;
+        if (bits.length < (cells + 7) / 8) {
+            throw new IllegalArgumentException("Bitset has " + bits.length + " bytes, expected " + (cells + 7) / 8);
+        }
+        for (int i = 0; i < blocked.length * 8 && i < bits.length; i++) {
+            blocked[i >>> 3] |= (bits[i] & 0xFFL) << ((i & 7) * 8);
+        }
+        // Ignore padding bits after the last cell
+        if (cells % 64 != 0) {
+            blocked[blocked.length - 1] &= (1L << (cells % 64)) - 1;
+        }
+        return new Grid(width, height, blocked);
+    }
+
+    /**
+     * Run lengths per row, alternating free and blocked cells and starting with a (possibly empty)
+     * free run: {@code [3, 2, 5]} is three free cells, two obstacles, five free cells.
+     */
+    public static Grid fromRle(int width, int height, int[][] runs) {
+        if (runs.length != height) {
+            throw new IllegalArgumentException("RLE has " + runs.length + " rows, expected " + height);
+        }
+        long[] blocked = words(width, height);
+        for (int y = 0; y < height; y++) {
+            int x = 0;
+            boolean obstacle = false;
+            for (int run : runs[y]) {
+                if (run < 0 || x + run > width) {
+                    throw new IllegalArgumentException("RLE row " + y + " does not fit a width of " + width);
+                }
+                if (obstacle) {
+                    for (int i = y * width + x; i < y * width + x + run; i++) {
+                        blocked[i >>> 6] |= 1L << i;
+                    }
+                }
+                x += run;
+                obstacle = !obstacle;
+            }
+            if (x != width) {
+                throw new IllegalArgumentException("RLE row " + y + " covers " + x + " cells, expected " + width);
+            }
+        }
+        return new Grid(width, height, blocked);
+    }
+
+    /**
+     * One byte per cell, row-major, non-zero for obstacles: the uint8 grid.npy of the map store.
+     */
+    public static Grid fromCells(int width, int height, ByteBuffer cells) {
+        long[] blocked = words(width, height);
+        if (cells.remaining() < (long) width * height) {
+            throw new IllegalArgumentException("Grid has " + cells.remaining() + " cells, expected " + (long) width * height);
+        }
+        for (int i = 0; i < width * height; i++) {
+            if (cells.get(cells.position() + i) != 0) {
+                blocked[i >>> 6] |= 1L << i;
+            }
+        }
+        return new Grid(width, height, blocked);
+    }
+
+    public int getWidth() {
+        return width;
+    }
+
+    public int getHeight() {
+        return height;
+    }
+
+    public boolean isFree(int x, int y) {
+        if (x < 0 || x >= width || y < 0 || y >= height) {
+            return false;
+        }
+        int i = y * width + x;
+        return (blocked[i >>> 6] & (1L << i)) == 0;
+    }
+
+    /**
+     * SHA-256 over the size and the obstacle bits, so identical maps always get the same ID.
+     */
+    public String contentHash() {
+        if (contentHash == null) {
+            contentHash = computeContentHash();
+        }
+        return contentHash;
+    }
+
+    private String computeContentHash() {
+        try {
+            MessageDigest digest = MessageDigest.getInstance("SHA-256");
+            ByteBuffer buffer = ByteBuffer.allocate(8 + blocked.length * 8);
+            buffer.putInt(width).putInt(height);
+            for (long word : blocked) {
+                buffer.putLong(word);
+            }
+            return HexFormat.of().formatHex(digest.digest(buffer.array()));
+        } catch (NoSuchAlgorithmException e) {
+            throw new IllegalStateException(e);
+        }
+    }
+}
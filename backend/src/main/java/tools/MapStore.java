@@ -0,0 +1,170 @@
+package tools;
+
+import java.io.IOException;
+import java.nio.ByteBuffer;
+import java.nio.ByteOrder;
+import java.nio.IntBuffer;
+import java.nio.channels.FileChannel;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.nio.file.StandardOpenOption;
+import java.util.Map;
+import java.util.Set;
+import java.util.concurrent.ConcurrentHashMap;
+import java.util.regex.Matcher;
+import java.util.regex.Pattern;
+import java.util.stream.Stream;
+
+/**
+ * Read-only view of the on-disk map store written by the Python tools (map_store.py): grids and
+ * BFS distance fields saved as .npy files under {@code <dir>/<content hash>/}. Files are memory-mapped,
+ * so every solver process and tool on the machine shares the same page-cache pages.
+ * The directory is -Dmaps.storeDir, else $SHAPESHIFTER_MAP_STORE, else ~/.cache/shapeshifter/maps.
+ */
+public class MapStore {
+
+    private static final Path DIR = Path.of(System.getProperty("maps.storeDir",
+            System.getenv().getOrDefault("SHAPESHIFTER_MAP_STORE",
+                    System.getProperty("user.home") + "/.cache/shapeshifter/maps")));
+
+    private static final Pattern MAP_ID = Pattern.compile("[0-9a-f]{64}");
+    private static final Pattern DESCR = Pattern.compile("'descr':\\s*'([^']+)'");
+    private static final Pattern FORTRAN_ORDER = Pattern.compile("'fortran_order':\\s*(True|False)");
+    private static final Pattern SHAPE = Pattern.compile("'shape':\\s*\\((\\d+),\\s*(\\d+),?\\s*\\)");
+    private static final Pattern FIELD_FILE = Pattern.compile("dist([48])_(\\d+)_(\\d+)\\.npy");
+
+    // Interval between listings of a map directory, so fields precomputed meanwhile are picked up (-Dmaps.rescanMs)
+    private static final long RESCAN_MS = Long.getLong("maps.rescanMs", 5000);
+
+    private record FieldKey(String mapId, int x, int y, boolean diagonals) {}
+
+    private record Listing(long listedAt, Set<FieldKey> fields) {}
+
+    // Mapped distance fields; files are immutable once renamed into place
+    private static final Map<FieldKey, IntBuffer> fields = new ConcurrentHashMap<>();
+
+    // Fields present per map directory. Every path search asks for its goal's field, and most
+    // goals have none, so misses are answered from here instead of the file system.
+    private static final Map<String, Listing> listings = new ConcurrentHashMap<>();
+
+    /**
+     * Stored grid with the given content hash, or null if it is not in the store.
+     */
+    public static Grid loadGrid(String mapId) {
+        if (!MAP_ID.matcher(mapId).matches()) {
+            return null;  // Never build paths from arbitrary request input
+        }
+        Path path = DIR.resolve(mapId).resolve("grid.npy");
+        if (!Files.isRegularFile(path)) {
+            return null;
+        }
+        try {
+            int[] shape = new int[2];
+            ByteBuffer cells = mapNpy(path, "|u1", shape);
+            Grid grid = Grid.fromCells(shape[1], shape[0], cells);
+            if (!grid.contentHash().equals(mapId)) {
+                System.out.println("Stored map " + mapId + " does not match its hash, ignoring it");
+                return null;
+            }
+            System.out.println("Loaded map " + mapId + " from the map store");
+            return grid;
+        } catch (IOException | IllegalArgumentException e) {
+            System.out.println("Could not read stored map " + mapId + ": " + e.getMessage());
+            return null;
+        }
+    }
+
+    /**
+     * Stored BFS distances from every cell to goal, indexed {@code y * width + x} with -1 for cells
+     * that cannot reach it, or null if no field was precomputed for this grid and goal.
+     */
+    public static IntBuffer distanceField(Grid grid, Coordinate goal, boolean diagonals) {
+        FieldKey key = new FieldKey(grid.contentHash(), goal.x(), goal.y(), diagonals);
+        IntBuffer field = fields.get(key);
+        if (field != null) {
+            return field;
+        }
+        Set<FieldKey> stored = listing(key.mapId());
+        if (!stored.contains(key)) {
+            return null;
+        }
+        String name = "dist" + (diagonals ? 8 : 4) + "_" + goal.x() + "_" + goal.y() + ".npy";
+        try {
+            int[] shape = new int[2];
+            field = mapNpy(DIR.resolve(key.mapId()).resolve(name), "<i4", shape).asIntBuffer();
+            if (shape[0] != grid.getHeight() || shape[1] != grid.getWidth()) {
+                throw new IllegalArgumentException("shape " + shape[1] + "x" + shape[0]);
+            }
+        } catch (IOException | IllegalArgumentException e) {
+            System.out.println("Could not read distance field " + key.mapId() + "/" + name + ": " + e.getMessage());
+            stored.remove(key);  // Not retried until the directory is listed again
+            return null;
+        }
+        fields.put(key, field);
+        return field;
+    }
+
+    // Distance fields in a map's directory, listed again at most every RESCAN_MS
+    private static Set<FieldKey> listing(String mapId) {
+        long now = System.currentTimeMillis();
+        Listing listing = listings.get(mapId);
+        if (listing != null && now - listing.listedAt() < RESCAN_MS) {
+            return listing.fields();
+        }
+        Set<FieldKey> stored = ConcurrentHashMap.newKeySet();
+        if (MAP_ID.matcher(mapId).matches()) {
+            try (Stream<Path> files = Files.list(DIR.resolve(mapId))) {
+                files.forEach(file -> {
+                    Matcher matcher = FIELD_FILE.matcher(file.getFileName().toString());
+                    if (matcher.matches()) {
+                        stored.add(new FieldKey(mapId, Integer.parseInt(matcher.group(2)),
+                                Integer.parseInt(matcher.group(3)), matcher.group(1).equals("8")));
+                    }
+                });
+            } catch (IOException e) {
+                // No directory: this map is not in the store
+            }
+        }
+        listings.put(mapId, new Listing(now, stored));
+        return stored;
+    }
+
+    /**
+     * Memory-map a C-ordered two-dimensional .npy array and return its data; shape receives
+     * {rows, columns}.
+     */
+    private static ByteBuffer mapNpy(Path path, String descr, int[] shape) throws IOException {
+        ByteBuffer buffer;
+        try (FileChannel channel = FileChannel.open(path, StandardOpenOption.READ)) {
+            buffer = channel.map(FileChannel.MapMode.READ_ONLY, 0, channel.size());
+        }
+        buffer.order(ByteOrder.LITTLE_ENDIAN);
+        // Magic string, format version, header length, then a Python dict literal describing the array
+        if (buffer.capacity() < 10 || buffer.get(0) != (byte) 0x93 || buffer.get(1) != 'N') {
+            throw new IllegalArgumentException("not a .npy file");
+        }
+        int headerStart = buffer.get(6) == 1 ? 10 : 12;
+        int headerLength = headerStart == 10 ? buffer.getShort(8) & 0xFFFF : buffer.getInt(8);
+        byte[] headerBytes = new byte[headerLength];
+        buffer.get(headerStart, headerBytes);
+        String header = new String(headerBytes, StandardCharsets.ISO_8859_1);
+
+        Matcher descrMatcher = DESCR.matcher(header);
+        Matcher fortranMatcher = FORTRAN_ORDER.matcher(header);
+        Matcher shapeMatcher = SHAPE.matcher(header);
+        if (!descrMatcher.find() || !descrMatcher.group(1).equals(descr)
+                || !fortranMatcher.find() || fortranMatcher.group(1).equals("True") || !shapeMatcher.find()) {
+            throw new IllegalArgumentException("unexpected array header " + header.trim());
+        }
+        shape[0] = Integer.parseInt(shapeMatcher.group(1));
+        shape[1] = Integer.parseInt(shapeMatcher.group(2));
+
+        int dataStart = headerStart + headerLength;
+        long dataLength = (long) shape[0] * shape[1] * (descr.endsWith("4") ? 4 : 1);
+        if (buffer.capacity() - dataStart < dataLength) {
+            throw new IllegalArgumentException("file is truncated");
+        }
+        return buffer.slice(dataStart, (int) dataLength).order(ByteOrder.LITTLE_ENDIAN);
+    }
+}
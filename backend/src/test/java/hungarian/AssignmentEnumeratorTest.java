@@ -0,0 +1,83 @@
+package hungarian;
+
+import org.junit.jupiter.api.Test;
+
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.HashSet;
+import java.util.List;
+import java.util.Set;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+class AssignmentEnumeratorTest {
+
+    private static final int[][] COSTS = {
+            {4, 1, 3, 7},
+            {2, 0, 5, 3},
+            {3, 2, 2, 6},
+            {8, 4, 1, 2}
+    };
+
+    @Test
+    void enumeratesEveryAssignmentInNonDecreasingCost() {
+        AssignmentEnumerator enumerator = new AssignmentEnumerator(COSTS);
+        List<Integer> costs = new ArrayList<>();
+        Set<List<Integer>> seen = new HashSet<>();
+        for (int[] assignment = enumerator.next(); assignment != null; assignment = enumerator.next()) {
+            assertTrue(seen.add(Arrays.stream(assignment).boxed().toList()), "assignment returned twice");
+            assertEquals(COSTS.length, Arrays.stream(assignment).distinct().count(), "not a permutation");
+            costs.add(enumerator.cost(assignment));
+        }
+
+        assertFalse(enumerator.hasNext());
+        assertEquals(24, enumerator.getEnumerated());
+        assertEquals(bruteForceCosts(COSTS), costs);
+    }
+
+    @Test
+    void skipsInfeasiblePairs() {
+        int inf = AssignmentEnumerator.INFEASIBLE;
+        int[][] costs = {
+                {1, inf, 5},
+                {inf, 1, 2},
+                {3, 4, 1}
+        };
+        AssignmentEnumerator enumerator = new AssignmentEnumerator(costs);
+        List<Integer> found = new ArrayList<>();
+        for (int[] assignment = enumerator.next(); assignment != null; assignment = enumerator.next()) {
+            for (int row = 0; row < assignment.length; row++) {
+                assertTrue(costs[row][assignment[row]] < inf);
+            }
+            found.add(enumerator.cost(assignment));
+        }
+        // Of the six permutations only {0,1,2}, {0,2,1} and {2,1,0} avoid the infeasible pairs
+        assertEquals(List.of(3, 7, 9), found);
+    }
+
+    private static List<Integer> bruteForceCosts(int[][] costs) {
+        List<Integer> all = new ArrayList<>();
+        permute(costs, new int[costs.length], new boolean[costs.length], 0, all);
+        all.sort(null);
+        return all;
+    }
+
+    private static void permute(int[][] costs, int[] assignment, boolean[] used, int row, List<Integer> all) {
+        if (row == costs.length) {
+            int cost = 0;
+            for (int r = 0; r < costs.length; r++) {
+                cost += costs[r][assignment[r]];
+            }
+            all.add(cost);
+            return;
+        }
+        for (int column = 0; column < costs.length; column++) {
+            if (!used[column]) {
+                used[column] = true;
+                assignment[row] = column;
+                permute(costs, assignment, used, row + 1, all);
+                used[column] = false;
+            }
+        }
+    }
+}
@@ -0,0 +1,197 @@
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+from config import (BACKEND_URLS, BACKENDS_ENV_VAR, HEALTH_CHECK_INTERVAL_S, HEALTH_CHECK_TIMEOUT_S,
+                    EJECT_AFTER_FAILURES, HEDGE_AFTER_MS)
+
+
+class BackendUnavailable(ConnectionError):
+    """A node answered 503; the request is retried on another node, else its response is returned."""
+
+    def __init__(self, base_url: str, response: "requests.Response") -> None:
+        super().__init__(f"Backend {base_url} answered {response.status_code}")
+        self.response = response
+
+
+@dataclass
+class BackendNode:
+    base_url: str
+    outstanding: int = 0  # Requests sent and not yet answered
+    failures: int = 0  # Consecutive failed requests or health probes
+    healthy: bool = True
+    served: int = 0
+
+
+class BackendPool:
+    """
+    Client-side load balancer over several solver backends.
+
+    Requests go to the healthy node with the fewest outstanding requests and fail over to the
+    next node on connection errors or 503 answers; other errors are answers and are returned
+    like successes. Any 5xx counts as a failure of the node, which is ejected after
+    EJECT_AFTER_FAILURES consecutive failures and re-admitted once a background health probe
+    succeeds again.
+    Hedged requests are duplicated to a second node if the first has not answered within
+    hedge_after_ms; the first answer wins and the slower one is ignored.
+    """
+
+    def __init__(self, base_urls: List[str], hedge_after_ms: int = HEDGE_AFTER_MS) -> None:
+        if not base_urls:
+            raise ValueError("BackendPool needs at least one backend URL")
+        self.nodes = [BackendNode(base_url.rstrip("/")) for base_url in base_urls]
+        self.hedge_after_ms = hedge_after_ms
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=4 * len(self.nodes), thread_name_prefix="backend")
+        self.health_thread: Optional[threading.Thread] = None
+        self.stopped = threading.Event()
+
+    def add(self, base_url: str) -> None:
+        """Start balancing over another backend, unless it is already in the pool."""
+        base_url = base_url.rstrip("/")
+        with self.lock:
+            if all(node.base_url != base_url for node in self.nodes):
+                self.nodes.append(BackendNode(base_url))
+
+    def acquire(self, exclude: List[BackendNode]) -> Optional[BackendNode]:
+        """Pick the least loaded node not in exclude and count the request against it."""
+        with self.lock:
+            candidates = [node for node in self.nodes if node.healthy and node not in exclude]
+            if not candidates and not any(node.healthy for node in self.nodes):
+                # Everything is ejected: trying a failing node beats failing outright
+                candidates = [node for node in self.nodes if node not in exclude]
+            if not candidates:
+                return None
+            fewest = min(node.outstanding for node in candidates)
+            node = random.choice([node for node in candidates if node.outstanding == fewest])
+            node.outstanding += 1
+            return node
+
+    def report(self, node: BackendNode, ok: bool) -> None:
+        """Update a node's health after a request or probe."""
+        with self.lock:
+            if ok:
+                if not node.healthy:
+                    print(f"Backend {node.base_url} re-admitted")
+                node.failures = 0
+                node.healthy = True
+                return
+            node.failures += 1
+            if node.healthy and node.failures >= EJECT_AFTER_FAILURES:
+                node.healthy = False
+                print(f"Backend {node.base_url} ejected after {node.failures} failures")
+
+    def call(self, node: BackendNode, send: Callable[[str], "requests.Response"]) -> "requests.Response":
+        try:
+            response = send(node.base_url)
+        except Exception:
+            self.report(node, ok=False)
+            raise
+        finally:
+            with self.lock:
+                node.outstanding -= 1
+        if response.status_code == 503:
+            self.report(node, ok=False)
+            raise BackendUnavailable(node.base_url, response)
+        self.report(node, ok=response.status_code < 500)
+        with self.lock:
+            node.served += 1
+        return response
+
+    def request(self, send: Callable[[str], "requests.Response"], hedge: bool = False) -> "requests.Response":
+        """
+        Run send(base_url) against the pool and return the first response that is not a 503,
+        or the last 503 once every node was tried. Raises the last connection error if no node
+        answered at all. Only idempotent requests may be hedged.
+        """
+        tried: List[BackendNode] = []
+        in_flight: Dict[Future, BackendNode] = {}
+        hedged = not hedge or self.hedge_after_ms <= 0
+        last_error: Optional[Exception] = None
+        unavailable: Optional["requests.Response"] = None  # Latest 503, returned if no node does better
+
+        while True:
+            if not in_flight:
+                node = self.acquire(tried)
+                if node is None:
+                    if unavailable is not None:
+                        return unavailable
+                    raise last_error or ConnectionError("No backend available")
+                tried.append(node)
+                in_flight[self.executor.submit(self.call, node, send)] = node
+
+            timeout = None if hedged else self.hedge_after_ms / 1000
+            done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                # The solve is slow: race a duplicate on another node
+                hedged = True
+                node = self.acquire(tried)
+                if node is not None:
+                    tried.append(node)
+                    in_flight[self.executor.submit(self.call, node, send)] = node
+                continue
+
+            for future in done:
+                in_flight.pop(future)
+                try:
+                    return future.result()
+                except BackendUnavailable as exc:  # Fail over to another node
+                    unavailable = exc.response
+                except Exception as exc:
+                    last_error = exc
+
+    def probe(self, node: BackendNode) -> None:
+        import requests
+
+        try:
+            ok = requests.get(f"{node.base_url}/health", timeout=HEALTH_CHECK_TIMEOUT_S).ok
+        except requests.RequestException:
+            ok = False
+        self.report(node, ok)
+
+    def start_health_checks(self, interval_s: float = HEALTH_CHECK_INTERVAL_S) -> None:
+        """Probe every node periodically in a daemon thread."""
+        if self.health_thread is not None:
+            return
+
+        def run() -> None:
+            while not self.stopped.wait(interval_s):
+                for node in self.nodes:
+                    self.probe(node)
+
+        self.health_thread = threading.Thread(target=run, daemon=True)
+        self.health_thread.start()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.executor.shutdown(wait=False)
+
+    def stats(self) -> List[Dict]:
+        """Per-node routing and health state."""
+        with self.lock:
+            return [{"url": node.base_url, "healthy": node.healthy, "outstanding": node.outstanding,
+                     "served": node.served, "failures": node.failures} for node in self.nodes]
+
+
+def backend_urls() -> List[str]:
+    """Backend base URLs from the BACKENDS_ENV_VAR environment variable, or BACKEND_URLS."""
+    configured = os.environ.get(BACKENDS_ENV_VAR, "")
+    urls = [url.strip() for url in configured.split(",") if url.strip()]
+    return urls or list(BACKEND_URLS)
+
+
+pool: Optional[BackendPool] = None
+pool_lock = threading.Lock()
+
+
+def get_pool() -> BackendPool:
+    """Return the process-wide backend pool, creating it and its health checks on first use."""
+    global pool
+    with pool_lock:
+        if pool is None:
+            pool = BackendPool(backend_urls())
+            pool.start_health_checks()
+        return pool
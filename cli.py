@@ -0,0 +1,421 @@
+"""
+Headless command line entry point: solve, validate, bench, replay, export, lifelong and maps.
+
+Only argparse, json and the constants in config are imported at startup. Each subcommand
+imports what it needs when it runs, and pygame is only loaded for GUI replays and for
+export, which renders offscreen with the SDL dummy driver.
+"""
+import argparse
+import json
+import sys
+from typing import List, Dict, Optional
+from config import EXPORT_FPS
+
+# Modules each subcommand imports when it runs, on its heaviest input (a .traj file or a
+# MovingAI map), including the third-party modules imported lazily on those paths; used by
+# the import-time benchmark
+SUBCOMMAND_MODULES = {
+    "solve": ["request", "simulation", "movingai", "backend_pool", "map_store", "requests", "numpy"],
+    "validate": ["simulation", "trajectory", "request", "numpy"],
+    "bench": ["request", "movingai", "backend_pool", "map_store", "requests", "numpy"],
+    "replay": ["simulation", "trajectory", "request", "numpy"],
+    "lifelong": ["lifelong", "movingai", "map_store", "requests", "numpy"],
+    "maps": ["map_store", "movingai", "numpy"],
+}
+CLI_IMPORT_BUDGET_MS = 100  # Maximum import time of a headless subcommand's own modules
+CLI_DEPENDENCY_BUDGET_MS = 300  # Maximum including numpy and requests, which alone take about 200 ms
+
+
+def add_instance_arguments(parser: argparse.ArgumentParser, one_shot: bool = True) -> None:
+    """
+    Arguments describing the scenario and solver options of a request. Lifelong sessions
+    (one_shot=False) plan every agent towards its own goal queue without morphing, so they
+    have no payload file, assignment, morphing or auto options.
+    """
+    if one_shot:
+        parser.add_argument("--payload", help="JSON file holding a complete /cbs request body")
+    parser.add_argument("--map", help="MovingAI .map file")
+    parser.add_argument("--scen", help="MovingAI .scen file")
+    parser.add_argument("--agents", type=int, help="Number of scenario entries to use")
+    parser.add_argument("--bucket", type=int, help="Only use scenario entries from this bucket")
+    if one_shot:
+        parser.add_argument("--algorithm", default="astar", choices=["astar", "bfs", "auto"],
+                            help="auto races solver configurations on the backend")
+    else:
+        parser.add_argument("--algorithm", default="astar", choices=["astar", "bfs"])
+    parser.add_argument("--priority", default="y-axis", choices=["y-axis", "manhattan"])
+    parser.add_argument("--conflict-resolution", default="priority", choices=["priority", "minimax"])
+    if one_shot:
+        parser.add_argument("--assignment", default="hungarian", choices=["hungarian", "cbs-ta"],
+                            help="cbs-ta assigns destinations inside the search (needs as many goals as agents)")
+        parser.add_argument("--no-morphing", action="store_true", help="Disable morphing")
+    parser.add_argument("--no-diagonals", action="store_true", help="Disable diagonal movement")
+
+
+def load_payload(args: argparse.Namespace) -> Dict:
+    """Build the request body from a payload file or a MovingAI instance."""
+    if args.payload:
+        with open(args.payload) as f:
+            return json.load(f)
+    if not (args.map and args.scen):
+        raise SystemExit("Either --payload or both --map and --scen are required")
+    if args.assignment == "cbs-ta" and args.algorithm == "auto":
+        raise SystemExit("--assignment cbs-ta cannot be combined with --algorithm auto")
+
+    from movingai import load_instance
+    from request import build_payload
+    buckets = [args.bucket] if args.bucket is not None else None
+    instance = load_instance(args.map, args.scen, args.agents, buckets)
+    return build_payload(instance["origins"], instance["destinations"], [],
+                         args.algorithm, not args.no_morphing, args.priority,
+                         args.conflict_resolution, not args.no_diagonals, grid=instance["grid"],
+                         assignment=args.assignment)
+
+
+def record_map_goals(args: argparse.Namespace, goals: List[List[int]], diagonals: bool) -> Optional[str]:
+    """
+    Count the goal uses of a MovingAI map in the map store, which precomputes distance fields
+    for frequently used goals. Returns the map's content hash, or None without --map.
+    """
+    if not args.map:
+        return None
+    from map_store import get_store
+
+    store = get_store()
+    digest = store.import_map(args.map)
+    computed = store.record_goals(digest, [(x, y) for x, y in goals], diagonals)
+    if computed:
+        print(f"distance_fields_computed: {computed}")
+    return digest
+
+
+def load_solution(file_path: str):
+    """
+    Load a solution written by `solve --output`: a .traj trajectory or a JSON document.
+    Returns (agent_paths, payload).
+    """
+    if file_path.endswith(".traj"):
+        from trajectory import load_trajectory
+        trajectory = load_trajectory(file_path)
+        return trajectory.agent_paths(), trajectory.payload()
+
+    from request import parse_agent_paths
+    with open(file_path) as f:
+        document = json.load(f)
+    return parse_agent_paths(document["paths"]), document.get("payload", {})
+
+
+def save_solution(file_path: str, agent_paths, payload: Dict) -> None:
+    """Write a solution as a .traj trajectory or, for any other extension, as JSON."""
+    if file_path.endswith(".traj"):
+        from trajectory import save_trajectory
+        save_trajectory(file_path, agent_paths, payload)
+        return
+
+    paths = {str(p.agent_id): [{"x": c.x, "y": c.y} for c in p.path] for p in agent_paths}
+    with open(file_path, "w") as f:
+        json.dump({"payload": payload, "paths": paths}, f)
+
+
+def print_metrics(metrics) -> None:
+    """Print simulation metrics one per line."""
+    for name, value in vars(metrics).items():
+        if name != "overlap_steps":
+            print(f"{name}: {value}")
+
+
+def command_solve(args: argparse.Namespace) -> int:
+    from request import call_cbs_api
+    from simulation import simulate
+    import time
+
+    payload = load_payload(args)
+    digest = record_map_goals(args, payload["destinations"], payload.get("allowDiagonals", False))
+    start_time = time.perf_counter()
+    agent_paths = call_cbs_api(payload)
+    if agent_paths is None:
+        print("Could not find path")
+        return 1
+    print(f"solve_time_ms: {(time.perf_counter() - start_time) * 1000:.1f}")
+    print_metrics(simulate(agent_paths)[1])
+    if digest is not None:
+        from map_store import get_store
+        lower_bound = get_store().lower_bound(digest, payload["origins"], payload["destinations"],
+                                              payload.get("allowDiagonals", False))
+        if lower_bound is not None:
+            print(f"sum_of_costs_lower_bound: {lower_bound}")
+
+    if args.output:
+        save_solution(args.output, agent_paths, payload)
+        print(f"Solution saved to {args.output}")
+    return 0
+
+
+def command_validate(args: argparse.Namespace) -> int:
+    from simulation import validate_solution
+
+    agent_paths, payload = load_solution(args.solution)
+    problems = validate_solution(agent_paths, payload.get("grid"), payload.get("allowDiagonals", True))
+    for problem in problems:
+        print(problem)
+    print("valid" if not problems else f"invalid: {len(problems)} problem(s)")
+    return 0 if not problems else 1
+
+
+def command_bench(args: argparse.Namespace) -> int:
+    if args.imports:
+        return bench_imports()
+
+    from concurrent.futures import ThreadPoolExecutor
+    from request import call_cbs_api
+    import statistics
+    import time
+
+    payload = load_payload(args)
+    record_map_goals(args, payload["destinations"], payload.get("allowDiagonals", False))
+
+    def timed_solve(_: int) -> Optional[float]:
+        start_time = time.perf_counter()
+        if call_cbs_api(dict(payload)) is None:
+            return None
+        return (time.perf_counter() - start_time) * 1000
+
+    # Concurrent solves are spread over every backend in the pool
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        timings = list(executor.map(timed_solve, range(args.repeat)))
+    wall_time = time.perf_counter() - start_time
+    if None in timings:
+        print("Could not find path")
+        return 1
+
+    print(f"runs: {len(timings)}")
+    print(f"min_ms: {min(timings):.1f}")
+    print(f"median_ms: {statistics.median(timings):.1f}")
+    print(f"max_ms: {max(timings):.1f}")
+    print(f"throughput_per_s: {len(timings) / wall_time:.2f}")
+    if args.concurrency > 1:
+        from backend_pool import get_pool
+        for node in get_pool().stats():
+            print(f"backend {node['url']}: served {node['served']}, healthy {node['healthy']}")
+    return 0
+
+
+def bench_imports() -> int:
+    """
+    Measure, in fresh interpreters, the import cost of every headless subcommand: its own modules
+    (within CLI_IMPORT_BUDGET_MS) and everything including third-party modules (within
+    CLI_DEPENDENCY_BUDGET_MS). Fails if a budget is exceeded or pygame is pulled in.
+    """
+    import os
+    import subprocess
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    failed = False
+    for command, modules in SUBCOMMAND_MODULES.items():
+        own = [module for module in modules if os.path.exists(os.path.join(here, f"{module}.py"))]
+        dependencies = [module for module in modules if module not in own]
+        # Third-party modules first, so numpy imported by e.g. trajectory is not counted as its own
+        probe = ("import time; t = time.perf_counter(); "
+                 + "".join(f"import {module}; " for module in dependencies)
+                 + "d = time.perf_counter(); import cli; "
+                 + "".join(f"import {module}; " for module in own)
+                 + "e = time.perf_counter(); import sys; print((e - d) * 1000, (e - t) * 1000, 'pygame' in sys.modules)")
+        result = subprocess.run([sys.executable, "-c", probe], cwd=here, capture_output=True, text=True, check=True)
+        own_elapsed, total_elapsed, pygame_loaded = result.stdout.split()
+        own_ms, total_ms = float(own_elapsed), float(total_elapsed)
+        over_budget = own_ms > CLI_IMPORT_BUDGET_MS or total_ms > CLI_DEPENDENCY_BUDGET_MS
+        failed = failed or over_budget or pygame_loaded == "True"
+        note = " (pygame imported!)" if pygame_loaded == "True" else ""
+        print(f"{command}: {own_ms:.1f} ms, {total_ms:.1f} ms with {', '.join(dependencies) or 'no dependencies'}"
+              f"{' OVER BUDGET' if over_budget else ''}{note}")
+    return 1 if failed else 0
+
+
+def command_replay(args: argparse.Namespace) -> int:
+    agent_paths, payload = load_solution(args.solution)
+    if args.gui:
+        # The only code path that loads pygame
+        from game import Game
+        if args.profile:
+            from profiler import get_profiler
+            get_profiler().enable()
+        if args.solution.endswith(".traj"):
+            game = Game.from_trajectory(args.solution)
+        else:
+            grid = payload.get("grid", [])
+            obstacles = [[x, y] for y, row in enumerate(grid) for x, cell in enumerate(row) if cell == 1]
+            game = Game(agent_paths, obstacles)
+        game.run()
+        return 0
+
+    from simulation import Simulation
+    simulation = Simulation(agent_paths)
+    events = simulation.run()
+    if args.events:
+        for event in events:
+            print(f"{event.step}\t{event.kind}\t{event.agent_ids}\t{event.position}")
+    print_metrics(simulation.metrics())
+    return 0
+
+
+def command_lifelong(args: argparse.Namespace) -> int:
+    from movingai import iter_scenario, select_entries, load_grid
+    from lifelong import RollingPlan, run_lifelong
+
+    if not (args.map and args.scen):
+        raise SystemExit("lifelong requires --map and --scen")
+    buckets = [args.bucket] if args.bucket is not None else None
+    first = select_entries(iter_scenario(args.scen), args.agents, buckets)
+    agents = len(first)
+
+    # The remaining scenario goals form the task stream, handed out round-robin one batch per cycle.
+    # They are selected like the fleet: same buckets, no goal cell twice.
+    taken = {(entry.start_x, entry.start_y, entry.goal_x, entry.goal_y) for entry in first}
+    remaining = (entry for entry in iter_scenario(args.scen)
+                 if (entry.start_x, entry.start_y, entry.goal_x, entry.goal_y) not in taken)
+    tasks = [[entry.goal_x, entry.goal_y] for entry in select_entries(remaining, args.tasks, buckets)]
+    goal_stream = []
+    for start in range(0, len(tasks), agents):
+        goal_stream.append({i: [goal] for i, goal in enumerate(tasks[start:start + agents])})
+
+    payload = {
+        "grid": load_grid(args.map),
+        "origins": [[entry.start_x, entry.start_y] for entry in first],
+        "goals": [[[entry.goal_x, entry.goal_y]] for entry in first],
+        "algorithm": args.algorithm,
+        "priorityStrategy": args.priority,
+        "conflictResolutionStrategy": args.conflict_resolution,
+        "allowDiagonals": not args.no_diagonals,
+        "window": args.window,
+        "replanInterval": args.replan,
+    }
+    record_map_goals(args, [goal for goals in payload["goals"] for goal in goals] + tasks, payload["allowDiagonals"])
+    rolling_plan = RollingPlan.start(payload)
+    if rolling_plan is None:
+        print("Could not start lifelong session")
+        return 1
+
+    try:
+        if args.gui:
+            from game import Game
+            if args.profile:
+                from profiler import get_profiler
+                get_profiler().enable()
+            for batch in goal_stream:
+                rolling_plan.append_goals(batch)
+            grid = payload["grid"]
+            obstacles = [[x, y] for y, row in enumerate(grid) for x, cell in enumerate(row) if cell == 1]
+            Game(rolling_plan.agent_paths, obstacles, rolling_plan).run()
+        else:
+            print_metrics(run_lifelong(rolling_plan, args.max_cycles, goal_stream))
+            print(f"completed_goals: {rolling_plan.completed_goals}")
+            print(f"pending_goals: {rolling_plan.pending_goals}")
+    finally:
+        rolling_plan.close()
+    return 0
+
+
+def command_export(args: argparse.Namespace) -> int:
+    from export import export_run
+
+    agent_paths, payload = load_solution(args.solution)
+    grid = payload.get("grid", [])
+    obstacles = [[x, y] for y, row in enumerate(grid) for x, cell in enumerate(row) if cell == 1]
+    size = None
+    if args.size:
+        width, height = args.size.lower().split("x")
+        size = (int(width), int(height))
+    grid_size = (len(grid[0]), len(grid)) if grid else None
+    export_run(agent_paths, obstacles, args.output, args.fps, size, args.speed, grid_size)
+    return 0
+
+
+def command_maps(args: argparse.Namespace) -> int:
+    from map_store import get_store
+
+    store = get_store()
+    if args.action == "list":
+        for stored in store.list_maps():
+            print(f"{stored['id']}\t{stored['width']}x{stored['height']}\t{stored['fields']} distance fields")
+        return 0
+
+    if not args.map:
+        raise SystemExit("maps import requires --map")
+    digest = store.import_map(args.map)
+    print(f"map_id: {digest}")
+    if args.scen and args.goals:
+        from collections import Counter
+        from movingai import iter_scenario
+        # The most frequently used goal cells of the scenario
+        uses = Counter((entry.goal_x, entry.goal_y) for entry in iter_scenario(args.scen))
+        goals = [goal for goal, _ in uses.most_common(args.goals)]
+        computed = store.precompute(digest, goals, not args.no_diagonals)
+        print(f"distance_fields_computed: {computed}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cli.py", description="Headless Shapeshifter tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    solve = subparsers.add_parser("solve", help="Solve an instance with the backend")
+    add_instance_arguments(solve)
+    solve.add_argument("--output", help="Write the solution to a .traj or .json file")
+    solve.set_defaults(handler=command_solve)
+
+    validate = subparsers.add_parser("validate", help="Check a saved solution for collisions and invalid moves")
+    validate.add_argument("solution", help=".traj or .json solution file")
+    validate.set_defaults(handler=command_validate)
+
+    bench = subparsers.add_parser("bench", help="Time repeated solves, or CLI import cost with --imports")
+    add_instance_arguments(bench)
+    bench.add_argument("--repeat", type=int, default=5)
+    bench.add_argument("--concurrency", type=int, default=1, help="Solves in flight at once")
+    bench.add_argument("--imports", action="store_true", help="Benchmark subcommand import time instead")
+    bench.set_defaults(handler=command_bench)
+
+    replay = subparsers.add_parser("replay", help="Replay a saved solution headlessly or in the GUI")
+    replay.add_argument("solution", help=".traj or .json solution file")
+    replay.add_argument("--gui", action="store_true", help="Open the pygame window")
+    replay.add_argument("--events", action="store_true", help="Print every simulation event")
+    replay.add_argument("--profile", action="store_true", help="Profile GUI frames and write a Chrome trace")
+    replay.set_defaults(handler=command_replay)
+
+    export = subparsers.add_parser("export", help="Render a saved solution offscreen to PNG frames or video")
+    export.add_argument("solution", help=".traj or .json solution file")
+    export.add_argument("--output", required=True,
+                        help="Directory for PNG frames, .raw or - for raw RGB24, or .mp4/.mkv/.webm/.mov via ffmpeg")
+    export.add_argument("--fps", type=int, default=EXPORT_FPS)
+    export.add_argument("--size", help="Output resolution as WIDTHxHEIGHT (cells are sized to fit the map)")
+    export.add_argument("--speed", type=float, default=1.0, help="Playback speed multiplier")
+    export.set_defaults(handler=command_export)
+
+    lifelong = subparsers.add_parser("lifelong", help="Run a rolling-horizon lifelong session with a goal stream")
+    add_instance_arguments(lifelong, one_shot=False)
+    lifelong.add_argument("--window", type=int, default=10, help="Steps within which conflicts are resolved")
+    lifelong.add_argument("--replan", type=int, default=5, help="Steps executed between planning cycles")
+    lifelong.add_argument("--tasks", type=int, default=100, help="Extra scenario goals streamed to the fleet")
+    lifelong.add_argument("--max-cycles", type=int, default=1000)
+    lifelong.add_argument("--gui", action="store_true", help="Open the pygame window")
+    lifelong.add_argument("--profile", action="store_true", help="Profile GUI frames and write a Chrome trace")
+    lifelong.set_defaults(handler=command_lifelong)
+
+    maps = subparsers.add_parser("maps", help="Import maps into the map store or list stored maps")
+    maps.add_argument("action", choices=["import", "list"])
+    maps.add_argument("--map", help="MovingAI .map file to import")
+    maps.add_argument("--scen", help="Scenario whose most frequent goals get distance fields")
+    maps.add_argument("--goals", type=int, default=0, help="Number of goals to precompute distance fields for")
+    maps.add_argument("--no-diagonals", action="store_true", help="Precompute 4-connected instead of 8-connected fields")
+    maps.set_defaults(handler=command_maps)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
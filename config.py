@@ -4,8 +4,9 @@ GRID_ROWS = 10
 CELL_SIZE = 60
 WIDTH, HEIGHT = GRID_COLS * CELL_SIZE, GRID_ROWS * CELL_SIZE
 CUBE_COUNT = 20
-MOVE_INTERVAL = 50  # Time between moves in milliseconds 
-MOVE_SPEED = 0.1  # Speed of cube movement animation
+STEP_DURATION_MS = 200  # Duration of one simulation step at 1x playback speed
+PLAYBACK_SPEEDS = [0.25, 0.5, 1, 2, 4, 10, 25, 50, 100]  # Selectable playback speed multipliers
+MAX_STEPS_PER_FRAME = 1000  # Upper bound on simulation steps advanced in a single rendered frame
 
 # Dark theme colors
 BACKGROUND = (18, 18, 18)
@@ -18,4 +19,83 @@ CUBE_COLORS = [
 ]
 
 CUBE_HOVER_COLOR = (255, 215, 0)
-SHADOW_COLOR = (0, 0, 0, 50)
\ No newline at end of file
+SHADOW_COLOR = (0, 0, 0, 50)
+
+# Default scenario, solved when Start is pressed without selecting destinations
+DEFAULT_ORIGINS = [
+    [0, 8], [1, 8], [2, 8], [3, 8], [4, 8],
+    [5, 8], [6, 8], [7, 8], [8, 8], [9, 8],
+    [0, 9], [1, 9], [2, 9], [3, 9], [4, 9],
+    [5, 9], [6, 9], [7, 9], [8, 9], [9, 9]
+]
+DEFAULT_DESTINATIONS = [
+    [3, 1], [4, 1], [5, 1],
+    [2, 2], [6, 2],
+    [1, 3], [7, 3],
+    [2, 4], [6, 4],
+    [3, 5], [4, 5], [5, 5],
+    [2, 6], [6, 6],
+    [1, 7], [7, 7],
+    [2, 8], [6, 8],
+    [3, 9], [4, 9]
+]
+
+# Background solving
+SOLVE_DEBOUNCE_MS = 300  # Quiet time after an edit before a speculative solve is submitted
+SOLVE_CACHE_SIZE = 32  # Number of solved configurations kept for instant Start
+
+# Trajectory recording
+RECORD_TRAJECTORIES = False  # Save every solved run (solution and scenario) to TRAJECTORY_DIR
+TRAJECTORY_DIR = "trajectories"
+
+# Frame profiler (opt-in)
+PROFILE_ENV_VAR = "SHAPESHIFTER_PROFILE"  # Set to 1 to enable the profiler overlay and trace export
+PROFILE_TRACE_PATH = "profile_trace.json"  # Chrome/Perfetto trace written on exit
+PROFILE_WINDOW = 300  # Frames kept for rolling percentiles and the frame-time graph
+PROFILE_MAX_TRACE_EVENTS = 500000  # Trace events recorded before the trace stops growing
+
+# Rendering
+RENDER_FPS = 60  # Frame rate cap while something animates; idle windows only redraw on events
+SOLVER_STATUS_REFRESH_MS = 100  # Redraw interval for the solver progress line while a solve runs
+
+# Target assignment
+ASSIGNMENT_MODE = "hungarian"  # "hungarian" fixes destinations before the search, "cbs-ta" assigns them inside it
+
+# Grid transfer
+GRID_UPLOAD_MIN_CELLS = 4096  # Grids this large are uploaded once to /maps and then sent as a map ID
+
+# Backend pool
+BACKEND_URLS = ["http://localhost:8080"]  # Solver instances the client balances requests over
+BACKENDS_ENV_VAR = "SHAPESHIFTER_BACKENDS"  # Comma-separated base URLs overriding BACKEND_URLS
+HEALTH_CHECK_INTERVAL_S = 2.0  # Time between health probes of every backend
+HEALTH_CHECK_TIMEOUT_S = 1.0
+EJECT_AFTER_FAILURES = 3  # Consecutive failed requests or probes before a backend stops receiving traffic
+HEDGE_AFTER_MS = 1500  # Duplicate a solve to a second backend if the first has not answered by then (0 disables)
+
+# Headless export
+EXPORT_FPS = 60  # Default frame rate of exported frame sequences and videos
+EXPORT_QUEUE_FRAMES = 8  # Frames rendered ahead of the encoding thread
+EXPORT_PNG_COMPRESSION = 1  # zlib level for PNG frames; low levels keep encoding ahead of rendering
+EXPORT_PNG_WORKERS = 0  # PNG encoding threads; 0 uses one per CPU
+
+# Map store
+MAP_STORE_DIR = "~/.cache/shapeshifter/maps"  # Memory-mapped grids and distance fields shared by all processes
+MAP_STORE_ENV_VAR = "SHAPESHIFTER_MAP_STORE"  # Overrides MAP_STORE_DIR
+DISTANCE_FIELD_MIN_USES = 2  # Goal uses on a stored map before its distance fields are precomputed
+
+# Managed solver process
+SOLVER_LAUNCH = False  # Launch and supervise a local solver from main.py (also --launch-solver)
+SOLVER_JAR = "backend/src/main/java/api/main.jar"  # Relative to the client directory
+SOLVER_JAR_ENV_VAR = "SHAPESHIFTER_SOLVER_JAR"  # Overrides SOLVER_JAR
+SOLVER_PORT = 8080
+SOLVER_JVM_ARGS = []  # Extra JVM options, e.g. ["-Xmx2g"]
+SOLVER_LOG = "solver.log"  # Output of the managed solver, appended across restarts
+SOLVER_READY_TIMEOUT_S = 60.0  # Time for a launched solver to answer /health
+SOLVER_STOP_TIMEOUT_S = 10.0  # Time for a graceful shutdown before the solver is killed
+SOLVER_RESTART_BACKOFF_S = 1.0  # Delay before restarting a crashed solver, doubled after every quick crash
+SOLVER_RESTART_BACKOFF_MAX_S = 30.0
+SOLVER_MAX_RESTARTS = 5  # Consecutive quick restarts before the managed solver is given up on
+SOLVER_WARMUP_MAX_ROUNDS = 20  # Rounds of warm-up scenarios replayed before the solver takes requests
+SOLVER_WARMUP_BUDGET_S = 20.0  # Stop warming up after this long even if round times still fall
+SOLVER_WARMUP_TOLERANCE = 0.1  # Warm once a round is within this fraction of the previous round's time
+SOLVER_WARMUP_REQUEST_TIMEOUT_S = 30.0  # A warm-up request taking longer means the solver is stuck
@@ -1,30 +1,33 @@
 import pygame
 from typing import List, Tuple, Dict
-from config import CUBE_COLORS, CELL_SIZE, SHADOW_COLOR, CUBE_HOVER_COLOR, REACHED_COLOR, OVERLAP_COLOR, MOVE_SPEED
+from config import CUBE_COLORS, CELL_SIZE, SHADOW_COLOR, CUBE_HOVER_COLOR, REACHED_COLOR, OVERLAP_COLOR
 from request import Coordinate
+from render import get_font, render_text
 
 
 class Cube:
-    def __init__(self, cube_id: int, path: List[Coordinate], occupied_positions: Dict[Tuple[int, int], 'Cube']) -> None:
+    def __init__(self, cube_id: int, path: List[Coordinate], occupied_positions: Dict[Tuple[int, int], 'Cube'],
+                 cell_size: int = CELL_SIZE) -> None:
         self.cube_id = cube_id
+        self.cell_size = cell_size
+        self.margin = max(1, cell_size // 12)  # 5 px at the default cell size
         self.path = path
         self.current_step = 0
         
         self.grid_x = path[0].x
         self.grid_y = path[0].y
         
-        self.visual_x = self.grid_x * CELL_SIZE + 5
-        self.visual_y = self.grid_y * CELL_SIZE + 5
+        self.visual_x = self.grid_x * cell_size + self.margin
+        self.visual_y = self.grid_y * cell_size + self.margin
         
         self.destination = (path[-1].x, path[-1].y)
         
         self.rect = pygame.Rect(self.visual_x, self.visual_y, 
-                            CELL_SIZE - 10, CELL_SIZE - 10)
+                            max(1, cell_size - 2 * self.margin), max(1, cell_size - 2 * self.margin))
         
         # Movement animation
         self.is_moving = False
         self.move_progress = 0.0
-        self.move_speed = MOVE_SPEED  
         self.next_grid_x = self.grid_x
         self.next_grid_y = self.grid_y
         
@@ -35,57 +38,43 @@ class Cube:
         self.waiting = False
         self.overlapping = False
     
-    def update(self) -> None:
+    def set_progress(self, step: int, progress: float) -> None:
         """
-        Update the cube's visual position for smooth movement.
-        Should be called every frame.
+        Place the cube between path[step] and path[step + 1], progress being in [0, 1).
+        Driven by the playback clock, so movement speed does not depend on the frame rate.
         """
-        if self.is_moving:
-            # Update progress
-            self.move_progress += self.move_speed
-            
-            if self.move_progress >= 1.0:
-                # Movement complete
-                self.is_moving = False
-                self.move_progress = 0.0
-                self.grid_x = self.next_grid_x
-                self.grid_y = self.next_grid_y
-                self.visual_x = self.grid_x * CELL_SIZE + 5
-                self.visual_y = self.grid_y * CELL_SIZE + 5
-            else:
-                start_x = self.grid_x * CELL_SIZE + 5
-                start_y = self.grid_y * CELL_SIZE + 5
-                end_x = self.next_grid_x * CELL_SIZE + 5
-                end_y = self.next_grid_y * CELL_SIZE + 5
-                
-                self.visual_x = start_x + (end_x - start_x) * self.move_progress
-                self.visual_y = start_y + (end_y - start_y) * self.move_progress
-            
-            self.rect.x = self.visual_x
-            self.rect.y = self.visual_y
-    
-    def move(self) -> None:
-        """
-        Start moving the cube to the next position in its path.
-        """
-        if not self.is_moving and self.current_step < len(self.path) - 1:
-            self.current_step += 1
-            next_coord = self.path[self.current_step]
-            
-            self.next_grid_x = next_coord.x
-            self.next_grid_y = next_coord.y
-            
-            if self.next_grid_x > self.grid_x:
-                self.direction = 'right'
-            elif self.next_grid_x < self.grid_x:
-                self.direction = 'left'
-            elif self.next_grid_y > self.grid_y:
-                self.direction = 'down'
-            elif self.next_grid_y < self.grid_y:
-                self.direction = 'up'
-            
-            self.is_moving = True
-            self.move_progress = 0.0
+        last_step = len(self.path) - 1
+        self.current_step = min(step, last_step)
+        current = self.path[self.current_step]
+        target = self.path[min(self.current_step + 1, last_step)]
+        
+        self.grid_x = current.x
+        self.grid_y = current.y
+        self.next_grid_x = target.x
+        self.next_grid_y = target.y
+        
+        if self.next_grid_x > self.grid_x:
+            self.direction = 'right'
+        elif self.next_grid_x < self.grid_x:
+            self.direction = 'left'
+        elif self.next_grid_y > self.grid_y:
+            self.direction = 'down'
+        elif self.next_grid_y < self.grid_y:
+            self.direction = 'up'
+        
+        self.is_moving = progress > 0.0 and (target.x, target.y) != (current.x, current.y)
+        self.move_progress = progress if self.is_moving else 0.0
+        
+        start_x = self.grid_x * self.cell_size + self.margin
+        start_y = self.grid_y * self.cell_size + self.margin
+        end_x = self.next_grid_x * self.cell_size + self.margin
+        end_y = self.next_grid_y * self.cell_size + self.margin
+        
+        self.visual_x = start_x + (end_x - start_x) * self.move_progress
+        self.visual_y = start_y + (end_y - start_y) * self.move_progress
+        
+        self.rect.x = self.visual_x
+        self.rect.y = self.visual_y
 
     def is_reached(self) -> bool:
         """Check if the cube has reached its destination."""
@@ -100,9 +89,11 @@ class Cube:
         Draw the cube on the given pygame surface, including direction indicators.
         """
 
+        radius = self.cell_size // 6
+        shadow_offset = max(1, self.cell_size // 15)
         shadow_surface = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
-        pygame.draw.rect(shadow_surface, SHADOW_COLOR, shadow_surface.get_rect(), border_radius=10)
-        screen.blit(shadow_surface, (self.rect.x + 4, self.rect.y + 4))
+        pygame.draw.rect(shadow_surface, SHADOW_COLOR, shadow_surface.get_rect(), border_radius=radius)
+        screen.blit(shadow_surface, (self.rect.x + shadow_offset, self.rect.y + shadow_offset))
 
         if self.overlapping:
             base_color = OVERLAP_COLOR
@@ -113,10 +104,12 @@ class Cube:
         else:
             base_color = self.color
 
-        pygame.draw.rect(screen, base_color, self.rect, border_radius=10)
+        pygame.draw.rect(screen, base_color, self.rect, border_radius=radius)
 
-        # Draw cube ID for identification
-        font = pygame.font.SysFont('Arial', 18)
-        id_text = font.render(str(self.cube_id + 1), True, (255, 255, 255))
+        # Draw cube ID for identification, unless cells are too small to read it
+        if self.cell_size < 20:
+            return
+        font = get_font(min(18, 18 * self.cell_size // CELL_SIZE))
+        id_text = render_text(font, str(self.cube_id + 1))
         text_rect = id_text.get_rect(center=self.rect.center)
         screen.blit(id_text, text_rect)
\ No newline at end of file
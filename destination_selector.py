@@ -1,8 +1,12 @@
 import pygame
-from typing import List, Tuple, Set
+from typing import List, Tuple, Set, Dict, Optional
 from algorithm_selector import AlgorithmSelector
-from config import WIDTH, HEIGHT, CELL_SIZE, BACKGROUND, GRID_LINES
-from request import Coordinate
+from config import (WIDTH, HEIGHT, CELL_SIZE, BACKGROUND, GRID_LINES, SOLVE_DEBOUNCE_MS, SOLVER_STATUS_REFRESH_MS,
+                    DEFAULT_ORIGINS, DEFAULT_DESTINATIONS)
+from request import Coordinate, AgentPath, build_payload
+from speculative_solver import SpeculativeSolver
+from profiler import get_profiler
+from render import RenderScheduler, get_font, render_text
 from time import time
 
 
@@ -21,7 +25,8 @@ class DestinationSelector:
         extended_width = WIDTH + 200  
         self.screen = pygame.display.set_mode((extended_width, HEIGHT))
         pygame.display.set_caption("Shapeshifter")
-        self.clock = pygame.time.Clock()
+        self.scheduler = RenderScheduler()
+        self.profiler = get_profiler()
         
         # Grid dimensions 
         self.grid_width = WIDTH // CELL_SIZE
@@ -47,6 +52,14 @@ class DestinationSelector:
         
         self.algorithm_selector = AlgorithmSelector()
         
+        # Background solving of the configuration being edited
+        self.solver = SpeculativeSolver(on_update=self.scheduler.wake)
+        self.last_edit_time = 0
+        self.edit_pending = False
+        self.start_requested = False
+        # Nothing is selected yet, so Start would run the default scenario: solve it right away
+        self.solver.submit(self.get_payload())
+        
     def generate_fixed_origins(self) -> List[Tuple[int, int]]:
         """
         Generate fixed origins from the bottom two rows.
@@ -65,6 +78,7 @@ class DestinationSelector:
         """
         # Check if this is an algorithm selection click
         if self.algorithm_selector.handle_click(pos):
+            self.mark_edited()
             return False
             
         # Check if toggle mode button was clicked
@@ -72,9 +86,9 @@ class DestinationSelector:
             self.toggle_mode()
             return False
             
-        # Check if start button was clicked
+        # Check if start button was clicked; without destinations the default scenario starts
         if self.start_button_rect.collidepoint(pos):
-            return len(self.selected_destinations) > 0
+            return True
         
         grid_x, grid_y = pos[0] // CELL_SIZE, pos[1] // CELL_SIZE
         grid_pos = (grid_x, grid_y)
@@ -102,8 +116,10 @@ class DestinationSelector:
         # Toggle destination selection
         if grid_pos in self.selected_destinations:
             self.selected_destinations.remove(grid_pos)
+            self.mark_edited()
         elif len(self.selected_destinations) < self.max_destinations:
             self.selected_destinations.add(grid_pos)
+            self.mark_edited()
             
         return False
         
@@ -118,6 +134,7 @@ class DestinationSelector:
             self.obstacles.remove(grid_pos)
         else:
             self.obstacles.add(grid_pos)
+        self.mark_edited()
             
         return False
         
@@ -128,31 +145,99 @@ class DestinationSelector:
         else:
             self.mode = "destination"
         
+    def mark_edited(self) -> None:
+        """Record an edit so a speculative solve is submitted once editing settles."""
+        self.last_edit_time = pygame.time.get_ticks()
+        self.edit_pending = True
+        
+    def next_wakeup_ms(self) -> Optional[int]:
+        """Return how long an idle loop may block, or None if only input can change the screen."""
+        if self.edit_pending and not self.start_requested:
+            return SOLVE_DEBOUNCE_MS - (pygame.time.get_ticks() - self.last_edit_time)
+        if self.solver.status(self.get_payload()) in ("solving", "queued"):
+            return SOLVER_STATUS_REFRESH_MS  # Keep the elapsed solve time ticking
+        return None
+        
     def run(self) -> Tuple[List[List[int]], List[List[int]], List[List[int]]]:
         """
         Run the destination selection interface.
-        Returns (origins, destinations, obstacles) lists in the format needed for the API.
+        Returns (origins, destinations, obstacles) lists in the format needed for the API, the
+        default scenario if Start was pressed without destinations, or empty lists if the window
+        was closed.
         """
         running = True
         while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return [], [], []  # Empty lists if user quits
-                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:  # Left click
-                    if self.handle_click(event.pos):
-                        running = False  # Exit if start button clicked
+            # Block while idle; wake for the edit debounce and solver progress
+            events = self.scheduler.poll(timeout_ms=self.next_wakeup_ms())
+            self.profiler.begin_frame()
+            with self.profiler.phase("events"):
+                for event in events:
+                    if event.type == pygame.QUIT:
+                        return [], [], []  # Empty lists if user quits
+                    elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:  # Left click
+                        # Ignore edits while waiting for the final solution
+                        if not self.start_requested and self.handle_click(event.pos):
+                            self.start_requested = True
+                            self.solver.submit(self.get_payload())
+            
+            with self.profiler.phase("solver"):
+                # Submit a speculative solve once the user stops editing
+                if (self.edit_pending and not self.start_requested and
+                        pygame.time.get_ticks() - self.last_edit_time >= SOLVE_DEBOUNCE_MS):
+                    self.edit_pending = False
+                    self.scheduler.invalidate()
+                    self.solver.submit(self.get_payload())
+                
+                # Exit once the solution for the started configuration is available
+                if self.start_requested and self.solver.is_done(self.get_payload()):
+                    running = False
             
-            self.draw()
-            pygame.display.flip()
-            self.clock.tick(60)
+            if self.scheduler.needs_redraw():
+                with self.profiler.phase("draw"):
+                    self.draw()
+                self.profiler.draw_overlay(self.screen)
+                with self.profiler.phase("flip"):
+                    pygame.display.flip()
+                self.profiler.end_frame()
+                self.scheduler.presented()
             
-        # Convert to format needed for API
+        return self.get_selection()
+    
+    def get_selection(self) -> Tuple[List[List[int]], List[List[int]], List[List[int]]]:
+        """
+        Return (origins, destinations, obstacles) lists in the format needed for the API, or the
+        default scenario without obstacles if no destination is selected.
+        """
+        if not self.selected_destinations:
+            return [list(origin) for origin in DEFAULT_ORIGINS], [list(d) for d in DEFAULT_DESTINATIONS], []
         used_origins = self.fixed_origins[:len(self.selected_destinations)]
         origins = [[x, y] for x, y in used_origins]
         destinations = [[x, y] for x, y in self.selected_destinations]
         obstacles_list = [[x, y] for x, y in self.obstacles]
         
         return origins, destinations, obstacles_list
+    
+    def get_payload(self) -> Dict:
+        """Build the API payload for the current selection and algorithm options."""
+        origins, destinations, obstacles = self.get_selection()
+        return build_payload(
+            origins, destinations, obstacles,
+            self.get_selected_algorithm(),
+            self.is_morphing_enabled(),
+            self.get_selected_priority(),
+            self.get_selected_conflict_resolution(),
+            self.is_diagonals_enabled()
+        )
+    
+    def get_solution(self, payload: Dict) -> Optional[List[AgentPath]]:
+        """
+        Return the solution for a payload, reusing the background result when available.
+        """
+        return self.solver.solve(payload)
+    
+    def stop_solver(self) -> None:
+        """Stop the background solver thread."""
+        self.solver.stop()
         
     def draw(self) -> None:
         """
@@ -165,8 +250,6 @@ class DestinationSelector:
         # Draw the algorithm selector
         self.algorithm_selector.draw(self.screen)
         
-        pygame.display.flip()
-        
     def draw_grid(self) -> None:
         """
         Draw the grid lines.
@@ -190,8 +273,8 @@ class DestinationSelector:
             dest_rect = pygame.Rect(x * CELL_SIZE + 5, y * CELL_SIZE + 5, CELL_SIZE - 10, CELL_SIZE - 10)
             pygame.draw.rect(self.screen, (200, 0, 0), dest_rect, border_radius=10)
             
-            font = pygame.font.SysFont('Arial', 18)
-            id_text = font.render(str(i + 1), True, (255, 255, 255))
+            font = get_font(18)
+            id_text = render_text(font, str(i + 1))
             text_rect = id_text.get_rect(center=(x * CELL_SIZE + CELL_SIZE // 2, y * CELL_SIZE + CELL_SIZE // 2))
             self.screen.blit(id_text, text_rect)
             
@@ -211,9 +294,9 @@ class DestinationSelector:
         # Draw start button
         pygame.draw.rect(self.screen, (100, 200, 100), self.start_button_rect, border_radius=5)
         
-        font = pygame.font.SysFont('Arial', 18)
+        font = get_font(18)
         start_text = "Start Simulation"
-        start_surf = font.render(start_text, True, (255, 255, 255))
+        start_surf = render_text(font, start_text)
         start_rect = start_surf.get_rect(center=self.start_button_rect.center)
         self.screen.blit(start_surf, start_rect)
         
@@ -222,18 +305,18 @@ class DestinationSelector:
         pygame.draw.rect(self.screen, mode_color, self.mode_button_rect, border_radius=5)
         
         mode_text = "Mode: Destination" if self.mode == "destination" else "Mode: Obstacle"
-        mode_surf = font.render(mode_text, True, (255, 255, 255))
+        mode_surf = render_text(font, mode_text)
         mode_rect = mode_surf.get_rect(center=self.mode_button_rect.center)
         self.screen.blit(mode_surf, mode_rect)
         
         # Status info
-        status_font = pygame.font.SysFont('Arial', 16)
+        status_font = get_font(16)
         status = f"Select destinations: {len(self.selected_destinations)}/{self.max_destinations}"
-        status_surf = status_font.render(status, True, (255, 255, 255))
+        status_surf = render_text(status_font, status)
         self.screen.blit(status_surf, (10, 10))
         
         obstacles_info = f"Obstacles placed: {len(self.obstacles)}"
-        obstacles_surf = status_font.render(obstacles_info, True, (255, 255, 255))
+        obstacles_surf = render_text(status_font, obstacles_info)
         self.screen.blit(obstacles_surf, (10, 30))
         
         # Mode-specific instructions
@@ -241,9 +324,30 @@ class DestinationSelector:
             instruction = "Click to select/deselect destinations."
         else:
             instruction = "Click to place/remove obstacles."
-        inst_surf = status_font.render(instruction, True, (255, 255, 255))
+        inst_surf = render_text(status_font, instruction)
         self.screen.blit(inst_surf, (10, 50))
         
+        # Background solver progress
+        solver_surf = render_text(status_font, self.get_solver_status_text())
+        self.screen.blit(solver_surf, (10, 70))
+        
+    def get_solver_status_text(self) -> str:
+        """Describe the background solver state for the current configuration."""
+        if self.edit_pending and not self.start_requested:
+            return "Solver: waiting for edits to settle..."
+        status = self.solver.status(self.get_payload())
+        if status == "solving":
+            return f"Solver: solving... {self.solver.solving_time():.1f}s"
+        if status == "queued":
+            return "Solver: queued"
+        if status == "ready":
+            return "Solver: solution ready"
+        if status == "failed":
+            return "Solver: no solution found"
+        if status == "error":
+            return "Solver: backend unreachable"
+        return "Solver: idle"
+        
     def get_selected_algorithm(self) -> str:
         """Return the currently selected algorithm."""
         return self.algorithm_selector.get_selected_algorithm()
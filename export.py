@@ -0,0 +1,177 @@
+import os
+import queue
+import shutil
+import struct
+import subprocess
+import sys
+import threading
+import time
+import zlib
+from typing import BinaryIO, List, Optional, Tuple
+from config import (WIDTH, HEIGHT, GRID_COLS, GRID_ROWS, STEP_DURATION_MS, EXPORT_FPS, EXPORT_QUEUE_FRAMES, EXPORT_PNG_COMPRESSION,
+                    EXPORT_PNG_WORKERS)
+from request import AgentPath
+
+VIDEO_EXTENSIONS = (".mp4", ".mkv", ".webm", ".mov")
+
+
+def png_scanlines(rgb: bytes, width: int, height: int) -> bytes:
+    """Prefix every RGB row with PNG filter type 0 (none)."""
+    import numpy as np
+
+    rows = np.empty((height, 1 + width * 3), dtype=np.uint8)
+    rows[:, 0] = 0
+    rows[:, 1:] = np.frombuffer(rgb, dtype=np.uint8).reshape(height, width * 3)
+    return rows.tobytes()
+
+
+def encode_png(rgb: bytes, width: int, height: int, compression: int = EXPORT_PNG_COMPRESSION) -> bytes:
+    """Encode RGB24 pixels as a PNG; zlib releases the GIL, so this overlaps with rendering."""
+    raw = png_scanlines(rgb, width, height)
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw, compression))
+            + chunk(b"IEND", b""))
+
+
+class FrameWriter:
+    """
+    Worker threads that encode and write rendered frames while the next ones are drawn.
+
+    The output is a PNG sequence if output is a directory, raw RGB24 frames if it ends in .raw or
+    is "-" (stdout), or a video encoded by ffmpeg for .mp4/.mkv/.webm/.mov. PNG frames are
+    independent files and are encoded by several workers; streams are written in order by one.
+    A bounded queue keeps the renderer at most EXPORT_QUEUE_FRAMES frames ahead.
+    """
+
+    def __init__(self, output: str, width: int, height: int, fps: int) -> None:
+        self.output = output
+        self.width = width
+        self.height = height
+        self.frames: "queue.Queue[Optional[Tuple[int, bytes]]]" = queue.Queue(maxsize=EXPORT_QUEUE_FRAMES)
+        self.error: Optional[BaseException] = None
+        self.written = 0
+        self.lock = threading.Lock()
+        self.process: Optional[subprocess.Popen] = None
+        self.stream: Optional[BinaryIO] = None
+
+        if output.lower().endswith(VIDEO_EXTENSIONS):
+            ffmpeg = shutil.which("ffmpeg")
+            if ffmpeg is None:
+                raise RuntimeError("ffmpeg is required for video output; export to .raw or a PNG directory instead")
+            self.process = subprocess.Popen(
+                [ffmpeg, "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgb24",
+                 "-s", f"{width}x{height}", "-r", str(fps), "-i", "-", "-pix_fmt", "yuv420p", output],
+                stdin=subprocess.PIPE)
+            self.stream = self.process.stdin
+        elif output == "-":
+            self.stream = sys.stdout.buffer
+        elif output.lower().endswith(".raw"):
+            self.stream = open(output, "wb")
+        else:
+            os.makedirs(output, exist_ok=True)
+
+        workers = 1 if self.stream is not None else (EXPORT_PNG_WORKERS or os.cpu_count() or 1)
+        self.threads = [threading.Thread(target=self.work, daemon=True) for _ in range(workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def put(self, index: int, rgb: bytes) -> None:
+        if self.error is not None:
+            raise self.error
+        self.frames.put((index, rgb))
+
+    def write(self, index: int, rgb: bytes) -> None:
+        if self.stream is not None:
+            self.stream.write(rgb)
+        else:
+            with open(os.path.join(self.output, f"frame_{index:06d}.png"), "wb") as f:
+                f.write(encode_png(rgb, self.width, self.height))
+
+    def work(self) -> None:
+        while True:
+            item = self.frames.get()
+            if item is None:
+                return
+            if self.error is not None:
+                continue  # Keep draining so the renderer never blocks
+            try:
+                self.write(*item)
+                with self.lock:
+                    self.written += 1
+            except BaseException as exc:
+                self.error = exc
+
+    def close(self) -> None:
+        """Wait for the queued frames and finish the output."""
+        for _ in self.threads:
+            self.frames.put(None)
+        for thread in self.threads:
+            thread.join()
+        if self.process is not None:
+            self.process.stdin.close()
+            self.process.wait()
+        elif self.stream is not None and self.stream is not sys.stdout.buffer:
+            self.stream.close()
+        elif self.stream is not None:
+            self.stream.flush()
+        if self.error is not None:
+            raise self.error
+
+
+def export_run(agent_paths: List[AgentPath], obstacles: List[List[int]], output: str,
+               fps: int = EXPORT_FPS, size: Optional[Tuple[int, int]] = None, speed: float = 1.0,
+               grid_size: Optional[Tuple[int, int]] = None) -> int:
+    """
+    Render a solution offscreen as fast as possible and write it to output.
+    Frames are size (default WIDTH x HEIGHT) and the cells are sized so the whole grid_size
+    (columns, rows; by default the extent of the paths and obstacles) fits into them.
+    Returns the number of frames written.
+    """
+    # Offscreen rendering; must be set before pygame creates the display. The import banner
+    # would otherwise end up in a raw stream written to stdout.
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    import pygame
+    from game import Game
+
+    width, height = size or (WIDTH, HEIGHT)
+    if grid_size is None:
+        cells = [(c.x, c.y) for agent_path in agent_paths for c in agent_path.path] + \
+                [(x, y) for x, y in obstacles]
+        grid_size = (max([GRID_COLS] + [x + 1 for x, _ in cells]), max([GRID_ROWS] + [y + 1 for _, y in cells]))
+    columns, rows = grid_size
+    cell_size = max(1, min(width // columns, height // rows))
+    game = Game(agent_paths, obstacles, cell_size=cell_size, screen_size=(width, height))
+    step_ms = STEP_DURATION_MS / speed
+    total_frames = int(game.simulation.total_steps * step_ms * fps / 1000) + 1
+
+    writer = FrameWriter(output, width, height, fps)
+    start_time = time.perf_counter()
+    try:
+        for frame in range(total_frames):
+            # Playback position from the frame index rather than the wall clock
+            elapsed_ms = frame * 1000 / fps
+            step = min(int(elapsed_ms // step_ms), game.simulation.total_steps)
+            alpha = 0.0 if step == game.simulation.total_steps else elapsed_ms / step_ms - step
+            if step != game.simulation.current_step:
+                game.simulation.seek(step)
+                game.check_overlaps()
+            for cube in game.cubes:
+                cube.set_progress(step, alpha)
+            game.elapsed_time = int(elapsed_ms * speed)
+
+            game.draw()
+            writer.put(frame, pygame.image.tobytes(game.screen, "RGB"))
+    finally:
+        writer.close()
+        pygame.quit()
+
+    elapsed = time.perf_counter() - start_time
+    duration = total_frames / fps
+    print(f"Exported {writer.written} frames ({duration:.1f}s of playback) in {elapsed:.1f}s, "
+          f"{duration / elapsed:.1f}x realtime", file=sys.stderr)
+    return writer.written
@@ -1,30 +1,52 @@
 import pygame
-from typing import List, Optional, Dict, Tuple
-from config import WIDTH, HEIGHT, CELL_SIZE, MOVE_INTERVAL, GRID_LINES, BACKGROUND
+from typing import List, Optional, Dict, Tuple, TYPE_CHECKING
+from config import (WIDTH, HEIGHT, CELL_SIZE, GRID_LINES, BACKGROUND, STEP_DURATION_MS, PLAYBACK_SPEEDS,
+                    MAX_STEPS_PER_FRAME)
 from cube import Cube
 from request import Coordinate, AgentPath
+from simulation import Simulation, PlaybackClock
+from profiler import get_profiler
+from render import RenderScheduler, get_font, render_text
+
+if TYPE_CHECKING:
+    from lifelong import RollingPlan
 
 
 class Game:
-    def __init__(self, agent_paths: List[AgentPath], obstacles: List[List[int]]) -> None:
+    def __init__(self, agent_paths: List[AgentPath], obstacles: List[List[int]],
+                 rolling_plan: Optional['RollingPlan'] = None, cell_size: int = CELL_SIZE,
+                 screen_size: Optional[Tuple[int, int]] = None) -> None:
         pygame.init()
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        # Headless export sizes cells to fit larger maps into the requested frame
+        self.cell_size = cell_size
+        self.width, self.height = screen_size or (WIDTH, HEIGHT)
+        self.screen = pygame.display.set_mode((self.width, self.height))
         pygame.display.set_caption("Shapeshifter")
-        self.clock = pygame.time.Clock()
+        self.scheduler = RenderScheduler()
+        self.profiler = get_profiler()
         self.agent_paths = agent_paths
         
+        # Discrete fleet state; the cubes only animate between its steps
+        self.simulation = Simulation(agent_paths)
+        
+        # Lifelong mode: paths keep growing as the backend executes planning cycles
+        self.rolling_plan = rolling_plan
+        if rolling_plan is not None and not rolling_plan.is_finished():
+            rolling_plan.request_advance(self.scheduler.wake)
+        
         # Store obstacles as (x, y) tuples for easier access
         self.obstacles = set((obs[0], obs[1]) for obs in obstacles)
 
         # Create cubes
-        self.cubes = [Cube(path.agent_id, path.path, {}) for path in agent_paths]
+        self.cubes = [Cube(path.agent_id, path.path, {}, cell_size) for path in agent_paths]
         
-        self.last_move_time = pygame.time.get_ticks()
+        # Fixed-timestep playback, independent of the rendering frame rate
+        self.playback = PlaybackClock(STEP_DURATION_MS, PLAYBACK_SPEEDS, max_steps_per_frame=MAX_STEPS_PER_FRAME)
         
         # Add pause functionality
         self.paused = False
-        self.pause_button = pygame.Rect(WIDTH - 50, 10, 40, 40)
-        self.font = pygame.font.SysFont('Arial', 16)
+        self.pause_button = pygame.Rect(self.width - 50, 10, 40, 40)
+        self.font = get_font(16)
         
         # Timer functionality
         self.start_time = pygame.time.get_ticks()
@@ -33,7 +55,7 @@ class Game:
         
         # Add restart functionality
         self.show_restart = False
-        self.restart_button = pygame.Rect(WIDTH // 2 - 75, HEIGHT // 2 - 25, 150, 50)
+        self.restart_button = pygame.Rect(self.width // 2 - 75, self.height // 2 - 25, 150, 50)
         # Flag to signal when to restart
         self.restart_game = False
         
@@ -46,71 +68,155 @@ class Game:
         """Main game loop. Returns True if restart was requested."""
         running = True
         while running:
+            events = self.scheduler.poll(self.is_animating())
             current_time = pygame.time.get_ticks()
+            self.profiler.begin_frame()
             
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                    return False
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    if self.pause_button.collidepoint(event.pos):
-                        if not self.paused:
-                            self.pause_start_time = current_time
-                        else:
-                            pause_duration = current_time - self.pause_start_time
-                            self.start_time += pause_duration
+            with self.profiler.phase("events"):
+                for event in events:
+                    if event.type == pygame.QUIT:
+                        running = False
+                        return False
+                    elif event.type == pygame.MOUSEBUTTONDOWN:
+                        if self.pause_button.collidepoint(event.pos):
+                            if not self.paused:
+                                self.pause_start_time = current_time
+                            else:
+                                pause_duration = current_time - self.pause_start_time
+                                self.start_time += pause_duration
                         
-                        self.paused = not self.paused
+                            self.paused = not self.paused
                     
-                    # Check if restart button was clicked
-                    if self.show_restart and self.restart_button.collidepoint(event.pos):
-                        return True  # Signal to restart the game
+                        # Check if restart button was clicked
+                        if self.show_restart and self.restart_button.collidepoint(event.pos):
+                            return True  # Signal to restart the game
+                    elif event.type == pygame.KEYDOWN:
+                        # Adjust playback speed
+                        if event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS, pygame.K_UP):
+                            self.playback.faster()
+                        elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS, pygame.K_DOWN):
+                            self.playback.slower()
+                        # Scrub through the run
+                        elif event.key == pygame.K_RIGHT:
+                            self.seek(self.simulation.current_step + 10)
+                        elif event.key == pygame.K_LEFT:
+                            self.seek(self.simulation.current_step - 10)
+                        elif event.key == pygame.K_HOME:
+                            self.seek(0)
+                        elif event.key == pygame.K_END:
+                            self.seek(self.simulation.total_steps)
                         
             if not self.paused:
-                # Only update elapsed time if not all agents have reached destination
-                if not self.all_completed:
-                    self.elapsed_time = current_time - self.start_time
-                
-                for cube in self.cubes:
-                    cube.update()
+                self.update(current_time, self.scheduler.frame_time)
 
-                if current_time - self.last_move_time >= MOVE_INTERVAL:
-                    all_cubes_stable = all(not cube.is_moving for cube in self.cubes)
-                    if all_cubes_stable:
-                        for cube in self.cubes:
-                            cube.move()
-                        self.last_move_time = current_time
-                        
-                        # Check for overlaps after moving all cubes
-                        self.check_overlaps()
-                
-                # Check if all agents have reached their destinations
-                if self.all_agents_reached() and not self.all_completed:
-                    self.all_completed = True
-                    self.completion_time = self.elapsed_time  # Store the completion time
-                    self.show_restart = True
-
-            self.draw()
-            pygame.display.flip()
-            self.clock.tick(60)
+            # Paused and finished runs are only redrawn when an event changes something
+            if self.scheduler.needs_redraw(self.is_animating()):
+                with self.profiler.phase("draw"):
+                    self.draw()
+                self.profiler.draw_overlay(self.screen)
+                with self.profiler.phase("flip"):
+                    pygame.display.flip()
+                self.profiler.end_frame()
+                self.scheduler.presented()
 
         pygame.quit()
         return False
 
+    def update(self, current_time: int, frame_time: int) -> None:
+        """Advance the simulation by the elapsed frame time and move the cubes."""
+        # Only update elapsed time if not all agents have reached destination
+        if not self.all_completed:
+            self.elapsed_time = current_time - self.start_time
+
+        with self.profiler.phase("simulation"):
+            # Advance as many whole steps as the elapsed time covers (frame skipping at high speed)
+            for _ in range(self.playback.advance(frame_time)):
+                if self.simulation.is_finished() and not self.extend_rolling_plan():
+                    break
+                self.simulation.step()
+            if self.simulation.is_finished():
+                self.playback.reset()
+
+        # Interpolate cubes between the current and the next step
+        with self.profiler.phase("cube_update"):
+            for cube in self.cubes:
+                cube.set_progress(self.simulation.current_step, self.playback.alpha)
+        with self.profiler.phase("check_overlaps"):
+            self.check_overlaps()
+
+        # Check if all agents have reached their destinations
+        if self.all_agents_reached() and not self.all_completed:
+            self.all_completed = True
+            self.completion_time = self.elapsed_time  # Store the completion time
+            self.show_restart = True
+            self.scheduler.invalidate()  # Draw the final frame before going idle
+
+    @classmethod
+    def from_trajectory(cls, file_path: str) -> 'Game':
+        """Create a game replaying a recorded trajectory file without loading it into memory."""
+        from trajectory import load_trajectory
+        trajectory = load_trajectory(file_path)
+        return cls(trajectory.agent_paths(), trajectory.obstacles())
+
+    def seek(self, step: int) -> None:
+        """Jump to any timestep; only the positions at that step are read."""
+        self.simulation.seek(step)
+        self.playback.reset()
+        for cube in self.cubes:
+            cube.set_progress(self.simulation.current_step, 0.0)
+        self.check_overlaps()
+        
+        # Seeking back before the end makes the run resumable again
+        if not self.all_agents_reached():
+            self.all_completed = False
+            self.show_restart = False
+
+    def extend_rolling_plan(self) -> bool:
+        """
+        Apply the next lifelong planning cycle once playback catches up. Cycles are fetched in the
+        background, so this never blocks a frame. Returns True if paths grew.
+        """
+        if self.rolling_plan is None or self.rolling_plan.is_finished():
+            return False
+        applied = self.rolling_plan.take_advance()
+        if applied is None:
+            # Still planning: playback waits at the last executed step and resumes on wake-up
+            self.rolling_plan.request_advance(self.scheduler.wake)
+            return False
+        if not applied:
+            self.rolling_plan = None
+            return False
+        self.simulation.refresh()
+        for cube in self.cubes:
+            cube.destination = (cube.path[-1].x, cube.path[-1].y)
+        if not self.rolling_plan.is_finished():
+            # Plan the following cycle while this one plays
+            self.rolling_plan.request_advance(self.scheduler.wake)
+        return not self.simulation.is_finished()
+
+    def is_animating(self) -> bool:
+        """Return whether the playback advances on its own and needs continuous redraws."""
+        return not self.paused and not self.all_completed
+
     def all_agents_reached(self) -> bool:
         """Check if all agents have reached their destinations."""
-        return all(cube.is_reached() for cube in self.cubes)
+        if self.rolling_plan is not None and not self.rolling_plan.is_finished():
+            return False
+        return self.simulation.is_finished() and all(cube.is_reached() for cube in self.cubes)
 
     def draw(self) -> None:
         """Draw the grid, obstacles, cubes, and labels."""
-        self.draw_grid()
-        self.draw_obstacles()
-        self.draw_destinations()
-        for cube in self.cubes:
-            cube.draw(self.screen)
-        self.draw_stats()
-        self.draw_timer()  
-        self.draw_pause_button()
+        with self.profiler.phase("draw_grid"):
+            self.draw_grid()
+            self.draw_obstacles()
+            self.draw_destinations()
+        with self.profiler.phase("draw_cubes"):
+            for cube in self.cubes:
+                cube.draw(self.screen)
+        with self.profiler.phase("draw_text"):
+            self.draw_stats()
+            self.draw_timer()  
+            self.draw_pause_button()
         
         # Draw restart button if all agents have reached their destinations
         if self.show_restart:
@@ -119,7 +225,7 @@ class Game:
     def draw_restart_button(self) -> None:
         """Draw the restart button when all agents have reached their destinations."""
         # Semi-transparent overlay
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+        overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 160))  # Black with 60% opacity
         self.screen.blit(overlay, (0, 0))
         
@@ -128,40 +234,44 @@ class Game:
         pygame.draw.rect(self.screen, (30, 100, 30), self.restart_button, width=2, border_radius=10)
         
         # Button text
-        font = pygame.font.SysFont('Arial', 24)
-        restart_text = font.render("Restart", True, (255, 255, 255))
+        font = get_font(24)
+        restart_text = render_text(font, "Restart")
         text_rect = restart_text.get_rect(center=self.restart_button.center)
         self.screen.blit(restart_text, text_rect)
         
         # Congratulations text
-        congrats_font = pygame.font.SysFont('Arial', 32)
-        congrats_text = congrats_font.render("All agents reached destinations!", True, (255, 255, 255))
-        congrats_rect = congrats_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 80))
+        congrats_font = get_font(32)
+        congrats_text = render_text(congrats_font, "All agents reached destinations!")
+        congrats_rect = congrats_text.get_rect(center=(self.width // 2, self.height // 2 - 80))
         self.screen.blit(congrats_text, congrats_rect)
         
         # Display completion time - use the stored completion time
-        time_font = pygame.font.SysFont('Arial', 24)
+        time_font = get_font(24)
         minutes = self.completion_time // 60000
         seconds = (self.completion_time % 60000) // 1000
-        time_text = time_font.render(f"Completion time: {minutes:02d}:{seconds:02d}", True, (255, 255, 255))
-        time_rect = time_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 40))
+        time_text = render_text(time_font, f"Completion time: {minutes:02d}:{seconds:02d}")
+        time_rect = time_text.get_rect(center=(self.width // 2, self.height // 2 - 40))
         self.screen.blit(time_text, time_rect)
         
     
     def draw_obstacles(self) -> None:
         """Draw the obstacles on the grid."""
+        cell = self.cell_size
         for x, y in self.obstacles:
-            obstacle_rect = pygame.Rect(x * CELL_SIZE + 2, y * CELL_SIZE + 2, 
-                                      CELL_SIZE - 4, CELL_SIZE - 4)
+            if cell < 12:
+                # Too small for the inset and cross of the detailed style
+                pygame.draw.rect(self.screen, (80, 80, 80), (x * cell, y * cell, cell, cell))
+                continue
+            obstacle_rect = pygame.Rect(x * cell + 2, y * cell + 2, cell - 4, cell - 4)
             pygame.draw.rect(self.screen, (80, 80, 80), obstacle_rect)
             
             # Add a cross pattern to make obstacles more visually distinct
             pygame.draw.line(self.screen, (40, 40, 40), 
-                          (x * CELL_SIZE + 2, y * CELL_SIZE + 2),
-                          (x * CELL_SIZE + CELL_SIZE - 4, y * CELL_SIZE + CELL_SIZE - 4), 3)
+                          (x * cell + 2, y * cell + 2),
+                          (x * cell + cell - 4, y * cell + cell - 4), 3)
             pygame.draw.line(self.screen, (40, 40, 40), 
-                          (x * CELL_SIZE + CELL_SIZE - 4, y * CELL_SIZE + 2),
-                          (x * CELL_SIZE + 2, y * CELL_SIZE + CELL_SIZE - 4), 3)
+                          (x * cell + cell - 4, y * cell + 2),
+                          (x * cell + 2, y * cell + cell - 4), 3)
 
     def create_cubes(self) -> List[Cube]:
         """
@@ -201,34 +311,43 @@ class Game:
         Draw the grid lines and background.
         """
         self.screen.fill(BACKGROUND)
-        for x in range(0, WIDTH, CELL_SIZE):
-            pygame.draw.line(self.screen, GRID_LINES, (x, 0), (x, HEIGHT))
-        for y in range(0, HEIGHT, CELL_SIZE):
-            pygame.draw.line(self.screen, GRID_LINES, (0, y), (WIDTH, y))
+        if self.cell_size < 6:
+            return  # Lines would cover the whole map
+        for x in range(0, self.width, self.cell_size):
+            pygame.draw.line(self.screen, GRID_LINES, (x, 0), (x, self.height))
+        for y in range(0, self.height, self.cell_size):
+            pygame.draw.line(self.screen, GRID_LINES, (0, y), (self.width, y))
 
     def draw_destinations(self) -> None:
         """
         Draw labels for agent destinations.
         """
-        font = pygame.font.SysFont('Arial', 16)
+        if self.cell_size < 20:
+            return  # Unreadable at this size
+        font = get_font(min(16, 16 * self.cell_size // CELL_SIZE))
         for cube in self.cubes:
             dest_x, dest_y = cube.destination
-            label = font.render(f"{cube.cube_id + 1}", True, (255, 255, 255))
-            label_rect = label.get_rect(center=(dest_x * CELL_SIZE + CELL_SIZE // 2,
-                                                dest_y * CELL_SIZE + CELL_SIZE // 2))
+            label = render_text(font, f"{cube.cube_id + 1}")
+            label_rect = label.get_rect(center=(dest_x * self.cell_size + self.cell_size // 2,
+                                                dest_y * self.cell_size + self.cell_size // 2))
             self.screen.blit(label, label_rect)
 
     def draw_stats(self) -> None:
         """
         Display stats about completed paths.
         """
-        font = pygame.font.SysFont('Arial', 16)
+        font = get_font(16)
         completed = sum(
             1 for cube in self.cubes if cube.is_reached() and (cube.grid_x, cube.grid_y) == cube.destination)
         stats_text = f"Completed: {completed}/{len(self.cubes)}"
-        stats_surf = font.render(stats_text, True, (255, 255, 255))
+        stats_surf = render_text(font, stats_text)
         self.screen.blit(stats_surf, (10, 10))
         
+        playback_text = (f"Step: {self.simulation.current_step}/{self.simulation.total_steps}"
+                         f"  Speed: {self.playback.speed:g}x (+/-)")
+        playback_surf = render_text(font, playback_text)
+        self.screen.blit(playback_surf, (10, 50))
+        
     def draw_pause_button(self) -> None:
         """
         Draw the pause/play button with appropriate icon and color.
@@ -286,23 +405,15 @@ class Game:
         if self.paused:
             timer_text += " (PAUSED)"
             
-        font = pygame.font.SysFont('Arial', 16)
+        font = get_font(16)
         
-        shadow_surf = font.render(timer_text, True, (0, 0, 0))
+        shadow_surf = render_text(font, timer_text, (0, 0, 0))
         self.screen.blit(shadow_surf, (11, 31))
         
-        timer_surf = font.render(timer_text, True, (255, 255, 255))
+        timer_surf = render_text(font, timer_text)
         self.screen.blit(timer_surf, (10, 30))
 
     def check_overlaps(self):
-        """Check for cubes that occupy the same cell and mark them."""
-        positions = {}
-        for cube in self.cubes:
-            pos = (cube.grid_x, cube.grid_y)
-            if pos in positions:
-                # Mark both cubes as overlapping
-                cube.overlapping = True
-                positions[pos].overlapping = True
-            else:
-                positions[pos] = cube
-                cube.overlapping = False
\ No newline at end of file
+        """Mark the cubes that the simulation reports as sharing a cell."""
+        for i, cube in enumerate(self.cubes):
+            cube.overlapping = i in self.simulation.overlapping
\ No newline at end of file
@@ -0,0 +1,120 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Dict, Optional
+from request import (Coordinate, AgentPath, parse_agent_paths, start_lifelong_session, append_lifelong_goals,
+                     step_lifelong_session, close_lifelong_session)
+from simulation import Simulation, SimulationMetrics
+
+
+class RollingPlan:
+    """
+    Client side of a lifelong session.
+
+    The backend plans conflict-free only within a window and executes replanInterval
+    steps per cycle. The positions executed in each cycle are appended to agent_paths,
+    so Game and Simulation can consume the growing paths like a one-shot solution.
+    """
+
+    def __init__(self, response: Dict, origins: List[List[int]]) -> None:
+        self.session_id = response["sessionId"]
+        self.agent_paths = [AgentPath(i, [Coordinate(x, y)]) for i, (x, y) in enumerate(origins)]
+        # Planning cycle requested in the background (see request_advance)
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.next_cycle: Optional[Future] = None
+        self.update(response)
+
+    @classmethod
+    def start(cls, payload: Dict) -> Optional['RollingPlan']:
+        """Open a lifelong session for the payload, or return None if the backend refuses it."""
+        response = start_lifelong_session(payload)
+        if response is None:
+            return None
+        return cls(response, payload["origins"])
+
+    def update(self, response: Dict) -> None:
+        """Apply a LifelongPlan response: append executed positions and keep the new plan."""
+        executed = parse_agent_paths(response["executed"])
+        for agent_path in executed:
+            self.agent_paths[agent_path.agent_id].path.extend(agent_path.path)
+        self.plan = parse_agent_paths(response["plan"])
+        self.time = response["time"]
+        self.completed_goals = response["completedGoals"]
+        self.pending_goals = response["pendingGoals"]
+
+    def advance(self) -> bool:
+        """Run one planning cycle on the backend. Returns False if replanning failed."""
+        response = step_lifelong_session(self.session_id)
+        if response is None:
+            return False
+        self.update(response)
+        return True
+
+    def request_advance(self, on_done: Optional[Callable[[], None]] = None) -> None:
+        """
+        Start the next planning cycle on a background thread, so a render loop never waits for
+        the backend; take_advance() applies it. on_done is called from that thread when it is back.
+        """
+        if self.next_cycle is not None:
+            return
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lifelong")
+        self.next_cycle = self.executor.submit(step_lifelong_session, self.session_id)
+        if on_done is not None:
+            self.next_cycle.add_done_callback(lambda _: on_done())
+
+    def take_advance(self) -> Optional[bool]:
+        """
+        Apply the cycle started by request_advance once it is back: True if it was applied,
+        False if replanning failed, None if it is still running or was never requested.
+        """
+        if self.next_cycle is None or not self.next_cycle.done():
+            return None
+        cycle, self.next_cycle = self.next_cycle, None
+        try:
+            response = cycle.result()
+        except Exception as exc:
+            print(f"Planning cycle failed: {exc}")
+            return False
+        if response is None:
+            return False
+        self.update(response)
+        return True
+
+    def append_goals(self, goals: Dict[int, List[List[int]]]) -> bool:
+        """Append new goals to the queues of the given agents."""
+        response = append_lifelong_goals(self.session_id, goals)
+        if response is None:
+            return False
+        self.pending_goals = response["pendingGoals"]
+        return True
+
+    def is_finished(self) -> bool:
+        """Check whether no goals are pending and every agent is parked on its last goal."""
+        if self.pending_goals:
+            return False
+        return all(len({(c.x, c.y) for c in agent_path.path}) == 1 for agent_path in self.plan)
+
+    def close(self) -> None:
+        """Wait for a cycle still in flight and discard the session on the backend."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+        close_lifelong_session(self.session_id)
+
+
+def run_lifelong(rolling_plan: RollingPlan, max_cycles: int = 1000,
+                 goal_stream: Optional[List[Dict[int, List[List[int]]]]] = None) -> SimulationMetrics:
+    """
+    Drive a lifelong session headlessly until it runs out of goals or cycles.
+    goal_stream optionally holds a batch of goals to append before each cycle.
+    """
+    simulation = Simulation(rolling_plan.agent_paths)
+    for cycle in range(max_cycles):
+        if goal_stream and cycle < len(goal_stream):
+            rolling_plan.append_goals(goal_stream[cycle])
+        elif rolling_plan.is_finished():
+            break
+        if not rolling_plan.advance():
+            print(f"Replanning failed at time {rolling_plan.time}")
+            break
+        simulation.refresh()
+        simulation.run()
+    return simulation.metrics()
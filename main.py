@@ -1,13 +1,82 @@
 import pygame
 from typing import List, Tuple, Set
 from algorithm_selector import AlgorithmSelector
-from config import WIDTH, HEIGHT, CELL_SIZE, BACKGROUND, GRID_LINES
-from request import Coordinate, AgentPath, call_cbs_api
+from config import (WIDTH, HEIGHT, CELL_SIZE, BACKGROUND, GRID_LINES, GRID_COLS, GRID_ROWS, RECORD_TRAJECTORIES,
+                    TRAJECTORY_DIR, SOLVER_LAUNCH)
+from request import Coordinate, AgentPath, build_payload, call_cbs_api
 from game import Game
 from destination_selector import DestinationSelector
+from profiler import get_profiler
 import time
+import os
+import argparse
+
+def run_instance(args: argparse.Namespace) -> None:
+    """Solve a MovingAI benchmark instance instead of one picked in the destination selector."""
+    from movingai import load_instance
+    from simulation import simulate
+    
+    buckets = [args.bucket] if args.bucket is not None else None
+    instance = load_instance(args.map, args.scen, args.agents, buckets)
+    grid = instance["grid"]
+    print(f"Loaded {len(instance['origins'])} agents on a {len(grid[0])}x{len(grid)} map")
+    
+    # Use the algorithm selector defaults
+    selector_defaults = AlgorithmSelector()
+    payload = build_payload(instance["origins"], instance["destinations"], [],
+                            selector_defaults.get_selected_algorithm(),
+                            selector_defaults.is_morphing_enabled(),
+                            selector_defaults.get_selected_priority(),
+                            selector_defaults.get_selected_conflict_resolution(),
+                            selector_defaults.is_diagonals_enabled(),
+                            grid=grid)
+    
+    start_time = time.time()
+    agent_paths = call_cbs_api(payload)
+    if agent_paths is None:
+        print("Could not find path")
+        return
+    print(f"Time taken to get agent paths: {time.time() - start_time} seconds")
+    
+    # The pygame window only fits the configured grid; larger maps are evaluated headlessly
+    if len(grid) <= GRID_ROWS and len(grid[0]) <= GRID_COLS:
+        obstacles = [[x, y] for y, row in enumerate(grid) for x, cell in enumerate(row) if cell == 1]
+        Game(agent_paths, obstacles).run()
+    else:
+        _, metrics = simulate(agent_paths)
+        print(metrics)
 
 def main():
+    parser = argparse.ArgumentParser(description="Shapeshifter multi-agent pathfinding visualization")
+    parser.add_argument("--map", help="MovingAI .map file to load instead of selecting destinations")
+    parser.add_argument("--scen", help="MovingAI .scen file providing the agents' starts and goals")
+    parser.add_argument("--agents", type=int, help="Number of scenario entries to use")
+    parser.add_argument("--bucket", type=int, help="Only use scenario entries from this bucket")
+    parser.add_argument("--profile", action="store_true", help="Show frame timings and write a Chrome trace on exit")
+    parser.add_argument("--launch-solver", action="store_true",
+                        help="Start, warm up and supervise a local solver backend for this session")
+    args = parser.parse_args()
+    if (args.map or args.scen) and not (args.map and args.scen):
+        parser.error("--map and --scen must be given together")
+    if args.profile:
+        get_profiler().enable()
+    
+    solver = None
+    if args.launch_solver or SOLVER_LAUNCH:
+        # Warms up in the background while destinations are picked; the first solve waits for it
+        from solver_process import launch_solver
+        solver = launch_solver()
+    try:
+        if args.map:
+            run_instance(args)
+        else:
+            run_editor()
+    finally:
+        if solver is not None:
+            solver.stop()
+
+def run_editor() -> None:
+    """Pick destinations and obstacles, solve and play the result until the user quits."""
     # Game restart loop
     while True:
         selector = DestinationSelector()
@@ -29,25 +98,10 @@ def main():
         diagonals_enabled = selector.is_diagonals_enabled()
         
         if not destinations:
+            selector.stop_solver()
+            break  # Window closed
+        if not selector.selected_destinations:
             print("No destinations selected, using defaults.")
-            origins = [
-                [0, 8], [1, 8], [2, 8], [3, 8], [4, 8],
-                [5, 8], [6, 8], [7, 8], [8, 8], [9, 8],
-                [0, 9], [1, 9], [2, 9], [3, 9], [4, 9],
-                [5, 9], [6, 9], [7, 9], [8, 9], [9, 9]
-            ]
-            destinations = [
-                [3, 1], [4, 1], [5, 1],
-                [2, 2], [6, 2],
-                [1, 3], [7, 3],
-                [2, 4], [6, 4],
-                [3, 5], [4, 5], [5, 5],
-                [2, 6], [6, 6],
-                [1, 7], [7, 7],
-                [2, 8], [6, 8],
-                [3, 9], [4, 9]
-            ]
-            obstacles = []  # Default empty obstacles
         else:
             print(f"Selected {len(destinations)} destinations:")
             for i, dest in enumerate(destinations):
@@ -65,27 +119,17 @@ def main():
         print(f"Conflict resolution: {conflict_resolution}")
         print(f"Diagonal movement: {diagonals_enabled}")
         
-        # Create grid with obstacles marked
-        grid = [[0 for _ in range(10)] for _ in range(10)]
-        for obs in obstacles:
-            x, y = obs
-            if 0 <= x < 10 and 0 <= y < 10:  # Ensure obstacles are within grid bounds
-                grid[y][x] = 1  # Mark obstacle cells with 1
-        
-        # Prepare payload for the API
-        payload = {
-            "grid": grid, 
-            "origins": origins,
-            "destinations": destinations,
-            "algorithm": selected_algorithm,
-            "morphing": morphing_enabled, 
-            "priorityStrategy": priority_strategy,
-            "conflictResolutionStrategy": conflict_resolution,
-            "allowDiagonals": diagonals_enabled  
-        }
+        # The payload the selector solved in the background (obstacle cells are marked with 1 in the grid)
+        payload = selector.get_payload()
         
+        # The selector only returns once this payload is solved, so this does not wait
         start_time = time.time()
-        agent_paths = call_cbs_api(payload)
+        try:
+            agent_paths = selector.get_solution(payload)
+        except Exception as exc:  # E.g. no backend reachable; let the user try again
+            print(f"Solve failed: {exc}")
+            agent_paths = None
+        selector.stop_solver()
         if agent_paths is None:
             print("Could not find path")
             continue  # Try again with new inputs
@@ -99,6 +143,13 @@ def main():
                 for coord in agent.path:
                     print(f"  Coordinate(x={coord.x}, y={coord.y})")
             
+            if RECORD_TRAJECTORIES:
+                from trajectory import save_trajectory
+                os.makedirs(TRAJECTORY_DIR, exist_ok=True)
+                file_path = os.path.join(TRAJECTORY_DIR, f"run-{int(end_time)}.traj")
+                save_trajectory(file_path, agent_paths, payload)
+                print(f"Trajectory saved to {file_path}")
+            
             # Pass obstacles to the Game constructor
             game = Game(agent_paths, obstacles)
             restart = game.run()
@@ -0,0 +1,233 @@
+import json
+import os
+import struct
+from typing import Dict, Iterable, List, Optional, Tuple
+from config import MAP_STORE_DIR, MAP_STORE_ENV_VAR, DISTANCE_FIELD_MIN_USES
+
+UNREACHABLE = -1  # Distance field value of cells that cannot reach the goal (and of obstacles)
+
+
+def content_hash(cells) -> str:
+    """
+    SHA-256 over the size and the obstacle bits of a grid; the same value as the backend's
+    Grid.contentHash(), so a stored map's ID is also its map ID on every backend.
+    """
+    import hashlib
+    import numpy as np
+
+    blocked = np.asarray(cells) == 1
+    height, width = blocked.shape
+    bits = np.packbits(blocked.ravel(), bitorder="little")
+    # Java packs the bits into big-endian serialized longs, least significant bit first
+    bits = np.concatenate((bits, np.zeros(-len(bits) % 8, dtype=np.uint8)))
+    words = bits.view("<u8").astype(">u8")
+    return hashlib.sha256(struct.pack(">ii", width, height) + words.tobytes()).hexdigest()
+
+
+def compute_distance_field(cells, goal: Tuple[int, int], diagonals: bool):
+    """
+    BFS distance in steps from every cell to goal (x, y), UNREACHABLE for obstacles and cut-off
+    cells. The frontier is expanded one layer per iteration with index arithmetic on a padded grid.
+    """
+    import numpy as np
+
+    blocked = np.asarray(cells) == 1
+    height, width = blocked.shape
+    stride = width + 2
+    # A border of obstacles removes all bounds checks
+    free = np.zeros((height + 2, stride), dtype=bool)
+    free[1:-1, 1:-1] = ~blocked
+    free = free.ravel()
+    distances = np.full(free.size, UNREACHABLE, dtype=np.int32)
+
+    offsets = [-stride, stride, -1, 1]
+    if diagonals:
+        offsets += [-stride - 1, -stride + 1, stride - 1, stride + 1]
+    offsets = np.array(offsets)
+
+    x, y = goal
+    start = (y + 1) * stride + x + 1
+    if free[start]:
+        distances[start] = 0
+        frontier = np.array([start])
+        distance = 0
+        while frontier.size:
+            distance += 1
+            neighbors = np.unique((frontier[:, None] + offsets).ravel())
+            neighbors = neighbors[free[neighbors] & (distances[neighbors] == UNREACHABLE)]
+            distances[neighbors] = distance
+            frontier = neighbors
+    return distances.reshape(height + 2, stride)[1:-1, 1:-1].copy()
+
+
+class MapStore:
+    """
+    Maps saved once on disk as memory-mappable .npy files, keyed by content hash:
+
+        <root>/<hash>/grid.npy            uint8 grid[y][x], 1 = obstacle
+        <root>/<hash>/dist4_<x>_<y>.npy   int32 BFS distances to goal (x, y), 4-connected
+        <root>/<hash>/dist8_<x>_<y>.npy   the same with diagonal moves
+        <root>/<hash>/goals.json          how often each goal was used
+
+    Files are opened with numpy.memmap, so every process using a map (Python tools and solver
+    backends alike) shares the same page-cache pages. Files are written to a temporary name and
+    renamed into place, so concurrent readers never see a partial file.
+    """
+
+    def __init__(self, root: Optional[str] = None) -> None:
+        self.root = os.path.expanduser(root or os.environ.get(MAP_STORE_ENV_VAR) or MAP_STORE_DIR)
+        self.grids: Dict[str, "np.memmap"] = {}
+        self.fields: Dict[Tuple[str, int, int, bool], "np.memmap"] = {}
+
+    def map_dir(self, digest: str) -> str:
+        return os.path.join(self.root, digest)
+
+    def field_path(self, digest: str, goal: Tuple[int, int], diagonals: bool) -> str:
+        x, y = goal
+        return os.path.join(self.map_dir(digest), f"dist{8 if diagonals else 4}_{x}_{y}.npy")
+
+    @staticmethod
+    def save_array(path: str, array) -> None:
+        import numpy as np
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as f:
+            np.save(f, array)
+        os.replace(temporary, path)
+
+    def put(self, cells) -> str:
+        """Store a grid if it is not stored yet and return its content hash."""
+        import numpy as np
+
+        digest = content_hash(cells)
+        path = os.path.join(self.map_dir(digest), "grid.npy")
+        if not os.path.exists(path):
+            self.save_array(path, (np.asarray(cells) == 1).astype(np.uint8))
+        return digest
+
+    def import_map(self, map_path: str) -> str:
+        """
+        Store a MovingAI .map file and return its content hash. The file is only parsed when it
+        is new or changed since the last import (per path, size and modification time).
+        """
+        import numpy as np
+        from movingai import read_map
+
+        stat = os.stat(map_path)
+        source = f"{os.path.abspath(map_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+        index_path = os.path.join(self.root, "index.json")
+        index = self.read_json(index_path)
+        digest = index.get(source)
+        if digest is None or not os.path.exists(os.path.join(self.map_dir(digest), "grid.npy")):
+            digest = self.put(np.array(read_map(map_path), dtype=np.uint8))
+            index = self.read_json(index_path)  # Another process may have added entries meanwhile
+            index[source] = digest
+            self.write_json(index_path, index)
+        return digest
+
+    def grid(self, digest: str) -> "np.memmap":
+        """Memory-map a stored grid read-only."""
+        import numpy as np
+
+        if digest not in self.grids:
+            self.grids[digest] = np.load(os.path.join(self.map_dir(digest), "grid.npy"), mmap_mode="r")
+        return self.grids[digest]
+
+    def distance_field(self, digest: str, goal: Tuple[int, int], diagonals: bool) -> Optional["np.memmap"]:
+        """Memory-map the stored distance field to goal, or None if it was not computed yet."""
+        import numpy as np
+
+        key = (digest, goal[0], goal[1], diagonals)
+        if key not in self.fields:
+            path = self.field_path(digest, goal, diagonals)
+            if not os.path.exists(path):
+                return None
+            self.fields[key] = np.load(path, mmap_mode="r")
+        return self.fields[key]
+
+    def ensure_distance_field(self, digest: str, goal: Tuple[int, int], diagonals: bool) -> "np.memmap":
+        """Return the distance field to goal, computing and storing it first if needed."""
+        field = self.distance_field(digest, goal, diagonals)
+        if field is None:
+            self.save_array(self.field_path(digest, goal, diagonals),
+                            compute_distance_field(self.grid(digest), goal, diagonals))
+            field = self.distance_field(digest, goal, diagonals)
+        return field
+
+    def record_goals(self, digest: str, goals: Iterable[Tuple[int, int]], diagonals: bool,
+                     min_uses: int = DISTANCE_FIELD_MIN_USES) -> int:
+        """
+        Count a use of every goal and precompute the distance fields of goals used at least
+        min_uses times. Returns the number of fields computed. Counts are merged without
+        locking, so concurrent runs may undercount; a missed field is computed on a later use.
+        """
+        path = os.path.join(self.map_dir(digest), "goals.json")
+        uses = self.read_json(path)
+        for x, y in goals:
+            key = f"{x},{y}"
+            uses[key] = uses.get(key, 0) + 1
+        self.write_json(path, uses)
+        return self.precompute(digest, [tuple(map(int, key.split(","))) for key, count in uses.items()
+                                        if count >= min_uses], diagonals)
+
+    def precompute(self, digest: str, goals: Iterable[Tuple[int, int]], diagonals: bool) -> int:
+        """Compute the missing distance fields of goals; returns how many were computed."""
+        computed = 0
+        for goal in goals:
+            if self.distance_field(digest, goal, diagonals) is None:
+                self.ensure_distance_field(digest, goal, diagonals)
+                computed += 1
+        return computed
+
+    def lower_bound(self, digest: str, origins: List[List[int]], destinations: List[List[int]],
+                    diagonals: bool) -> Optional[int]:
+        """Sum of the agents' shortest distances, a lower bound on sum of costs; None if a field is missing."""
+        total = 0
+        for (start_x, start_y), (goal_x, goal_y) in zip(origins, destinations):
+            field = self.distance_field(digest, (goal_x, goal_y), diagonals)
+            if field is None or field[start_y, start_x] == UNREACHABLE:
+                return None
+            total += int(field[start_y, start_x])
+        return total
+
+    def list_maps(self) -> List[Dict]:
+        """Stored maps with their size and number of distance fields."""
+        maps = []
+        if not os.path.isdir(self.root):
+            return maps
+        for digest in sorted(os.listdir(self.root)):
+            if not os.path.exists(os.path.join(self.map_dir(digest), "grid.npy")):
+                continue
+            height, width = self.grid(digest).shape
+            files = os.listdir(self.map_dir(digest))
+            maps.append({"id": digest, "width": width, "height": height,
+                         "fields": sum(name.startswith("dist") and name.endswith(".npy") for name in files)})
+        return maps
+
+    @staticmethod
+    def read_json(path: str) -> Dict:
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    @staticmethod
+    def write_json(path: str, data: Dict) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(data, f)
+        os.replace(temporary, path)
+
+
+store: Optional[MapStore] = None
+
+
+def get_store() -> MapStore:
+    """Return the process-wide map store."""
+    global store
+    if store is None:
+        store = MapStore()
+    return store
@@ -0,0 +1,132 @@
+from dataclasses import dataclass
+from typing import List, Dict, Iterator, Optional, Iterable, TextIO
+
+# Terrain characters of the MovingAI map format that agents can stand on
+PASSABLE_TERRAIN = set(".GS")
+
+
+@dataclass
+class ScenarioEntry:
+    bucket: int
+    map_name: str
+    width: int
+    height: int
+    start_x: int
+    start_y: int
+    goal_x: int
+    goal_y: int
+    optimal_length: float
+
+
+def read_map_header(f: TextIO) -> Dict[str, str]:
+    """Read the header of a .map file up to and including the 'map' line."""
+    header = {}
+    for line in f:
+        line = line.strip()
+        if not line:
+            continue
+        if line == "map":
+            return header
+        key, _, value = line.partition(" ")
+        header[key] = value.strip()
+    raise ValueError("Map file ended before the 'map' line")
+
+
+def iter_map_rows(file_path: str) -> Iterator[List[int]]:
+    """
+    Stream a MovingAI .map file row by row as lists of 0 (free) / 1 (obstacle) cells.
+    """
+    with open(file_path, "r") as f:
+        header = read_map_header(f)
+        height, width = int(header["height"]), int(header["width"])
+        rows = 0
+        for line in f:
+            line = line.rstrip("\r\n")
+            if not line:
+                continue
+            if len(line) < width:
+                raise ValueError(f"Row {rows} of {file_path} has {len(line)} cells, expected {width}")
+            yield [0 if cell in PASSABLE_TERRAIN else 1 for cell in line[:width]]
+            rows += 1
+            if rows == height:
+                return
+        raise ValueError(f"{file_path} has {rows} rows, expected {height}")
+
+
+def read_map(file_path: str) -> List[List[int]]:
+    """Read a MovingAI .map file into the grid[y][x] format sent to the backend."""
+    return list(iter_map_rows(file_path))
+
+
+def load_grid(file_path: str) -> List[List[int]]:
+    """
+    Read a .map file through the map store: a map is parsed once, later loads read the
+    memory-mapped grid from the store.
+    """
+    from map_store import get_store
+
+    store = get_store()
+    return store.grid(store.import_map(file_path)).tolist()
+
+
+def iter_scenario(file_path: str) -> Iterator[ScenarioEntry]:
+    """Stream the entries of a MovingAI .scen file without reading it all."""
+    with open(file_path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("version"):
+                continue
+            fields = line.split("\t") if "\t" in line else line.split()
+            if len(fields) != 9:
+                raise ValueError(f"Malformed scenario line in {file_path}: {line!r}")
+            yield ScenarioEntry(
+                bucket=int(fields[0]),
+                map_name=fields[1],
+                width=int(fields[2]),
+                height=int(fields[3]),
+                start_x=int(fields[4]),
+                start_y=int(fields[5]),
+                goal_x=int(fields[6]),
+                goal_y=int(fields[7]),
+                optimal_length=float(fields[8]),
+            )
+
+
+def select_entries(entries: Iterable[ScenarioEntry], agents: Optional[int] = None,
+                   buckets: Optional[Iterable[int]] = None) -> List[ScenarioEntry]:
+    """
+    Take the first `agents` entries from the selected buckets, stopping as soon as enough are read.
+    Entries that reuse an already taken start or goal cell are skipped.
+    """
+    wanted_buckets = set(buckets) if buckets is not None else None
+    selected = []
+    starts, goals = set(), set()
+    for entry in entries:
+        if agents is not None and len(selected) >= agents:
+            break
+        if wanted_buckets is not None and entry.bucket not in wanted_buckets:
+            continue
+        start, goal = (entry.start_x, entry.start_y), (entry.goal_x, entry.goal_y)
+        if start in starts or goal in goals:
+            continue
+        starts.add(start)
+        goals.add(goal)
+        selected.append(entry)
+    return selected
+
+
+def load_instance(map_path: str, scen_path: str, agents: Optional[int] = None,
+                  buckets: Optional[Iterable[int]] = None) -> Dict[str, List[List[int]]]:
+    """
+    Load a MovingAI map and scenario as the grid/origins/destinations part of a /cbs payload.
+    """
+    grid = load_grid(map_path)
+    entries = select_entries(iter_scenario(scen_path), agents, buckets)
+    if agents is not None and len(entries) < agents:
+        print(f"Scenario only provides {len(entries)} of the {agents} requested agents")
+
+    return {
+        "grid": grid,
+        "origins": [[entry.start_x, entry.start_y] for entry in entries],
+        "destinations": [[entry.goal_x, entry.goal_y] for entry in entries],
+    }
@@ -0,0 +1,165 @@
+import atexit
+import json
+import os
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Deque, Optional
+import pygame
+from config import PROFILE_ENV_VAR, PROFILE_TRACE_PATH, PROFILE_WINDOW, PROFILE_MAX_TRACE_EVENTS
+
+FRAME = "frame"
+FONT_RENDER = "font_render"  # Text rasterisation, summed over the frame
+
+
+class FrameProfiler:
+    """
+    Opt-in per-frame instrumentation for the pygame loops.
+
+    Each phase of a frame is timed with perf_counter. Phases entered many times per frame,
+    such as font rendering, are accumulated and sampled once per frame. The last
+    PROFILE_WINDOW frames are kept for rolling percentiles and the on-screen graph, and every
+    timed span is recorded as a Chrome trace event that chrome://tracing or Perfetto can open.
+    When disabled, phase() returns a shared null context and the overhead is negligible.
+    """
+
+    def __init__(self, enabled: bool = False, trace_path: str = PROFILE_TRACE_PATH) -> None:
+        self.enabled = False
+        self.trace_path = trace_path
+        self.samples: Dict[str, Deque[float]] = {}
+        self.trace_events: List[Dict] = []
+        self.frame_start: Optional[float] = None
+        self.frame_totals: Dict[str, float] = {}  # Milliseconds per accumulated phase this frame
+        self.origin = time.perf_counter()
+        self.null_phase = nullcontext()
+        if enabled:
+            self.enable()
+
+    def enable(self) -> None:
+        """Start profiling and export the trace when the process exits."""
+        if not self.enabled:
+            self.enabled = True
+            atexit.register(self.export)
+
+    def begin_frame(self) -> None:
+        """Mark the start of a frame."""
+        if self.enabled:
+            self.frame_start = time.perf_counter()
+            self.frame_totals.clear()  # Drop text rendered outside a frame, e.g. before an early return
+
+    def end_frame(self) -> None:
+        """Mark the end of a frame and record its total duration."""
+        if self.enabled and self.frame_start is not None:
+            self.record(FRAME, self.frame_start, time.perf_counter())
+            self.frame_start = None
+            for name, total_ms in self.frame_totals.items():
+                self.samples.setdefault(name, deque(maxlen=PROFILE_WINDOW)).append(total_ms)
+            self.frame_totals.clear()
+
+    def phase(self, name: str):
+        """Context manager timing one phase of the current frame."""
+        if not self.enabled:
+            return self.null_phase
+        return self.timed(name)
+
+    def accumulate(self, name: str):
+        """Context manager timing a phase entered many times per frame, summed per frame."""
+        if not self.enabled:
+            return self.null_phase
+        return self.timed_total(name)
+
+    @contextmanager
+    def timed(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter())
+
+    @contextmanager
+    def timed_total(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.frame_totals[name] = self.frame_totals.get(name, 0.0) + (end - start) * 1000
+            self.trace(name, start, end)
+
+    def record(self, name: str, start: float, end: float) -> None:
+        """Store a span for the rolling statistics and the trace."""
+        self.samples.setdefault(name, deque(maxlen=PROFILE_WINDOW)).append((end - start) * 1000)
+        self.trace(name, start, end)
+
+    def trace(self, name: str, start: float, end: float) -> None:
+        """Store a span as a trace event, up to PROFILE_MAX_TRACE_EVENTS."""
+        if len(self.trace_events) < PROFILE_MAX_TRACE_EVENTS:
+            self.trace_events.append({
+                "name": name,
+                "ph": "X",
+                "ts": (start - self.origin) * 1_000_000,
+                "dur": (end - start) * 1_000_000,
+                "pid": os.getpid(),
+                "tid": 0,
+            })
+
+    def percentiles(self, name: str) -> Dict[str, float]:
+        """Return p50/p95/p99 in milliseconds over the rolling window of a phase."""
+        values = sorted(self.samples.get(name, ()))
+        if not values:
+            return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+
+        def at(fraction: float) -> float:
+            return values[min(len(values) - 1, int(fraction * len(values)))]
+
+        return {"p50": at(0.50), "p95": at(0.95), "p99": at(0.99)}
+
+    def export(self) -> None:
+        """Write the recorded spans as a Chrome/Perfetto JSON trace."""
+        if not self.trace_events:
+            return
+        with open(self.trace_path, "w") as f:
+            json.dump({"traceEvents": self.trace_events, "displayTimeUnit": "ms"}, f)
+        print(f"Profiler trace written to {self.trace_path} ({len(self.trace_events)} events)")
+
+    def draw_overlay(self, screen: pygame.Surface) -> None:
+        """Draw per-phase percentiles and a frame-time graph in the bottom-left corner."""
+        if not self.enabled:
+            return
+        from render import get_font  # Imported here: render imports this module
+
+        font = get_font(12)
+        names = [FRAME] + sorted(name for name in self.samples if name != FRAME)
+        graph_height = 50
+        line_height = 14
+        width = 260
+        height = graph_height + line_height * len(names) + 10
+        left, top = 5, screen.get_height() - height - 5
+
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+        screen.blit(panel, (left, top))
+
+        # Frame-time graph, 16.7 ms (60 fps) budget line in the middle
+        frames = self.samples.get(FRAME, ())
+        scale = graph_height / 33.3
+        budget_y = top + graph_height - 16.7 * scale
+        pygame.draw.line(screen, (90, 90, 90), (left, budget_y), (left + width, budget_y))
+        for i, frame_ms in enumerate(list(frames)[-width:]):
+            bar = min(graph_height, frame_ms * scale)
+            color = (50, 200, 50) if frame_ms <= 16.7 else (220, 50, 50)
+            pygame.draw.line(screen, color, (left + i, top + graph_height), (left + i, top + graph_height - bar))
+
+        for row, name in enumerate(names):
+            p = self.percentiles(name)
+            text = f"{name:<15} p50 {p['p50']:5.2f}  p95 {p['p95']:5.2f}  p99 {p['p99']:5.2f} ms"
+            label = font.render(text, True, (255, 255, 255))
+            screen.blit(label, (left + 5, top + graph_height + 5 + row * line_height))
+
+
+profiler = FrameProfiler(enabled=os.environ.get(PROFILE_ENV_VAR, "") not in ("", "0"))
+
+
+def get_profiler() -> FrameProfiler:
+    """Return the process-wide profiler (enabled by the PROFILE_ENV_VAR environment variable)."""
+    return profiler
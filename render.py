@@ -0,0 +1,88 @@
+from functools import lru_cache
+from typing import List, Optional
+import pygame
+from config import RENDER_FPS
+from profiler import FONT_RENDER, get_profiler
+
+WAKE_EVENT = pygame.USEREVENT + 1  # Posted from other threads to wake a blocked loop
+
+# Events that never change what is on screen and should not wake an idle window
+IGNORED_EVENTS = (pygame.MOUSEMOTION, pygame.ACTIVEEVENT, pygame.WINDOWENTER, pygame.WINDOWLEAVE)
+
+
+@lru_cache(maxsize=None)
+def get_font(size: int) -> pygame.font.Font:
+    """Return a shared Arial font; creating SysFonts is far too slow to do every frame."""
+    return pygame.font.SysFont('Arial', size)
+
+
+def render_text(font: pygame.font.Font, text: str, color=(255, 255, 255)) -> pygame.Surface:
+    """Rasterise antialiased text, timed as the profiler's font rendering phase."""
+    with get_profiler().accumulate(FONT_RENDER):
+        return font.render(text, True, color)
+
+
+class RenderScheduler:
+    """
+    Decides when a pygame loop has to redraw.
+
+    While something animates the loop runs at RENDER_FPS. Otherwise the screen is only
+    redrawn after an input event, an explicit invalidate() or a wake() from another thread,
+    and poll() blocks in pygame.event.wait so an idle window uses no CPU.
+    """
+
+    def __init__(self, fps: int = RENDER_FPS) -> None:
+        self.clock = pygame.time.Clock()
+        self.fps = fps
+        self.dirty = True
+        self.frame_time = 0
+
+    def invalidate(self) -> None:
+        """Request a redraw on the next loop iteration."""
+        self.dirty = True
+
+    def wake(self) -> None:
+        """Wake a loop blocked in poll(); safe to call from any thread."""
+        if pygame.display.get_init():
+            pygame.event.post(pygame.event.Event(WAKE_EVENT))
+
+    def needs_redraw(self, animating: bool = False) -> bool:
+        """Return whether the current loop iteration has to draw a frame."""
+        return animating or self.dirty
+
+    def poll(self, animating: bool = False, timeout_ms: Optional[int] = None) -> List[pygame.event.Event]:
+        """
+        Return pending events; any event that can change the screen requests a redraw.
+        When nothing needs drawing, block until such an event arrives or timeout_ms
+        elapses (None waits indefinitely); waking up always requests a redraw.
+        """
+        if self.needs_redraw(animating):
+            self.frame_time = self.clock.get_time()
+            events = pygame.event.get()
+            if any(event.type not in IGNORED_EVENTS for event in events):
+                self.dirty = True
+            return events
+
+        deadline = None if timeout_ms is None else pygame.time.get_ticks() + max(1, timeout_ms)
+        events: List[pygame.event.Event] = []
+        while not events:
+            remaining = 0  # pygame waits indefinitely for a timeout of 0
+            if deadline is not None:
+                remaining = deadline - pygame.time.get_ticks()
+                if remaining <= 0:
+                    break
+            first = pygame.event.wait(remaining)
+            if first.type == pygame.NOEVENT:
+                break
+            events = [event for event in [first] + pygame.event.get() if event.type not in IGNORED_EVENTS]
+
+        # Time spent blocked must not count as elapsed frame time
+        self.clock.tick()
+        self.frame_time = 0
+        self.dirty = True
+        return events
+
+    def presented(self) -> None:
+        """Mark the frame as drawn and limit the frame rate."""
+        self.dirty = False
+        self.clock.tick(self.fps)
@@ -1,9 +1,22 @@
-import requests
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import List, Dict, Optional, Set, Tuple
 import json
+from config import GRID_COLS, GRID_ROWS, GRID_UPLOAD_MIN_CELLS, ASSIGNMENT_MODE
 
-url = "http://localhost:8080/cbs"
+# Endpoints, relative to the backend base URLs of the pool (see backend_pool.py)
+cbs_path = "/cbs"
+lifelong_path = "/lifelong"
+maps_path = "/maps"
+
+# Map IDs returned by /maps, keyed by (backend base URL, content hash of the uploaded grid)
+uploaded_maps: Dict[Tuple[str, str], str] = {}
+
+# Hosts whose backends may read the local map store, and local backends that turned out not to
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1")
+store_misses: Set[str] = set()
+
+# Backend base URL holding each lifelong session; sessions live in that JVM's memory
+lifelong_sessions: Dict[str, str] = {}
 
 @dataclass
 class Coordinate:
@@ -23,17 +36,193 @@ def parse_agent_paths(response_data: Dict[str, List[Dict[str, int]]]) -> List[Ag
         agent_paths.append(AgentPath(agent_id, path))
     return agent_paths
 
+def build_payload(origins: List[List[int]], destinations: List[List[int]], obstacles: List[List[int]],
+                  algorithm: str, morphing: bool, priority_strategy: str,
+                  conflict_resolution: str, allow_diagonals: bool,
+                  grid: Optional[List[List[int]]] = None, assignment: str = ASSIGNMENT_MODE) -> Dict:
+    """
+    Build the /cbs request body, marking obstacle cells with 1 in the grid.
+    Without an explicit grid, an empty GRID_COLS x GRID_ROWS grid is used.
+    assignment is "hungarian" or "cbs-ta" (see ASSIGNMENT_MODE).
+    """
+    if grid is None:
+        grid = [[0 for _ in range(GRID_COLS)] for _ in range(GRID_ROWS)]
+    rows, cols = len(grid), len(grid[0]) if grid else 0
+    for obs in obstacles:
+        x, y = obs
+        if 0 <= x < cols and 0 <= y < rows:  # Ensure obstacles are within grid bounds
+            grid[y][x] = 1
+
+    return {
+        "grid": grid,
+        "origins": origins,
+        "destinations": destinations,
+        "algorithm": algorithm,
+        "morphing": morphing,
+        "priorityStrategy": priority_strategy,
+        "conflictResolutionStrategy": conflict_resolution,
+        "allowDiagonals": allow_diagonals,
+        "assignment": assignment
+    }
+
+def encode_grid(grid: List[List[int]]) -> Dict:
+    """
+    Encode a dense grid[y][x] as an EncodedGrid body: a base64 bitset (1 = obstacle, row-major,
+    least significant bit first) or per-row run lengths starting with free cells, whichever is smaller.
+    """
+    import base64
+    import numpy as np
+    
+    cells = np.asarray(grid) == 1
+    height, width = cells.shape if cells.size else (len(grid), 0)
+    data = base64.b64encode(np.packbits(cells.ravel(), bitorder="little").tobytes()).decode("ascii")
+    
+    runs = []
+    for row in cells:
+        bounds = np.concatenate(([0], np.flatnonzero(np.diff(row)) + 1, [width]))
+        lengths = np.diff(bounds).tolist()
+        if width and row[0]:
+            lengths.insert(0, 0)  # Runs always start with free cells
+        runs.append(lengths)
+    
+    if len(json.dumps(runs)) < len(data):
+        return {"format": "rle", "width": width, "height": height, "runs": runs}
+    return {"format": "bitset", "width": width, "height": height, "data": data}
+
+def upload_map(base_url: str, encoded_grid: Dict) -> Optional[str]:
+    """Store an encoded grid on one backend and return its map ID there."""
+    import requests
+    
+    response = requests.post(base_url + maps_path, json=encoded_grid)
+    if response.ok:
+        return response.json()["mapId"]
+    print(f"Map upload failed: {response.status_code}")
+    return None
+
+def compact_payload(payload: Dict, base_url: str, refresh_map: bool = False) -> Dict:
+    """
+    Replace the dense grid of a request body with an encoded grid, or with a map ID for grids of
+    at least GRID_UPLOAD_MIN_CELLS cells so a map is uploaded once per backend and then referenced.
+    Map IDs are content hashes; a map in the local map store is first sent by ID without uploading
+    to backends on this machine, which read it from the store, unless one already answered 410 to that.
+    refresh_map forces a new upload after the backend reported the map ID as unknown.
+    """
+    grid = payload.get("grid")
+    if not grid:
+        return payload
+    import os
+    from urllib.parse import urlparse
+    from map_store import content_hash, get_store
+    
+    body = {key: value for key, value in payload.items() if key != "grid"}
+    if len(grid) * len(grid[0]) < GRID_UPLOAD_MIN_CELLS:
+        body["encodedGrid"] = encode_grid(grid)
+        return body
+    
+    digest = content_hash(grid)
+    key = (base_url, digest)
+    stored = os.path.exists(os.path.join(get_store().map_dir(digest), "grid.npy"))
+    if not refresh_map and key not in uploaded_maps and stored and base_url not in store_misses and \
+            urlparse(base_url).hostname in LOCAL_HOSTS:
+        body["mapId"] = digest
+        return body
+    if refresh_map or key not in uploaded_maps:
+        encoded_grid = encode_grid(grid)
+        map_id = upload_map(base_url, encoded_grid)
+        if map_id is None:
+            body["encodedGrid"] = encoded_grid
+            return body
+        uploaded_maps[key] = map_id
+    body["mapId"] = uploaded_maps[key]
+    return body
+
+def post_compact(base_url: str, path: str, payload: Dict, timeout: Optional[float] = None):
+    """POST a request body with a compact grid, re-uploading the map once if the backend lost it."""
+    import requests
+    
+    body = compact_payload(payload, base_url)
+    response = requests.post(base_url + path, json=body, timeout=timeout)
+    if response.status_code == 410:  # Map ID unknown, e.g. after a backend restart
+        if "mapId" in body and (base_url, body["mapId"]) not in uploaded_maps:
+            store_misses.add(base_url)  # Sent from the store, but this backend uses another one
+        response = requests.post(base_url + path, json=compact_payload(payload, base_url, refresh_map=True),
+                                 timeout=timeout)
+    return response
+
 def call_cbs_api(payload):
+    from backend_pool import get_pool
+    from solver_process import wait_until_ready
+    
+    wait_until_ready()
     if "allowDiagonals" not in payload:
         payload["allowDiagonals"] = False  
         
-    response = requests.post(url, json=payload)
+    # Solves are idempotent, so slow ones are hedged on a second backend
+    response = get_pool().request(lambda base_url: post_compact(base_url, cbs_path, payload), hedge=True)
     if response.ok:
         print("Success!")
+        configuration = response.headers.get("X-Solver-Configuration")
+        if configuration:
+            print(f"Solved by portfolio configuration {configuration}")
         response_json = response.json()
         agent_paths = parse_agent_paths(response_json)
         return agent_paths
     else:
         print(f"Error: {response.status_code}")
+        incomplete = response.headers.get("X-Search-Incomplete")
+        if incomplete:
+            print(f"No solution found, but not proven unsolvable: {incomplete}")
         print(response.text)
-        return None
\ No newline at end of file
+        return None
+
+def post_lifelong(endpoint: str, payload: Optional[Dict] = None) -> Optional[Dict]:
+    """POST to a lifelong session endpoint and return the decoded LifelongPlan, or None on error."""
+    import requests
+    
+    response = requests.post(endpoint, json=payload)
+    if response.ok:
+        return response.json()
+    print(f"Error: {response.status_code}")
+    print(response.text)
+    return None
+
+def session_url(session_id: str) -> str:
+    return f"{lifelong_sessions[session_id]}{lifelong_path}/{session_id}"
+
+def start_lifelong_session(payload: Dict) -> Optional[Dict]:
+    """
+    Open a lifelong session on the least loaded backend; the payload carries grid, origins,
+    goals, window and replanInterval. Later calls for the session go to the same backend.
+    """
+    from backend_pool import get_pool
+    
+    chosen = []
+    
+    def send(base_url: str):
+        chosen.append(base_url)
+        return post_compact(base_url, lifelong_path, payload)
+    
+    response = get_pool().request(send)
+    if response.ok:
+        plan = response.json()
+        lifelong_sessions[plan["sessionId"]] = chosen[-1]
+        return plan
+    print(f"Error: {response.status_code}")
+    print(response.text)
+    return None
+
+def append_lifelong_goals(session_id: str, goals: Dict[int, List[List[int]]]) -> Optional[Dict]:
+    """Append goals to the queues of the given agents."""
+    return post_lifelong(f"{session_url(session_id)}/goals",
+                         {"goals": {str(agent_id): agent_goals for agent_id, agent_goals in goals.items()}})
+
+def step_lifelong_session(session_id: str) -> Optional[Dict]:
+    """Execute one replanning interval and return the executed positions and the new plan."""
+    return post_lifelong(f"{session_url(session_id)}/step")
+
+def close_lifelong_session(session_id: str) -> None:
+    """Discard a lifelong session on the backend."""
+    import requests
+    
+    requests.delete(session_url(session_id))
+    lifelong_sessions.pop(session_id, None)
@@ -0,0 +1,268 @@
+from dataclasses import dataclass, field
+from typing import List, Dict, Tuple, Set, Optional, Sequence
+from request import Coordinate, AgentPath
+
+
+@dataclass
+class SimulationEvent:
+    step: int
+    kind: str  # "arrival", "overlap" or "wait"
+    agent_ids: List[int]
+    position: Tuple[int, int]
+
+
+@dataclass
+class SimulationMetrics:
+    agents: int
+    steps: int
+    makespan: int
+    sum_of_costs: int
+    arrivals: int
+    overlaps: int
+    waits: int
+    overlap_steps: List[int] = field(default_factory=list)
+
+
+class Simulation:
+    """
+    Discrete, display-free simulation of a fleet following its agent paths.
+
+    Every call to step() advances all agents by exactly one timestep and returns the
+    events of the new timestep. Agents stay on their last cell once their path ends.
+    Paths are only indexed, never copied, so lazily loaded (memory-mapped) paths stay lazy.
+    """
+
+    def __init__(self, agent_paths: List[AgentPath]) -> None:
+        self.agent_ids = [agent_path.agent_id for agent_path in agent_paths]
+        self.paths: List[Sequence[Coordinate]] = [agent_path.path for agent_path in agent_paths]
+        self.destinations = [(path[-1].x, path[-1].y) for path in self.paths]
+        self.arrival_steps = [self.compute_arrival_step(path) for path in self.paths]
+        self.total_steps = max((len(path) - 1 for path in self.paths), default=0)
+
+        self.current_step = 0
+        self.positions = [(path[0].x, path[0].y) for path in self.paths]
+        self.overlapping: Set[int] = set()
+        self.arrived: Set[int] = set()
+
+        self.arrivals = 0
+        self.overlaps = 0
+        self.waits = 0
+        self.overlap_steps: List[int] = []
+
+        # Agents can already be at their destination, or overlapping, at step 0
+        self.initial_events = self.collect_events()
+
+    @staticmethod
+    def compute_arrival_step(path: Sequence[Coordinate]) -> int:
+        """Return the first step from which the agent stays on its destination."""
+        step = len(path) - 1
+        destination = path[-1]
+        while step > 0 and path[step - 1] == destination:
+            step -= 1
+        return step
+
+    def refresh(self) -> None:
+        """
+        Pick up paths that were extended in place, e.g. by a rolling lifelong plan.
+        Agents whose new destination lies in the future are no longer counted as arrived.
+        """
+        self.destinations = [(path[-1].x, path[-1].y) for path in self.paths]
+        self.arrival_steps = [self.compute_arrival_step(path) for path in self.paths]
+        self.total_steps = max((len(path) - 1 for path in self.paths), default=0)
+        self.arrived = {i for i in self.arrived if self.arrival_steps[i] <= self.current_step}
+
+    def position_at(self, index: int, step: int) -> Tuple[int, int]:
+        """Return the position of the agent at the given index at any step."""
+        path = self.paths[index]
+        coord = path[step] if step < len(path) else path[-1]
+        return coord.x, coord.y
+
+    def is_finished(self) -> bool:
+        """Check whether every agent has reached the end of its path."""
+        return self.current_step >= self.total_steps
+
+    def step(self) -> List[SimulationEvent]:
+        """Advance the whole fleet by one timestep and return the events of that step."""
+        self.current_step += 1
+        previous = self.positions
+        self.positions = [self.position_at(i, self.current_step) for i in range(len(self.paths))]
+        return self.collect_events(previous)
+
+    def seek(self, step: int) -> None:
+        """Jump directly to a step without emitting events or updating counters."""
+        self.current_step = max(0, min(step, self.total_steps))
+        self.positions = [self.position_at(i, self.current_step) for i in range(len(self.paths))]
+        self.arrived = {i for i, arrival in enumerate(self.arrival_steps) if arrival <= self.current_step}
+        self.overlapping = self.find_overlapping()
+
+    def find_overlapping(self) -> Set[int]:
+        """Return the indices of agents sharing a cell with another agent."""
+        seen: Dict[Tuple[int, int], int] = {}
+        overlapping: Set[int] = set()
+        for i, pos in enumerate(self.positions):
+            if pos in seen:
+                overlapping.add(i)
+                overlapping.add(seen[pos])
+            else:
+                seen[pos] = i
+        return overlapping
+
+    def collect_events(self, previous: Optional[List[Tuple[int, int]]] = None) -> List[SimulationEvent]:
+        """Detect arrivals, overlaps and waits at the current step and update the counters."""
+        step = self.current_step
+        events = []
+        cells: Dict[Tuple[int, int], List[int]] = {}
+
+        for i, pos in enumerate(self.positions):
+            cells.setdefault(pos, []).append(i)
+
+            if i not in self.arrived and step >= self.arrival_steps[i]:
+                self.arrived.add(i)
+                self.arrivals += 1
+                events.append(SimulationEvent(step, "arrival", [self.agent_ids[i]], pos))
+            elif previous is not None and previous[i] == pos and step < self.arrival_steps[i]:
+                self.waits += 1
+                events.append(SimulationEvent(step, "wait", [self.agent_ids[i]], pos))
+
+        self.overlapping = set()
+        for pos, indices in cells.items():
+            if len(indices) > 1:
+                self.overlapping.update(indices)
+                self.overlaps += 1
+                events.append(SimulationEvent(step, "overlap", [self.agent_ids[i] for i in indices], pos))
+        if self.overlapping and (not self.overlap_steps or self.overlap_steps[-1] != step):
+            self.overlap_steps.append(step)
+
+        return events
+
+    def run(self) -> List[SimulationEvent]:
+        """Step until every agent has finished its path and return all events."""
+        events = list(self.initial_events)
+        while not self.is_finished():
+            events.extend(self.step())
+        return events
+
+    def metrics(self) -> SimulationMetrics:
+        """Return the metrics accumulated so far."""
+        return SimulationMetrics(
+            agents=len(self.paths),
+            steps=self.current_step,
+            makespan=max(self.arrival_steps, default=0),
+            sum_of_costs=sum(self.arrival_steps),
+            arrivals=self.arrivals,
+            overlaps=self.overlaps,
+            waits=self.waits,
+            overlap_steps=list(self.overlap_steps),
+        )
+
+
+def simulate(agent_paths: List[AgentPath]) -> Tuple[List[SimulationEvent], SimulationMetrics]:
+    """Run a solution headlessly to completion and return its events and final metrics."""
+    simulation = Simulation(agent_paths)
+    events = simulation.run()
+    return events, simulation.metrics()
+
+
+def validate_solution(agent_paths: List[AgentPath], grid: Optional[List[List[int]]] = None,
+                      allow_diagonals: bool = True) -> List[str]:
+    """
+    Check a solution for invalid moves, obstacle or out-of-bounds cells, overlaps and swaps.
+    Returns a list of human-readable problems; an empty list means the solution is valid.
+    """
+    problems = []
+    max_delta = 2 if allow_diagonals else 1
+    simulation = Simulation(agent_paths)
+
+    for i, path in enumerate(simulation.paths):
+        agent_id = simulation.agent_ids[i]
+        previous = None
+        for t in range(len(path)):
+            coord = path[t]
+            if grid is not None:
+                if not (0 <= coord.y < len(grid) and 0 <= coord.x < len(grid[0])):
+                    problems.append(f"Agent {agent_id} leaves the grid at step {t}: ({coord.x}, {coord.y})")
+                elif grid[coord.y][coord.x] == 1:
+                    problems.append(f"Agent {agent_id} enters an obstacle at step {t}: ({coord.x}, {coord.y})")
+            if previous is not None:
+                dx, dy = abs(coord.x - previous.x), abs(coord.y - previous.y)
+                if max(dx, dy) > 1 or dx + dy > max_delta:
+                    problems.append(f"Agent {agent_id} jumps at step {t}: "
+                                    f"({previous.x}, {previous.y}) -> ({coord.x}, {coord.y})")
+            previous = coord
+
+    positions = simulation.positions
+    for event in simulation.initial_events:
+        if event.kind == "overlap":
+            problems.append(f"Agents {event.agent_ids} overlap at step 0 on {event.position}")
+    while not simulation.is_finished():
+        previous_positions = positions
+        for event in simulation.step():
+            if event.kind == "overlap":
+                problems.append(f"Agents {event.agent_ids} overlap at step {event.step} on {event.position}")
+        positions = simulation.positions
+
+        # Two agents exchanging cells pass through each other
+        moved_from = {(prev, cur): i for i, (prev, cur) in enumerate(zip(previous_positions, positions))
+                      if prev != cur}
+        for (prev, cur), i in moved_from.items():
+            j = moved_from.get((cur, prev))
+            if j is not None and i < j:
+                problems.append(f"Agents {[simulation.agent_ids[i], simulation.agent_ids[j]]} swap "
+                                f"at step {simulation.current_step} between {prev} and {cur}")
+
+    return problems
+
+
+class PlaybackClock:
+    """
+    Fixed-timestep clock that converts elapsed wall time into whole simulation steps.
+
+    Time left over after the last whole step is kept in an accumulator and exposed as
+    alpha, the interpolation fraction towards the next step. At high playback speeds a
+    single frame can cover many steps, so rendering naturally skips intermediate frames.
+    """
+
+    def __init__(self, step_duration_ms: float, speeds: List[float], speed: float = 1,
+                 max_steps_per_frame: int = 1000) -> None:
+        self.step_duration_ms = step_duration_ms
+        self.speeds = sorted(speeds)
+        self.speed = speed
+        self.max_steps_per_frame = max_steps_per_frame
+        self.accumulator = 0.0
+        self.skipped_steps = 0
+
+    @property
+    def alpha(self) -> float:
+        """Fraction of the way from the current step to the next one."""
+        return self.accumulator / self.step_duration_ms
+
+    def advance(self, elapsed_ms: float) -> int:
+        """Add elapsed wall time and return how many whole steps should be simulated."""
+        self.accumulator += elapsed_ms * self.speed
+        steps = int(self.accumulator // self.step_duration_ms)
+        self.accumulator -= steps * self.step_duration_ms
+        if steps > self.max_steps_per_frame:
+            # Drop the backlog instead of stalling after a long hitch
+            self.skipped_steps += steps - self.max_steps_per_frame
+            steps = self.max_steps_per_frame
+        return steps
+
+    def reset(self) -> None:
+        """Discard any accumulated partial step."""
+        self.accumulator = 0.0
+
+    def set_speed(self, speed: float) -> None:
+        """Set the playback speed, clamped to the configured range."""
+        self.speed = max(self.speeds[0], min(speed, self.speeds[-1]))
+
+    def faster(self) -> None:
+        """Switch to the next faster preset speed."""
+        higher = [s for s in self.speeds if s > self.speed]
+        if higher:
+            self.speed = higher[0]
+
+    def slower(self) -> None:
+        """Switch to the next slower preset speed."""
+        lower = [s for s in self.speeds if s < self.speed]
+        if lower:
+            self.speed = lower[-1]
@@ -0,0 +1,239 @@
+import os
+import random
+import subprocess
+import threading
+import time
+from itertools import product
+from typing import Dict, List, Optional
+from config import (GRID_COLS, GRID_ROWS, CUBE_COUNT, HEALTH_CHECK_TIMEOUT_S, SOLVER_JAR, SOLVER_JAR_ENV_VAR,
+                    SOLVER_PORT, SOLVER_JVM_ARGS, SOLVER_LOG, SOLVER_READY_TIMEOUT_S, SOLVER_STOP_TIMEOUT_S,
+                    SOLVER_RESTART_BACKOFF_S, SOLVER_RESTART_BACKOFF_MAX_S, SOLVER_MAX_RESTARTS,
+                    SOLVER_WARMUP_MAX_ROUNDS, SOLVER_WARMUP_BUDGET_S, SOLVER_WARMUP_TOLERANCE,
+                    SOLVER_WARMUP_REQUEST_TIMEOUT_S)
+
+WARMUP_SEED = 7
+
+
+def random_scene(rng: random.Random, width: int, height: int, agents: int, obstacles: List[List[int]]) -> Dict:
+    """Distinct random starts and goals on the free cells of a width x height grid."""
+    blocked = {(x, y) for x, y in obstacles}
+    free = [[x, y] for y in range(height) for x in range(width) if (x, y) not in blocked]
+    return {"origins": rng.sample(free, agents), "destinations": rng.sample(free, agents)}
+
+
+def warmup_payloads() -> List[Dict]:
+    """
+    Representative /cbs requests: a crowded scene of the editor's size and a larger map with
+    pillars, each with every algorithm, morphing and diagonal setting the editor offers, and the
+    priority, conflict and assignment strategies alternating between them.
+    """
+    from request import build_payload
+
+    rng = random.Random(WARMUP_SEED)
+    editor_obstacles = rng.sample([[x, y] for y in range(GRID_ROWS) for x in range(GRID_COLS)], GRID_COLS)
+    pillars = [[x, y] for y in range(2, 32, 4) for x in range(2, 32, 4)]
+    scenes = [(GRID_COLS, GRID_ROWS, min(CUBE_COUNT, GRID_COLS * GRID_ROWS // 3), editor_obstacles),
+              (32, 32, 24, pillars)]
+
+    payloads = []
+    for width, height, agents, obstacles in scenes:
+        scene = random_scene(rng, width, height, agents, obstacles)
+        settings = product(["astar", "bfs", "auto"], [True, False], [True, False])
+        for i, (algorithm, morphing, diagonals) in enumerate(settings):
+            payloads.append(build_payload(
+                scene["origins"], scene["destinations"], obstacles, algorithm, morphing,
+                ["y-axis", "manhattan"][i % 2], ["priority", "minimax"][i // 2 % 2], diagonals,
+                grid=[[0] * width for _ in range(height)], assignment=["hungarian", "cbs-ta"][i // 4 % 2]))
+    return payloads
+
+
+class SolverProcess:
+    """
+    A local solver backend launched and supervised by the client.
+
+    A daemon thread starts the jar, waits until /health answers and replays warm-up scenarios
+    until the time per round stops falling, so class loading and JIT compilation are paid before
+    the first real request. Only then is the solver marked ready. If the process exits, or stops
+    answering during warm-up, it is restarted (after a growing delay if it keeps crashing) and
+    warmed up again, until SOLVER_MAX_RESTARTS quick restarts in a row. Error answers to warm-up
+    requests do not count: the solver is alive. stop() asks the JVM to shut down and kills it if
+    it does not exit in time.
+    """
+
+    def __init__(self, jar: Optional[str] = None, port: int = SOLVER_PORT) -> None:
+        client_dir = os.path.dirname(os.path.abspath(__file__))
+        self.jar = os.path.join(client_dir, jar or os.environ.get(SOLVER_JAR_ENV_VAR) or SOLVER_JAR)
+        self.port = port
+        self.base_url = f"http://localhost:{port}"
+        self.process: Optional[subprocess.Popen] = None
+        self.lock = threading.Lock()
+        self.ready = threading.Event()
+        self.stopping = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self.restarts = 0
+        self.round_ms: List[float] = []  # Time per warm-up round of the latest launch
+
+    def command(self) -> List[str]:
+        return ["java", *SOLVER_JVM_ARGS, "-jar", self.jar, f"--server.port={self.port}"]
+
+    def start(self) -> None:
+        """Launch and supervise the solver in the background; wait_ready() blocks until it is warm."""
+        if self.thread is not None:
+            return
+        if self.is_healthy():
+            # A second JVM could not bind the port, and the probes would be answered by the other one
+            print(f"A solver is already running at {self.base_url}, not launching another")
+            self.ready.set()
+            return
+        self.thread = threading.Thread(target=self.supervise, name="solver-process", daemon=True)
+        self.thread.start()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        return self.ready.wait(timeout)
+
+    def supervise(self) -> None:
+        backoff = SOLVER_RESTART_BACKOFF_S
+        quick_restarts = 0
+        while not self.stopping.is_set():
+            if not self.launch():
+                self.ready.set()  # Nothing to wait for; requests fail over or fail as without a managed solver
+                return
+            ready_since = None
+            if self.wait_healthy() and self.warm_up():
+                self.ready.set()
+                ready_since = time.monotonic()
+            elif not self.stopping.is_set() and self.process.poll() is None:
+                print(f"Solver at {self.base_url} did not become ready, restarting it")
+                self.process.kill()
+            code = self.process.wait()
+            self.ready.clear()
+            if self.stopping.is_set():
+                return
+
+            if ready_since is not None and time.monotonic() - ready_since > SOLVER_RESTART_BACKOFF_MAX_S:
+                backoff = SOLVER_RESTART_BACKOFF_S  # It served for a while: not a crash loop
+                quick_restarts = 0
+            if quick_restarts >= SOLVER_MAX_RESTARTS:
+                print(f"Solver process exited with code {code} after {quick_restarts} quick restarts, "
+                      f"giving up (see {SOLVER_LOG})")
+                self.ready.set()  # Requests fail over or fail as without a managed solver
+                return
+            print(f"Solver process exited with code {code}, restarting in {backoff:.0f} s")
+            if self.stopping.wait(backoff):
+                return
+            backoff = min(2 * backoff, SOLVER_RESTART_BACKOFF_MAX_S)
+            quick_restarts += 1
+            self.restarts += 1
+
+    def launch(self) -> bool:
+        if not os.path.exists(self.jar):
+            print(f"Solver jar {self.jar} not found; build the backend or set {SOLVER_JAR_ENV_VAR}")
+            return False
+        try:
+            with open(SOLVER_LOG, "ab") as log, self.lock:
+                if self.stopping.is_set():
+                    return False
+                self.process = subprocess.Popen(self.command(), stdin=subprocess.DEVNULL, stdout=log,
+                                                stderr=subprocess.STDOUT)
+        except OSError as exc:
+            print(f"Could not launch the solver: {exc}")
+            return False
+        print(f"Launched solver process {self.process.pid} on port {self.port} (output in {SOLVER_LOG})")
+        return True
+
+    def is_healthy(self) -> bool:
+        import requests
+
+        try:
+            return requests.get(f"{self.base_url}/health", timeout=HEALTH_CHECK_TIMEOUT_S).ok
+        except requests.RequestException:
+            return False
+
+    def wait_healthy(self) -> bool:
+        deadline = time.monotonic() + SOLVER_READY_TIMEOUT_S
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None or self.stopping.is_set():
+                return False
+            if self.is_healthy():
+                return True
+            time.sleep(0.1)
+        return False
+
+    def warm_up(self) -> bool:
+        """
+        Replay the warm-up scenarios until a round takes within SOLVER_WARMUP_TOLERANCE of the
+        previous one, or the round or time budget is spent. Returns False if the solver could not
+        be reached or did not answer within SOLVER_WARMUP_REQUEST_TIMEOUT_S.
+        """
+        import requests
+        from request import cbs_path, post_compact
+
+        payloads = warmup_payloads()
+        deadline = time.monotonic() + SOLVER_WARMUP_BUDGET_S
+        self.round_ms = []
+        errors = 0
+        for _ in range(SOLVER_WARMUP_MAX_ROUNDS):
+            start = time.perf_counter()
+            for payload in payloads:
+                if self.stopping.is_set():
+                    return False
+                try:
+                    response = post_compact(self.base_url, cbs_path, payload, timeout=SOLVER_WARMUP_REQUEST_TIMEOUT_S)
+                except requests.RequestException:
+                    return False
+                # Unsolvable scenes answer 404, which warms up the search just the same; an error
+                # answer to one scene still means the solver is up
+                if response.status_code >= 500:
+                    errors += 1
+            self.round_ms.append((time.perf_counter() - start) * 1000)
+            if len(self.round_ms) > 1 and self.round_ms[-1] >= (1 - SOLVER_WARMUP_TOLERANCE) * self.round_ms[-2]:
+                break
+            if time.monotonic() > deadline:
+                break
+        print(f"Solver at {self.base_url} warmed up in {len(self.round_ms)} rounds of {len(payloads)} requests "
+              f"({self.round_ms[0]:.0f} ms first, {self.round_ms[-1]:.0f} ms last)")
+        if errors:
+            print(f"{errors} warm-up requests failed on the solver, see {SOLVER_LOG}")
+        return True
+
+    def stop(self) -> None:
+        """Shut the solver down and stop restarting it."""
+        self.stopping.set()
+        self.ready.set()  # Release anyone still waiting
+        with self.lock:
+            process = self.process
+        if process is None or process.poll() is not None:
+            return
+        process.terminate()  # SIGTERM lets Spring shut down gracefully
+        try:
+            process.wait(SOLVER_STOP_TIMEOUT_S)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        print(f"Solver process {process.pid} stopped")
+
+
+solver: Optional[SolverProcess] = None
+
+
+def launch_solver() -> SolverProcess:
+    """
+    Start the process-wide managed solver and add it to the backend pool. Requests wait for
+    it to be warm (see wait_until_ready); stop() it when the client exits.
+    """
+    global solver
+    from backend_pool import get_pool
+
+    if solver is None:
+        solver = SolverProcess()
+        solver.start()
+        get_pool().add(solver.base_url)
+    return solver
+
+
+def wait_until_ready() -> None:
+    """Block until the managed solver, if any, is warm, e.g. while it starts or restarts."""
+    if solver is not None and not solver.ready.is_set():
+        print("Waiting for the solver to warm up...")
+        if not solver.wait_ready(SOLVER_READY_TIMEOUT_S + SOLVER_WARMUP_BUDGET_S):
+            print("Solver is still not ready, sending the request anyway")
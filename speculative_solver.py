@@ -0,0 +1,148 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+from config import SOLVE_CACHE_SIZE
+from request import AgentPath, call_cbs_api
+
+
+class SpeculativeSolver:
+    """
+    Background worker that solves scenarios while the user is still editing them.
+
+    Only the most recently submitted configuration is kept pending, so superseded
+    edits are dropped before they reach the backend. Finished solutions are cached
+    by payload so pressing Start on an already solved configuration returns at once.
+    Failed solves are only kept until they are reported by solve() or the payload is
+    submitted again, so a transient backend error is retried.
+    on_update, if given, is called from the worker thread whenever a solve finishes.
+    """
+
+    def __init__(self, on_update: Optional[Callable[[], None]] = None) -> None:
+        self.on_update = on_update
+        self.condition = threading.Condition()
+        self.pending: Optional[Dict] = None
+        self.pending_key: Optional[str] = None
+        self.in_flight_key: Optional[str] = None
+        self.in_flight_since = 0.0
+        self.results: "OrderedDict[str, List[AgentPath]]" = OrderedDict()
+        # Failed solves: the exception, or None if the backend answered without a solution
+        self.errors: "OrderedDict[str, Optional[Exception]]" = OrderedDict()
+        self.stopped = False
+
+        self.thread = threading.Thread(target=self.work, daemon=True)
+        self.thread.start()
+
+    @staticmethod
+    def payload_key(payload: Dict) -> str:
+        """Return a stable key identifying the configuration described by a payload."""
+        return json.dumps(payload, sort_keys=True)
+
+    def submit(self, payload: Dict) -> None:
+        """
+        Queue a payload for solving, replacing any configuration that has not started yet.
+        """
+        key = self.payload_key(payload)
+        with self.condition:
+            if key in self.results or key == self.in_flight_key:
+                # Already solved or being solved; whatever was pending is now stale
+                self.pending = None
+                self.pending_key = None
+                return
+            self.errors.pop(key, None)
+            self.pending = dict(payload)
+            self.pending_key = key
+            self.condition.notify_all()
+
+    def status(self, payload: Dict) -> str:
+        """
+        Return "ready", "failed", "error", "solving", "queued" or "idle" for a payload.
+        """
+        key = self.payload_key(payload)
+        with self.condition:
+            if key in self.results:
+                return "ready"
+            if key in self.errors:
+                return "error" if self.errors[key] is not None else "failed"
+            if key == self.in_flight_key:
+                return "solving"
+            if key == self.pending_key:
+                return "queued"
+            return "idle"
+
+    def is_done(self, payload: Dict) -> bool:
+        """Return whether a payload has a result (or an error) available."""
+        return self.status(payload) in ("ready", "failed", "error")
+
+    def solving_time(self) -> float:
+        """Return how long the in-flight request has been running, in seconds."""
+        with self.condition:
+            if self.in_flight_key is None:
+                return 0.0
+            return time.time() - self.in_flight_since
+
+    def solve(self, payload: Dict) -> Optional[List[AgentPath]]:
+        """
+        Return the solution for a payload, or None if none was found, waiting for the worker
+        if it is not ready yet. A failure is reported once and then forgotten.
+        """
+        key = self.payload_key(payload)
+        with self.condition:
+            known = key in self.results or key in self.errors
+        if not known:
+            self.submit(payload)
+        with self.condition:
+            while key not in self.results and key not in self.errors:
+                self.condition.wait()
+            if key in self.errors:
+                error = self.errors.pop(key)
+                if error is not None:
+                    raise error
+                return None
+            return self.results[key]
+
+    def stop(self) -> None:
+        """Stop the worker thread once the current request (if any) completes."""
+        with self.condition:
+            self.stopped = True
+            self.pending = None
+            self.pending_key = None
+            self.condition.notify_all()
+
+    def work(self) -> None:
+        """Worker loop: take the latest pending payload and solve it."""
+        while True:
+            with self.condition:
+                while self.pending is None and not self.stopped:
+                    self.condition.wait()
+                if self.stopped:
+                    return
+                payload, key = self.pending, self.pending_key
+                self.pending = None
+                self.pending_key = None
+                self.in_flight_key = key
+                self.in_flight_since = time.time()
+
+            result = None
+            error = None
+            try:
+                result = call_cbs_api(payload)
+            except Exception as exc:  # Surface connection errors to whoever waits on this payload
+                error = exc
+
+            with self.condition:
+                self.in_flight_key = None
+                if error is not None:
+                    print(f"Speculative solve failed: {error}")
+                if error is not None or result is None:
+                    self.errors[key] = error
+                    while len(self.errors) > SOLVE_CACHE_SIZE:
+                        self.errors.popitem(last=False)
+                else:
+                    self.results[key] = result
+                    while len(self.results) > SOLVE_CACHE_SIZE:
+                        self.results.popitem(last=False)
+                self.condition.notify_all()
+            if self.on_update is not None:
+                self.on_update()
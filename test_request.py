@@ -0,0 +1,95 @@
+import base64
+import hashlib
+import struct
+
+import pytest
+
+from map_store import content_hash
+from request import encode_grid
+
+
+# Straight ports of the backend's tools.Grid, so the Python encoders are checked against what it decodes
+
+def java_of(cells):
+    height = len(cells)
+    width = len(cells[0]) if height else 0
+    blocked = [0] * ((width * height + 63) // 64)
+    for y in range(height):
+        for x in range(width):
+            if cells[y][x] == 1:
+                i = y * width + x
+                blocked[i >> 6] |= 1 << (i & 63)
+    return width, height, blocked
+
+
+def java_from_bitset(width, height, bits):
+    blocked = [0] * ((width * height + 63) // 64)
+    for i in range(min(len(blocked) * 8, len(bits))):
+        blocked[i >> 3] |= bits[i] << ((i & 7) * 8)
+    cells = width * height
+    if cells % 64:
+        blocked[-1] &= (1 << (cells % 64)) - 1
+    return width, height, blocked
+
+
+def java_from_rle(width, height, runs):
+    assert len(runs) == height
+    blocked = [0] * ((width * height + 63) // 64)
+    for y, row in enumerate(runs):
+        x = 0
+        obstacle = False
+        for run in row:
+            assert 0 <= run and x + run <= width
+            if obstacle:
+                for i in range(y * width + x, y * width + x + run):
+                    blocked[i >> 6] |= 1 << (i & 63)
+            x += run
+            obstacle = not obstacle
+        assert x == width
+    return width, height, blocked
+
+
+def java_content_hash(width, height, blocked):
+    return hashlib.sha256(struct.pack(">ii", width, height) + b"".join(struct.pack(">Q", w) for w in blocked)).hexdigest()
+
+
+def java_decode(encoded):
+    if encoded["format"] == "bitset":
+        return java_from_bitset(encoded["width"], encoded["height"], base64.b64decode(encoded["data"]))
+    return java_from_rle(encoded["width"], encoded["height"], encoded["runs"])
+
+
+def pseudo_random_grid(width, height, seed):
+    state = seed
+    cells = []
+    for _ in range(height):
+        row = []
+        for _ in range(width):
+            state = (state * 1103515245 + 12345) % 2 ** 31
+            row.append(1 if state % 7 < 2 else 0)
+        cells.append(row)
+    return cells
+
+
+GRIDS = [
+    [[0, 1, 0], [1, 1, 0]],
+    [[1] * 5 for _ in range(4)],
+    [[0] * 64 for _ in range(2)],  # Block-free rows favour RLE
+    pseudo_random_grid(9, 13, seed=1),  # 117 cells: padding bits inside the last word
+    pseudo_random_grid(64, 3, seed=2),
+]
+
+
+@pytest.mark.parametrize("cells", GRIDS)
+def test_encoded_grid_decodes_to_the_same_cells_on_the_backend(cells):
+    assert java_decode(encode_grid(cells)) == java_of(cells)
+
+
+@pytest.mark.parametrize("cells", GRIDS)
+def test_content_hash_matches_the_backend(cells):
+    assert content_hash(cells) == java_content_hash(*java_of(cells))
+
+
+def test_content_hash_depends_on_size_and_obstacles():
+    assert content_hash([[0, 0], [0, 0]]) != content_hash([[0, 0, 0, 0]])
+    assert content_hash([[0, 1]]) != content_hash([[1, 0]])
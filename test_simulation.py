@@ -0,0 +1,111 @@
+import pytest
+
+from request import AgentPath, Coordinate
+from simulation import PlaybackClock, Simulation, simulate, validate_solution
+
+
+def path(*cells):
+    return [Coordinate(x, y) for x, y in cells]
+
+
+def test_simulation_counts_arrivals_waits_and_overlaps():
+    paths = [
+        AgentPath(0, path((0, 0), (1, 0), (2, 0))),
+        AgentPath(1, path((2, 1), (2, 1), (1, 0), (1, 1))),
+        AgentPath(2, path((3, 3))),
+    ]
+    events, metrics = simulate(paths)
+
+    assert [(e.step, e.kind, e.agent_ids) for e in events] == [
+        (0, "arrival", [2]),
+        (1, "wait", [1]),
+        (2, "arrival", [0]),
+        (3, "arrival", [1]),
+    ]
+    assert metrics.makespan == 3
+    assert metrics.sum_of_costs == 2 + 3 + 0
+    assert metrics.waits == 1
+    assert metrics.overlaps == 0
+
+
+def test_simulation_reports_overlap_and_seek_restores_state():
+    simulation = Simulation([AgentPath(0, path((0, 0), (1, 0), (1, 0))), AgentPath(1, path((2, 0), (1, 0)))])
+    events = simulation.run()
+
+    assert [(e.step, e.kind, e.agent_ids, e.position) for e in events if e.kind == "overlap"] == [
+        (1, "overlap", [0, 1], (1, 0)),
+        (2, "overlap", [0, 1], (1, 0)),
+    ]
+    assert simulation.metrics().overlap_steps == [1, 2]
+
+    simulation.seek(0)
+    assert simulation.positions == [(0, 0), (2, 0)]
+    assert simulation.overlapping == set()
+    assert simulation.arrived == set()
+
+
+def test_valid_solution_has_no_problems():
+    grid = [[0, 0, 0], [0, 1, 0]]
+    paths = [AgentPath(0, path((0, 0), (1, 0), (2, 0), (2, 1))), AgentPath(1, path((0, 1), (0, 1), (1, 0)))]
+    assert validate_solution(paths, grid) == []
+
+
+def test_validate_solution_detects_swaps():
+    paths = [AgentPath(0, path((0, 0), (1, 0))), AgentPath(1, path((1, 0), (0, 0)))]
+    problems = validate_solution(paths)
+    assert len(problems) == 1
+    assert "swap at step 1" in problems[0]
+
+
+def test_validate_solution_detects_overlaps_obstacles_and_jumps():
+    grid = [[0, 1, 0], [0, 0, 0]]
+    paths = [
+        AgentPath(0, path((0, 0), (1, 0))),
+        AgentPath(1, path((0, 1), (2, 1))),
+        AgentPath(2, path((2, 0), (1, 1))),
+        AgentPath(3, path((0, 0))),
+    ]
+    problems = validate_solution(paths, grid, allow_diagonals=False)
+
+    assert any("Agent 0 enters an obstacle at step 1" in problem for problem in problems)
+    assert any("Agent 1 jumps at step 1" in problem for problem in problems)
+    assert any("Agent 2 jumps at step 1" in problem for problem in problems)
+    assert any("overlap at step 0" in problem for problem in problems)
+    assert validate_solution([AgentPath(2, path((2, 0), (1, 1)))], grid) == []
+
+
+def test_validate_solution_detects_cells_outside_the_grid():
+    problems = validate_solution([AgentPath(0, path((0, 0), (0, -1)))], [[0]])
+    assert problems == ["Agent 0 leaves the grid at step 1: (0, -1)"]
+
+
+def test_clock_keeps_the_partial_step_as_alpha():
+    clock = PlaybackClock(100, [0.5, 1, 2])
+    assert clock.advance(250) == 2
+    assert clock.alpha == pytest.approx(0.5)
+    assert clock.advance(60) == 1
+    assert clock.alpha == pytest.approx(0.1)
+    clock.reset()
+    assert clock.alpha == 0
+
+
+def test_clock_speed_scales_steps_and_stays_within_presets():
+    clock = PlaybackClock(100, [2, 0.5, 1])
+    clock.faster()
+    assert clock.speed == 2
+    assert clock.advance(100) == 2
+    clock.faster()
+    assert clock.speed == 2
+    clock.slower()
+    clock.slower()
+    clock.slower()
+    assert clock.speed == 0.5
+    clock.set_speed(10)
+    assert clock.speed == 2
+
+
+def test_clock_drops_backlog_beyond_the_frame_cap():
+    clock = PlaybackClock(10, [1], max_steps_per_frame=5)
+    assert clock.advance(125) == 5
+    assert clock.skipped_steps == 7
+    assert clock.alpha == pytest.approx(0.5)
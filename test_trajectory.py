@@ -0,0 +1,50 @@
+import json
+
+import numpy as np
+import pytest
+
+from request import AgentPath, Coordinate
+from simulation import simulate
+from trajectory import MAGIC, PREFIX, data_offset_for, load_trajectory, save_trajectory
+
+
+def path(*cells):
+    return [Coordinate(x, y) for x, y in cells]
+
+
+def test_round_trip_pads_shorter_paths(tmp_path):
+    file_path = str(tmp_path / "run.traj")
+    grid = [[0, 1, 0], [0, 0, 0]]
+    save_trajectory(file_path, [AgentPath(0, path((0, 0), (0, 1), (1, 1))), AgentPath(1, path((2, 0)))],
+                    {"grid": grid, "algorithm": "astar"})
+
+    trajectory = load_trajectory(file_path)
+    paths = trajectory.agent_paths()
+    assert [len(agent_path.path) for agent_path in paths] == [3, 1]
+    assert list(paths[0].path) == path((0, 0), (0, 1), (1, 1))
+    assert trajectory.positions_at(2).tolist() == [[1, 1], [2, 0]]
+    assert trajectory.positions_at(10).tolist() == [[1, 1], [2, 0]]
+    assert trajectory.payload() == {"grid": grid, "algorithm": "astar"}
+    assert trajectory.obstacles() == [[1, 0]]
+    _, metrics = simulate(paths)
+    assert metrics.makespan == 2
+
+
+def test_empty_path_is_rejected_on_save(tmp_path):
+    file_path = tmp_path / "run.traj"
+    with pytest.raises(ValueError, match="Agent 1 has an empty path"):
+        save_trajectory(str(file_path), [AgentPath(0, path((0, 0))), AgentPath(1, [])])
+    assert not file_path.exists()
+
+
+def test_empty_path_is_rejected_on_load(tmp_path):
+    # As written before empty paths were rejected: the agent's rows filled with -1
+    file_path = tmp_path / "run.traj"
+    header = json.dumps({"agent_ids": [0, 1], "path_lengths": [1, 0], "scenario": {}}).encode("utf-8")
+    positions = np.array([[[0, 0]], [[-1, -1]]], dtype="<i2")
+    with open(file_path, "wb") as f:
+        f.write(PREFIX.pack(MAGIC, len(header), 2, 1) + header)
+        f.write(b"\0" * (data_offset_for(len(header)) - PREFIX.size - len(header)) + positions.tobytes())
+
+    with pytest.raises(ValueError, match="agent 1 has an empty path"):
+        load_trajectory(str(file_path))
@@ -0,0 +1,162 @@
+import base64
+import json
+import struct
+from collections.abc import Sequence
+from typing import List, Dict, Optional
+import numpy as np
+from request import Coordinate, AgentPath
+
+# File layout: fixed prefix, JSON header, padding, then an int16 (agents, steps, 2) block.
+# The scenario's grid is stored in the header as a packed bitset, not as a dense array.
+MAGIC = b"SHTRAJ01"
+PREFIX = struct.Struct("<8sIII")  # magic, header length, agent count, step count
+DATA_ALIGNMENT = 64
+DTYPE = np.dtype("<i2")
+
+
+def save_trajectory(file_path: str, agent_paths: List[AgentPath], scenario: Optional[Dict] = None) -> None:
+    """
+    Write a solution and the scenario that produced it to a compact trajectory file.
+    Shorter paths are padded with their final position so every agent has the same length.
+    Every path needs at least its start position; an empty path raises ValueError.
+    """
+    agents = len(agent_paths)
+    steps = max((len(agent_path.path) for agent_path in agent_paths), default=0)
+
+    positions = np.empty((agents, steps, 2), dtype=DTYPE)
+    for i, agent_path in enumerate(agent_paths):
+        coords = [(coord.x, coord.y) for coord in agent_path.path]
+        if not coords:
+            raise ValueError(f"Agent {agent_path.agent_id} has an empty path; it needs at least its start position")
+        if any(not -32768 <= v <= 32767 for xy in coords for v in xy):
+            raise ValueError(f"Agent {agent_path.agent_id} has coordinates outside the int16 range")
+        positions[i, :len(coords)] = coords
+        positions[i, len(coords):] = coords[-1]
+
+    header = json.dumps({
+        "agent_ids": [agent_path.agent_id for agent_path in agent_paths],
+        "path_lengths": [len(agent_path.path) for agent_path in agent_paths],
+        "scenario": pack_scenario(scenario or {}),
+    }).encode("utf-8")
+    data_offset = data_offset_for(len(header))
+
+    with open(file_path, "wb") as f:
+        f.write(PREFIX.pack(MAGIC, len(header), agents, steps))
+        f.write(header)
+        f.write(b"\0" * (data_offset - PREFIX.size - len(header)))
+        f.write(positions.tobytes())
+
+
+def pack_scenario(scenario: Dict) -> Dict:
+    """Replace a dense grid[y][x] with a base64 bitset (1 = obstacle, row-major, least significant bit first)."""
+    if not scenario.get("grid"):
+        return scenario
+    packed = {key: value for key, value in scenario.items() if key != "grid"}
+    cells = np.asarray(scenario["grid"]) == 1
+    height, width = cells.shape
+    packed["packedGrid"] = {"width": width, "height": height,
+                            "data": base64.b64encode(np.packbits(cells.ravel(), bitorder="little").tobytes())
+                            .decode("ascii")}
+    return packed
+
+
+def unpack_grid(packed: Dict) -> np.ndarray:
+    """Dense uint8 grid[y][x] of a packedGrid header entry."""
+    width, height = packed["width"], packed["height"]
+    bits = np.frombuffer(base64.b64decode(packed["data"]), dtype=np.uint8)
+    return np.unpackbits(bits, count=width * height, bitorder="little").reshape(height, width)
+
+
+def data_offset_for(header_length: int) -> int:
+    """Return the aligned offset of the position block for a given header length."""
+    unaligned = PREFIX.size + header_length
+    return (unaligned + DATA_ALIGNMENT - 1) // DATA_ALIGNMENT * DATA_ALIGNMENT
+
+
+class TrajectoryPath(Sequence):
+    """Read-only path of one agent, backed by the memory-mapped position block."""
+
+    def __init__(self, positions: np.ndarray, length: int) -> None:
+        self.positions = positions
+        self.length = length
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.length))]
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("trajectory step out of range")
+        x, y = self.positions[index]
+        return Coordinate(int(x), int(y))
+
+
+class TrajectoryFile:
+    """
+    Trajectory file opened through numpy.memmap.
+    Only the pages for the timesteps actually read are loaded, so seeking is O(1) in file size.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        with open(file_path, "rb") as f:
+            magic, header_length, agents, steps = PREFIX.unpack(f.read(PREFIX.size))
+            if magic != MAGIC:
+                raise ValueError(f"{file_path} is not a trajectory file")
+            header = json.loads(f.read(header_length).decode("utf-8"))
+
+        self.file_path = file_path
+        self.agents = agents
+        self.steps = steps
+        self.agent_ids: List[int] = header["agent_ids"]
+        self.path_lengths: List[int] = header["path_lengths"]
+        if 0 in self.path_lengths:
+            agent_id = self.agent_ids[self.path_lengths.index(0)]
+            raise ValueError(f"{file_path}: agent {agent_id} has an empty path")
+        self.scenario: Dict = header["scenario"]  # Grid packed, see grid() and payload()
+        self._grid: Optional[np.ndarray] = None
+        if agents and steps:
+            self.positions = np.memmap(file_path, dtype=DTYPE, mode="r",
+                                       offset=data_offset_for(header_length), shape=(agents, steps, 2))
+        else:
+            self.positions = np.zeros((agents, steps, 2), dtype=DTYPE)
+
+    def positions_at(self, step: int) -> np.ndarray:
+        """Return the (agents, 2) positions at a timestep; steps past the end clamp to the last one."""
+        return np.asarray(self.positions[:, min(step, self.steps - 1), :])
+
+    def agent_paths(self) -> List[AgentPath]:
+        """Return lazily-read agent paths usable wherever an AgentPath list is expected."""
+        return [AgentPath(agent_id, TrajectoryPath(self.positions[i], self.path_lengths[i]))
+                for i, agent_id in enumerate(self.agent_ids)]
+
+    def grid(self) -> Optional[np.ndarray]:
+        """Return the recorded grid[y][x] (1 = obstacle), decoded on first use, or None."""
+        if self._grid is None:
+            if "packedGrid" in self.scenario:
+                self._grid = unpack_grid(self.scenario["packedGrid"])
+            elif self.scenario.get("grid"):
+                self._grid = np.asarray(self.scenario["grid"], dtype=np.uint8)  # Files written before packing
+        return self._grid
+
+    def payload(self) -> Dict:
+        """Return the recorded request body with its dense grid, as written by `cli.py solve`."""
+        payload = {key: value for key, value in self.scenario.items() if key != "packedGrid"}
+        grid = self.grid()
+        if grid is not None:
+            payload["grid"] = grid.tolist()
+        return payload
+
+    def obstacles(self) -> List[List[int]]:
+        """Return the obstacle cells of the recorded scenario."""
+        grid = self.grid()
+        if grid is None:
+            return []
+        return [[int(x), int(y)] for y, x in np.argwhere(grid == 1)]
+
+
+def load_trajectory(file_path: str) -> TrajectoryFile:
+    """Open a trajectory file for random-access playback."""
+    return TrajectoryFile(file_path)